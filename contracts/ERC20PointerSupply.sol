@@ -24,9 +24,12 @@ contract ERC20PointerSupply is IERC20 {
     mapping (address => uint256) internal _balances;
     mapping (address => mapping (address => uint256)) internal _allowances;
 
-    uint256 internal _ownedSupply;
-    uint256 internal _totalBurned;
-    uint256 internal _totalMinted;
+    // The supply counters share one storage slot, most functions read or write several of them.
+    // 48 bits allow for 2.8e14 tokens, more than could be minted with all gas ever used.
+    // Implementations can pack up to 112 more bits into the same slot.
+    uint48 internal _ownedSupply;
+    uint48 internal _totalBurned;
+    uint48 internal _totalMinted;
 
     string constant public name = "Liquid Gas Token";
     string constant public symbol = "LGT";
@@ -37,7 +40,7 @@ contract ERC20PointerSupply is IERC20 {
     ///      from the burned and minted tokens instead of stored in its own variable.
     /// @return Total number of tokens in circulation.
     function totalSupply() public view override returns (uint256) {
-        return _totalMinted.sub(_totalBurned);
+        return uint256(_totalMinted).sub(_totalBurned);
     }
 
     /// @notice Return the number of tokens owned by accounts.
@@ -178,4 +181,10 @@ contract ERC20PointerSupply is IERC20 {
         _allowances[owner][spender] = amount;
         emit Approval(owner, spender, amount);
     }
+
+    /// @dev Downcast a supply counter for storage, reverts if it does not fit into 48 bits.
+    function _toUint48(uint256 value) internal pure returns (uint48) {
+        require(value <= type(uint48).max); // dev: supply overflow
+        return uint48(value);
+    }
 }
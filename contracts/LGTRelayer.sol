@@ -1,5 +1,6 @@
 // SPDX-License-Identifier: MIT
 pragma solidity 0.6.9;
+pragma experimental ABIEncoderV2;
 
 import "../interfaces/ILGT.sol";
 import "OpenZeppelin/openzeppelin-contracts@3.0.1/contracts/math/SafeMath.sol";
@@ -8,6 +9,12 @@ contract LGTRelayer {
     using SafeMath for uint256;
     ILGT public constant lgt = ILGT(0x000000000000C1CB11D5c062901F32D06248CE48);
 
+    struct Call {
+        address destination;
+        uint256 value;
+        bytes data;
+    }
+
     /// @notice Forward a call, buy and free as many tokens as possible for the fixed
     ///         amount of ether - `value` sent with this transaction.
     /// @param deadline The time after which the transaction can no longer be executed.
@@ -86,4 +93,48 @@ contract LGTRelayer {
         }
         return (optimalTokens, buyCost);
     }
-}
\ No newline at end of file
+
+    /// @notice Forward several calls, then buy and free the optimal amount of tokens
+    ///         for the gas used by all of them together. Any remaining ether is refunded.
+    ///         A failing call does not revert the others, its value is refunded.
+    /// @dev The gas used before the calls is estimated as the base gas plus the cheapest
+    ///      calldata cost, so the refund cap is never overestimated.
+    /// @param calls The calls to forward, in order.
+    /// @return success Whether each call succeeded.
+    /// @return gasUsed The gas used by each call.
+    /// @return tokensFreed The amount of tokens bought and freed.
+    /// @return ethSold The amount of ether spent to buy the tokens.
+    function forwardBatch(Call[] calldata calls)
+        external
+        payable
+        returns (bool[] memory success, uint256[] memory gasUsed, uint256 tokensFreed, uint256 ethSold)
+    {
+        uint256 initialGas = gasleft();
+        success = new bool[](calls.length);
+        gasUsed = new uint256[](calls.length);
+        uint256 remainingValue = msg.value;
+        for (uint256 i = 0; i < calls.length; i++) {
+            uint256 value = calls[i].value;
+            require(value <= remainingValue); // dev: not enough ether for calls
+            uint256 startGas = gasleft();
+            (success[i], ) = calls[i].destination.call{value : value}(calls[i].data);
+            gasUsed[i] = startGas - gasleft();
+            if (success[i]) {
+                remainingValue -= value;
+            }
+        }
+        tokensFreed = lgt.getOptimalFreeAmount(
+            initialGas - gasleft() + 21000 + 4 * msg.data.length,
+            tx.gasprice
+        );
+        if (tokensFreed > 0) {
+            ethSold = lgt.buyAndFree{value : remainingValue}(tokensFreed, now, msg.sender);
+            if (ethSold == 0) {
+                tokensFreed = 0;
+            }
+        } else if (remainingValue > 0) {
+            msg.sender.call{value : remainingValue}("");
+        }
+        return (success, gasUsed, tokensFreed, ethSold);
+    }
+}
@@ -19,7 +19,8 @@ contract LiquidERC20 is ERC20PointerSupply {
     //       Liquidity shares do not adhere to ERC20 specifications.
     //       However, a subset of ERC20-like functions are implemented.
 
-    uint256 internal _poolTotalSupply;
+    // packed into the slot of the supply counters
+    uint112 internal _poolTotalSupply;
     mapping (address => uint256) internal _poolBalances;
 
     event AddLiquidity(
@@ -56,7 +57,7 @@ contract LiquidERC20 is ERC20PointerSupply {
     ///      The total supply and the privately owned supply of the token.
     /// @return The amount of tokens in the liquidity pool.
     function poolTokenReserves() external view returns (uint256) {
-        return _totalMinted.sub(_totalBurned + _ownedSupply);
+        return uint256(_totalMinted).sub(uint256(_totalBurned) + _ownedSupply);
     }
 
     /// @notice Moves `amount` liquidity shares from the caller's account to `recipient`.
@@ -76,6 +77,13 @@ contract LiquidERC20 is ERC20PointerSupply {
         return true;
     }
 
+    /// @dev Store the total supply of liquidity shares after it increased.
+    ///      Shares scale with ether, so 112 bits are only exceeded in degenerate pools.
+    function _setPoolTotalSupply(uint256 poolTotalSupply) internal {
+        require(poolTotalSupply <= type(uint112).max); // dev: liquidity overflow
+        _poolTotalSupply = uint112(poolTotalSupply);
+    }
+
     // *** Constructor
     /// @dev Start with initial liquidity. Contract must be pre-funded.
     ///      This initial liquidity must never be removed.
@@ -83,7 +91,7 @@ contract LiquidERC20 is ERC20PointerSupply {
         // Implementation must mint at least 1 token to the pool during deployment.
         uint ethReserve = address(this).balance;
         require(ethReserve > 1000000000);
-        _poolTotalSupply += ethReserve;
+        _poolTotalSupply = uint112(ethReserve);
         _poolBalances[msg.sender] += ethReserve;
     }
 
@@ -113,7 +121,7 @@ contract LiquidERC20 is ERC20PointerSupply {
 
         uint256 ethReserve = address(this).balance - msg.value;
         uint256 ownedSupply = _ownedSupply;
-        uint256 tokenReserve = _totalMinted.sub(_totalBurned + ownedSupply);
+        uint256 tokenReserve = uint256(_totalMinted).sub(_totalBurned + ownedSupply);
         uint256 tokenAmount = msg.value.mul(tokenReserve) / ethReserve + 1;
         uint256 poolTotalSupply = _poolTotalSupply;
         uint256 liquidityCreated = msg.value.mul(poolTotalSupply) / ethReserve;
@@ -121,14 +129,14 @@ contract LiquidERC20 is ERC20PointerSupply {
         require(liquidityCreated >= minLiquidity); // dev: not enough liquidity can be created
 
         // create liquidity shares
-        _poolTotalSupply = poolTotalSupply + liquidityCreated;
+        _setPoolTotalSupply(poolTotalSupply + liquidityCreated);
         _poolBalances[msg.sender] += liquidityCreated;
 
         // remove LGTs from sender
         _balances[msg.sender] = _balances[msg.sender].sub(
             tokenAmount, "LGT: amount exceeds balance"
         );
-        _ownedSupply = ownedSupply.sub(tokenAmount);
+        _ownedSupply = _toUint48(ownedSupply.sub(tokenAmount));
 
         emit AddLiquidity(msg.sender, msg.value, tokenAmount);
         return liquidityCreated;
@@ -158,7 +166,7 @@ contract LiquidERC20 is ERC20PointerSupply {
         require(minTokens != 0); // dev: must remove positive token amount
         uint256 totalLiquidity = _poolTotalSupply;
         uint256 ownedSupply = _ownedSupply;
-        uint256 tokenReserve = _totalMinted.sub(_totalBurned + ownedSupply);
+        uint256 tokenReserve = uint256(_totalMinted).sub(_totalBurned + ownedSupply);
         uint256 ethAmount = amount.mul(address(this).balance) / totalLiquidity;
         uint256 tokenAmount = amount.mul(tokenReserve) / totalLiquidity;
         require(ethAmount >= minEth); // dev: can't remove enough eth
@@ -166,11 +174,11 @@ contract LiquidERC20 is ERC20PointerSupply {
 
         // Remove liquidity shares
         _poolBalances[msg.sender] = _poolBalances[msg.sender].sub(amount);
-        _poolTotalSupply = totalLiquidity.sub(amount);
+        _poolTotalSupply = uint112(totalLiquidity.sub(amount));
 
         // Transfer tokens
         _balances[msg.sender] += tokenAmount;
-        _ownedSupply = ownedSupply + tokenAmount;
+        _ownedSupply = _toUint48(ownedSupply + tokenAmount);
 
         emit RemoveLiquidity(msg.sender, ethAmount, tokenAmount);
 
@@ -229,12 +237,12 @@ contract LiquidERC20 is ERC20PointerSupply {
         require(ethSold != 0); // dev: no eth to sell
         require(minTokens != 0); // dev: must buy one or more tokens
         uint256 ownedSupply = _ownedSupply;
-        uint256 tokenReserve = _totalMinted.sub(_totalBurned + ownedSupply);
+        uint256 tokenReserve = uint256(_totalMinted).sub(_totalBurned + ownedSupply);
         uint256 ethReserve = address(this).balance.sub(ethSold);
         uint256 tokensBought = getInputPrice(ethSold, ethReserve, tokenReserve);
         require(tokensBought >= minTokens); // dev: not enough eth to buy tokens
         _balances[recipient] += tokensBought;
-        _ownedSupply = ownedSupply + tokensBought;
+        _ownedSupply = _toUint48(ownedSupply + tokensBought);
         return tokensBought;
     }
 
@@ -299,12 +307,12 @@ contract LiquidERC20 is ERC20PointerSupply {
         require(tokensBought != 0); // dev: must buy one or more tokens
         require(maxEth != 0); // dev: maxEth must greater than 0
         uint256 ownedSupply = _ownedSupply;
-        uint256 tokenReserve = _totalMinted.sub(_totalBurned + ownedSupply);
+        uint256 tokenReserve = uint256(_totalMinted).sub(_totalBurned + ownedSupply);
         uint256 ethReserve = address(this).balance.sub(maxEth);
         uint256 ethSold = getOutputPrice(tokensBought, ethReserve, tokenReserve);
         uint256 ethRefund = maxEth.sub(ethSold, "LGT: not enough ETH");
         _balances[recipient] += tokensBought;
-        _ownedSupply = ownedSupply + tokensBought;
+        _ownedSupply = _toUint48(ownedSupply + tokensBought);
         if (ethRefund != 0) {
             buyer.call{value: ethRefund}("");
         }
@@ -367,11 +375,11 @@ contract LiquidERC20 is ERC20PointerSupply {
         require(tokensSold != 0); // dev: must sell one or more tokens
         require(minEth != 0); // dev: minEth not set
         uint256 ownedSupply = _ownedSupply;
-        uint256 tokenReserve = _totalMinted.sub(_totalBurned + ownedSupply);
+        uint256 tokenReserve = uint256(_totalMinted).sub(_totalBurned + ownedSupply);
         uint256 ethBought = getInputPrice(tokensSold, tokenReserve, address(this).balance);
         require(ethBought >= minEth); // dev: tokens not worth enough
         _balances[buyer] = _balances[buyer].sub(tokensSold, "LGT: amount exceeds balance");
-        _ownedSupply = ownedSupply.sub(tokensSold);
+        _ownedSupply = _toUint48(ownedSupply.sub(tokensSold));
         recipient.call{value: ethBought}("");
         return ethBought;
     }
@@ -434,11 +442,11 @@ contract LiquidERC20 is ERC20PointerSupply {
         require(deadline >= now); // dev: deadline passed
         require(ethBought != 0); // dev: must buy more than 0 eth
         uint256 ownedSupply = _ownedSupply;
-        uint256 tokenReserve = _totalMinted.sub(_totalBurned + ownedSupply);
+        uint256 tokenReserve = uint256(_totalMinted).sub(_totalBurned + ownedSupply);
         uint256 tokensSold = getOutputPrice(ethBought, tokenReserve, address(this).balance);
         require(maxTokens >= tokensSold); // dev: need more tokens to sell
         _balances[buyer] = _balances[buyer].sub(tokensSold, "LGT: amount exceeds balance");
-        _ownedSupply = ownedSupply.sub(tokensSold);
+        _ownedSupply = _toUint48(ownedSupply.sub(tokensSold));
         recipient.call{value: ethBought}("");
         return tokensSold;
     }
@@ -492,7 +500,7 @@ contract LiquidERC20 is ERC20PointerSupply {
     /// @param ethSold The exact amount of ether you are selling.
     /// @return The amount of tokens that can be bought with `ethSold` ether.
     function getEthToTokenInputPrice(uint256 ethSold) public view returns(uint256) {
-        uint256 tokenReserve = _totalMinted.sub(_totalBurned + _ownedSupply);
+        uint256 tokenReserve = uint256(_totalMinted).sub(uint256(_totalBurned) + _ownedSupply);
         return getInputPrice(ethSold, address(this).balance, tokenReserve);
     }
 
@@ -500,7 +508,7 @@ contract LiquidERC20 is ERC20PointerSupply {
     /// @param tokensBought The exact amount of tokens bought
     /// @return The amount of ether needed to buy `tokensBought` tokens
     function getEthToTokenOutputPrice(uint256 tokensBought) public view returns (uint256) {
-        uint256 tokenReserve = _totalMinted.sub(_totalBurned + _ownedSupply);
+        uint256 tokenReserve = uint256(_totalMinted).sub(uint256(_totalBurned) + _ownedSupply);
         return getOutputPrice(tokensBought, address(this).balance, tokenReserve);
     }
 
@@ -508,7 +516,7 @@ contract LiquidERC20 is ERC20PointerSupply {
     /// @param tokensSold The exact amount of tokens you are selling.
     /// @return The amount of ether you receive for selling `tokensSold` tokens.
     function getTokenToEthInputPrice(uint256 tokensSold) public view returns (uint256) {
-        uint256 tokenReserve = _totalMinted.sub(_totalBurned + _ownedSupply);
+        uint256 tokenReserve = uint256(_totalMinted).sub(uint256(_totalBurned) + _ownedSupply);
         return getInputPrice(tokensSold, tokenReserve, address(this).balance);
     }
 
@@ -516,7 +524,41 @@ contract LiquidERC20 is ERC20PointerSupply {
     /// @param ethBought The exact amount of ether you are buying.
     /// @return The amount of tokens needed to buy `ethBought` ether.
     function getTokenToEthOutputPrice(uint256 ethBought) public view returns (uint256) {
-        uint256 tokenReserve = _totalMinted.sub(_totalBurned + _ownedSupply);
+        uint256 tokenReserve = uint256(_totalMinted).sub(uint256(_totalBurned) + _ownedSupply);
         return getOutputPrice(ethBought, tokenReserve, address(this).balance);
     }
+
+    /// @notice Quote many amounts in one call. The reserves are only read once and every
+    ///         result is equal to the result of the single price function for the same amount.
+    /// @param ethAmounts Exact amounts of ether, sold or bought.
+    /// @param tokenAmounts Exact amounts of tokens, bought or sold.
+    /// @return ethToTokenInput Tokens bought for `ethAmounts[i]` ether, see {getEthToTokenInputPrice}.
+    /// @return tokenToEthOutput Tokens needed to buy `ethAmounts[i]` ether, see {getTokenToEthOutputPrice}.
+    /// @return ethToTokenOutput Ether needed to buy `tokenAmounts[i]` tokens, see {getEthToTokenOutputPrice}.
+    /// @return tokenToEthInput Ether received for `tokenAmounts[i]` tokens, see {getTokenToEthInputPrice}.
+    function getPriceTable(uint256[] calldata ethAmounts, uint256[] calldata tokenAmounts)
+        external
+        view
+        returns (
+            uint256[] memory ethToTokenInput,
+            uint256[] memory tokenToEthOutput,
+            uint256[] memory ethToTokenOutput,
+            uint256[] memory tokenToEthInput
+        )
+    {
+        uint256 tokenReserve = uint256(_totalMinted).sub(uint256(_totalBurned) + _ownedSupply);
+        uint256 ethReserve = address(this).balance;
+        ethToTokenInput = new uint256[](ethAmounts.length);
+        tokenToEthOutput = new uint256[](ethAmounts.length);
+        for (uint256 i = 0; i < ethAmounts.length; i++) {
+            ethToTokenInput[i] = getInputPrice(ethAmounts[i], ethReserve, tokenReserve);
+            tokenToEthOutput[i] = getOutputPrice(ethAmounts[i], tokenReserve, ethReserve);
+        }
+        ethToTokenOutput = new uint256[](tokenAmounts.length);
+        tokenToEthInput = new uint256[](tokenAmounts.length);
+        for (uint256 i = 0; i < tokenAmounts.length; i++) {
+            ethToTokenOutput[i] = getOutputPrice(tokenAmounts[i], ethReserve, tokenReserve);
+            tokenToEthInput[i] = getInputPrice(tokenAmounts[i], tokenReserve, ethReserve);
+        }
+    }
 }
@@ -15,8 +15,65 @@ contract LiquidGasToken is LiquidERC20 {
     /// @dev Create `amount` contracts that can be destroyed by this contract.
     ///      Pass _totalMinted as `i`
     function _createContracts(uint256 amount, uint256 i) internal {
+        require(i + amount <= type(uint48).max); // dev: supply overflow
+        _createChildren(amount, i);
         assembly {
-            let end := add(i, amount)
+            // write the lower 48 bits of `i + amount` to _totalMinted, keep the rest of the slot
+            let shift := mul(_totalMinted_offset, 8)
+            sstore(_totalMinted_slot, or(
+                and(sload(_totalMinted_slot), not(shl(shift, 0xffffffffffff))),
+                shl(shift, and(add(i, amount), 0xffffffffffff))
+            ))
+        }
+    }
+
+    /// @dev Create the children `i` to `i + amount - 1` without updating _totalMinted.
+    function _createChildren(uint256 amount, uint256 i) internal {
+        _createChildrenWithGas(amount, 0, 0, i);
+    }
+
+    /// @dev Upper bound of the gas used to create one child contract, including the loop.
+    uint256 internal constant CREATE_GAS_BOUND = 40000;
+
+    /// @dev Create contracts until `maxAmount` contracts are created or creating another one
+    ///      could leave less than `gasReserve` gas. Chunks of 32 are created while a full
+    ///      chunk fits, the rest one by one.
+    ///      Pass _totalMinted as `i`
+    /// @return amount The amount of contracts created.
+    function _createContractsWithGas(uint256 maxAmount, uint256 gasReserve, uint256 i)
+        internal
+        returns (uint256 amount)
+    {
+        if (maxAmount > type(uint48).max - i) {
+            maxAmount = type(uint48).max - i;
+        }
+        uint256 end = _createChildrenWithGas(
+            maxAmount,
+            gasReserve + 32 * CREATE_GAS_BOUND,
+            gasReserve + CREATE_GAS_BOUND,
+            i
+        );
+        amount = end - i;
+        assembly {
+            // write the lower 48 bits of `end` to _totalMinted, keep the rest of the slot
+            let shift := mul(_totalMinted_offset, 8)
+            sstore(_totalMinted_slot, or(
+                and(sload(_totalMinted_slot), not(shl(shift, 0xffffffffffff))),
+                shl(shift, and(end, 0xffffffffffff))
+            ))
+        }
+    }
+
+    /// @dev Create the children from `i` on, at most `maxAmount`. A chunk of 32 is only started
+    ///      with more than `chunkGas` gas left and a single child with more than `tokenGas`.
+    ///      Pass 0 for both to create all `maxAmount` children.
+    /// @return end The salt after the last child created.
+    function _createChildrenWithGas(uint256 maxAmount, uint256 chunkGas, uint256 tokenGas, uint256 i)
+        internal
+        returns (uint256 end)
+    {
+        assembly {
+            end := add(i, maxAmount)
             mstore(0,
                 add(
                     add(
@@ -26,7 +83,7 @@ contract LiquidGasToken is LiquidERC20 {
                     0x3318585733ff6000526015600bf30000
                 )
             )
-            for {let j := div(amount, 32)} j {j := sub(j, 1)} {
+            for { } and(iszero(lt(sub(end, i), 32)), gt(gas(), chunkGas)) { i := add(i, 32) } {
                 pop(create2(0, 0, 30, add(i, 0))) pop(create2(0, 0, 30, add(i, 1)))
                 pop(create2(0, 0, 30, add(i, 2))) pop(create2(0, 0, 30, add(i, 3)))
                 pop(create2(0, 0, 30, add(i, 4))) pop(create2(0, 0, 30, add(i, 5)))
@@ -43,13 +100,12 @@ contract LiquidGasToken is LiquidERC20 {
                 pop(create2(0, 0, 30, add(i, 26))) pop(create2(0, 0, 30, add(i, 27)))
                 pop(create2(0, 0, 30, add(i, 28))) pop(create2(0, 0, 30, add(i, 29)))
                 pop(create2(0, 0, 30, add(i, 30))) pop(create2(0, 0, 30, add(i, 31)))
-                i := add(i, 32)
             }
 
-            for { } lt(i, end) { i := add(i, 1) } {
+            for { } and(lt(i, end), gt(gas(), tokenGas)) { i := add(i, 1) } {
                 pop(create2(0, 0, 30, i))
             }
-            sstore(_totalMinted_slot, end)
+            end := i
         }
     }
 
@@ -81,6 +137,20 @@ contract LiquidGasToken is LiquidERC20 {
     /// @dev Destroy `amount` contracts and free the gas.
     ///      Pass _totalBurned as `i`
     function _destroyContracts(uint256 amount, uint256 i) internal {
+        require(i + amount <= type(uint48).max); // dev: supply overflow
+        _destroyChildren(amount, i);
+        assembly {
+            // write the lower 48 bits of `i + amount` to _totalBurned, keep the rest of the slot
+            let shift := mul(_totalBurned_offset, 8)
+            sstore(_totalBurned_slot, or(
+                and(sload(_totalBurned_slot), not(shl(shift, 0xffffffffffff))),
+                shl(shift, and(add(i, amount), 0xffffffffffff))
+            ))
+        }
+    }
+
+    /// @dev Destroy the children `i` to `i + amount - 1` without updating _totalBurned.
+    function _destroyChildren(uint256 amount, uint256 i) internal {
         assembly {
             let end := add(i, amount)
 
@@ -102,12 +172,47 @@ contract LiquidGasToken is LiquidERC20 {
             )
             mstore(add(data, 53), keccak256(add(data, 53), 30))
             let ptr := add(data, 21)
+            // the prefix and init code hash stay in place, only the salt is overwritten
+            for {let j := div(amount, 32)} j {j := sub(j, 1)} {
+                mstore(ptr, i) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 1)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 2)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 3)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 4)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 5)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 6)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 7)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 8)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 9)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 10)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 11)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 12)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 13)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 14)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 15)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 16)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 17)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 18)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 19)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 20)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 21)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 22)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 23)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 24)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 25)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 26)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 27)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 28)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 29)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 30)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                mstore(ptr, add(i, 31)) pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
+                i := add(i, 32)
+            }
+
             for { } lt(i, end) { i := add(i, 1) } {
                 mstore(ptr, i)
                 pop(call(gas(), keccak256(data, 85), 0, 0, 0, 0, 0))
             }
-
-            sstore(_totalBurned_slot, end)
         }
     }
 
@@ -130,7 +235,7 @@ contract LiquidGasToken is LiquidERC20 {
     function mint(uint256 amount) external {
         _createContracts(amount, _totalMinted);
         _balances[msg.sender] += amount;
-        _ownedSupply += amount;
+        _ownedSupply = _toUint48(uint256(_ownedSupply) + amount);
     }
 
     /// @notice Mint Liquid Gas Tokens for `recipient`.
@@ -139,7 +244,7 @@ contract LiquidGasToken is LiquidERC20 {
     function mintFor(uint256 amount, address recipient) external {
         _createContracts(amount, _totalMinted);
         _balances[recipient] += amount;
-        _ownedSupply += amount;
+        _ownedSupply = _toUint48(uint256(_ownedSupply) + amount);
     }
 
     // *** Mint to liquidity pool
@@ -182,7 +287,7 @@ contract LiquidGasToken is LiquidERC20 {
         // calculate optimum values for tokens and ether to add
         uint256 totalMinted = _totalMinted;
         tokenAmount = maxTokens;
-        uint256 tokenReserve = totalMinted.sub(_totalBurned + _ownedSupply);
+        uint256 tokenReserve = totalMinted.sub(uint256(_totalBurned) + _ownedSupply);
         uint ethReserve = address(this).balance - msg.value;
         ethAmount = (tokenAmount.mul(ethReserve) / tokenReserve).sub(1);
         if (ethAmount > msg.value) {
@@ -198,7 +303,7 @@ contract LiquidGasToken is LiquidERC20 {
         _createContracts(tokenAmount, totalMinted);
 
         // Create liquidity shares for recipient
-        _poolTotalSupply = totalLiquidity + liquidityCreated;
+        _setPoolTotalSupply(totalLiquidity + liquidityCreated);
         _poolBalances[recipient] += liquidityCreated;
 
         emit AddLiquidity(recipient, ethAmount, tokenAmount);
@@ -235,7 +340,7 @@ contract LiquidGasToken is LiquidERC20 {
         require(deadline >= now); // dev: deadline passed
         require(amount != 0); // dev: must sell one or more tokens
         uint256 totalMinted = _totalMinted;
-        uint256 tokenReserve = totalMinted.sub(_totalBurned + _ownedSupply);
+        uint256 tokenReserve = totalMinted.sub(uint256(_totalBurned) + _ownedSupply);
         uint256 ethBought = getInputPrice(amount, tokenReserve, address(this).balance);
         require(ethBought >= minEth); // dev: tokens not worth enough
         _createContracts(amount, totalMinted);
@@ -264,6 +369,111 @@ contract LiquidGasToken is LiquidERC20 {
         return mintToSellTo(amount, minEth, deadline, msg.sender);
     }
 
+    // *** Mint as much as fits
+
+    /// @notice Mint as many Liquid Gas Tokens as the gas of the transaction allows,
+    ///         sell them for ether and transfer the ether to the `recipient`.
+    /// @dev Tokens are minted until creating another one could leave less than `gasReserve`
+    ///      gas, the total is then priced and sold at once.
+    /// @param gasReserve The gas left for pricing and paying out after minting.
+    /// @param minEth The minimum amount of ether to receive for the transaction.
+    ///         Will revert if the tokens don't sell for enough ether.
+    /// @param deadline The time after which the transaction can no longer be executed.
+    ///        Will revert if the current timestamp is after the deadline.
+    /// @param recipient The ether from the sale is transferred to this address.
+    /// @return amount The amount of tokens minted and sold.
+    /// @return ethBought The amount of ether received from the sale.
+    function mintMaxToSellTo(
+        uint256 gasReserve,
+        uint256 minEth,
+        uint256 deadline,
+        address payable recipient
+    )
+        public
+        returns (uint256 amount, uint256 ethBought)
+    {
+        require(deadline >= now); // dev: deadline passed
+        uint256 totalMinted = _totalMinted;
+        uint256 tokenReserve = totalMinted.sub(uint256(_totalBurned) + _ownedSupply);
+        amount = _createContractsWithGas(type(uint48).max, gasReserve, totalMinted);
+        require(amount != 0); // dev: not enough gas to mint
+        ethBought = getInputPrice(amount, tokenReserve, address(this).balance);
+        require(ethBought >= minEth); // dev: tokens not worth enough
+        recipient.call{value: ethBought}("");
+        return (amount, ethBought);
+    }
+
+    /// @notice Mint as many Liquid Gas Tokens as the gas of the transaction allows
+    ///         and sell them for ether.
+    /// @dev See {mintMaxToSellTo}.
+    /// @param gasReserve The gas left for pricing and paying out after minting.
+    /// @param minEth The minimum amount of ether to receive for the transaction.
+    ///         Will revert if the tokens don't sell for enough ether.
+    /// @param deadline The time after which the transaction can no longer be executed.
+    ///        Will revert if the current timestamp is after the deadline.
+    /// @return amount The amount of tokens minted and sold.
+    /// @return ethBought The amount of ether received from the sale.
+    function mintMaxToSell(uint256 gasReserve, uint256 minEth, uint256 deadline)
+        external
+        returns (uint256 amount, uint256 ethBought)
+    {
+        return mintMaxToSellTo(gasReserve, minEth, deadline, msg.sender);
+    }
+
+    /// @notice Mint as many Liquid Gas Tokens as the gas of the transaction and the sent
+    ///         ether allow and add them to the Liquidity Pool.
+    ///         The liquidity shares are created for the `recipient`.
+    ///         Emits an {AddLiquidity} event.
+    /// @dev Tokens are minted until creating another one could leave less than `gasReserve`
+    ///      gas or the ether sent can't match another token, the total is then added at once.
+    ///      Excess ether that is not added to the pool will be refunded.
+    /// @param gasReserve The gas left for adding the liquidity and refunding after minting.
+    /// @param minLiquidity The minimum amount of liquidity shares to create,
+    ///         will revert if not enough liquidity can be created.
+    /// @param deadline The time after which the transaction can no longer be executed.
+    ///        Will revert if the current timestamp is after the deadline.
+    /// @param recipient Liquidity shares are created for this address.
+    /// @return tokenAmount Amount of tokens minted and invested.
+    /// @return ethAmount Amount of ether invested.
+    /// @return liquidityCreated Number of liquidity shares created.
+    function mintMaxToLiquidity(
+        uint256 gasReserve,
+        uint256 minLiquidity,
+        uint256 deadline,
+        address recipient
+    )
+        external
+        payable
+        returns (uint256 tokenAmount, uint256 ethAmount, uint256 liquidityCreated)
+    {
+        require(deadline >= now); // dev: deadline passed
+        require(msg.value != 0); // dev: must provide ether to add liquidity
+        uint256 totalMinted = _totalMinted;
+        uint256 tokenReserve = totalMinted.sub(uint256(_totalBurned) + _ownedSupply);
+        uint256 ethReserve = address(this).balance - msg.value;
+
+        // at most as many tokens as the ether can match, see {mintToLiquidity}
+        tokenAmount = _createContractsWithGas(
+            (msg.value + 1).mul(tokenReserve) / ethReserve, gasReserve, totalMinted
+        );
+        require(tokenAmount != 0); // dev: not enough gas to mint
+        ethAmount = (tokenAmount.mul(ethReserve) / tokenReserve).sub(1);
+        uint256 totalLiquidity = _poolTotalSupply;
+        liquidityCreated = ethAmount.mul(totalLiquidity) / ethReserve;
+        require(liquidityCreated >= minLiquidity); // dev: not enough liquidity can be created
+
+        _setPoolTotalSupply(totalLiquidity + liquidityCreated);
+        _poolBalances[recipient] += liquidityCreated;
+
+        emit AddLiquidity(recipient, ethAmount, tokenAmount);
+
+        // refund excess ether
+        if (msg.value > ethAmount) {
+            msg.sender.call{value: msg.value - ethAmount}("");
+        }
+        return (tokenAmount, ethAmount, liquidityCreated);
+    }
+
     // ***** Gas Token Freeing
     //       -----------------
     //       Different ways to free Gas Tokens
@@ -280,7 +490,7 @@ contract LiquidGasToken is LiquidERC20 {
             return false;
         }
         _balances[msg.sender] = balance - amount;
-        _ownedSupply = _ownedSupply.sub(amount);
+        _ownedSupply = _toUint48(uint256(_ownedSupply).sub(amount));
         _destroyContracts(amount, _totalBurned);
         return true;
     }
@@ -299,12 +509,76 @@ contract LiquidGasToken is LiquidERC20 {
             return false;
         }
         _balances[owner] = balance - amount;
-        _ownedSupply = _ownedSupply.sub(amount);
+        _ownedSupply = _toUint48(uint256(_ownedSupply).sub(amount));
         _approve(owner, msg.sender, currentAllowance - amount);
         _destroyContracts(amount, _totalBurned);
         return true;
     }
 
+    /// @notice Free up to `amount` Liquid Gas Tokens from the `sender`'s balance.
+    /// @dev Frees as many tokens as the balance allows instead of returning False.
+    /// @param amount The maximum amount of tokens to free.
+    /// @return freed The amount of tokens freed.
+    function freeUpTo(uint256 amount) public returns (uint256 freed) {
+        uint256 balance = _balances[msg.sender];
+        freed = balance < amount ? balance : amount;
+        if (freed == 0) {
+            return 0;
+        }
+        _balances[msg.sender] = balance - freed;
+        _ownedSupply = _toUint48(uint256(_ownedSupply).sub(freed));
+        _destroyContracts(freed, _totalBurned);
+        return freed;
+    }
+
+    /// @notice Free up to `amount` Liquid Gas Tokens from the `owners`'s balance.
+    /// @dev Frees as many tokens as the balance and the allowance allow instead of returning False.
+    /// @param amount The maximum amount of tokens to free.
+    /// @param owner The `owner` of the tokens. The `sender` must have an allowance.
+    /// @return freed The amount of tokens freed.
+    function freeFromUpTo(uint256 amount, address owner) public returns (uint256 freed) {
+        uint256 balance = _balances[owner];
+        uint256 currentAllowance = _allowances[owner][msg.sender];
+        freed = balance < amount ? balance : amount;
+        freed = currentAllowance < freed ? currentAllowance : freed;
+        if (freed == 0) {
+            return 0;
+        }
+        _balances[owner] = balance - freed;
+        _ownedSupply = _toUint48(uint256(_ownedSupply).sub(freed));
+        _approve(owner, msg.sender, currentAllowance - freed);
+        _destroyContracts(freed, _totalBurned);
+        return freed;
+    }
+
+    /// @notice Free up to `amount` Liquid Gas Tokens from the `sender`'s balance, but no more
+    ///         than the refund of a transaction using `gasBurned` gas can put to use.
+    /// @dev See {getMaxUsefulFreeAmount}.
+    /// @param amount The maximum amount of tokens to free.
+    /// @param gasBurned The gas used by the transaction before refunds, without freeing.
+    ///        This includes the 21000 base gas and calldata costs.
+    /// @return freed The amount of tokens freed.
+    function freeUpToRefund(uint256 amount, uint256 gasBurned) external returns (uint256 freed) {
+        uint256 useful = _maxUsefulFreeAmount(gasBurned);
+        return freeUpTo(useful < amount ? useful : amount);
+    }
+
+    /// @notice Free up to `amount` Liquid Gas Tokens from the `owners`'s balance, but no more
+    ///         than the refund of a transaction using `gasBurned` gas can put to use.
+    /// @dev See {getMaxUsefulFreeAmount}.
+    /// @param amount The maximum amount of tokens to free.
+    /// @param owner The `owner` of the tokens. The `sender` must have an allowance.
+    /// @param gasBurned The gas used by the transaction before refunds, without freeing.
+    ///        This includes the 21000 base gas and calldata costs.
+    /// @return freed The amount of tokens freed.
+    function freeFromUpToRefund(uint256 amount, address owner, uint256 gasBurned)
+        external
+        returns (uint256 freed)
+    {
+        uint256 useful = _maxUsefulFreeAmount(gasBurned);
+        return freeFromUpTo(useful < amount ? useful : amount, owner);
+    }
+
     // *** Free from liquidity pool
 
     /// @notice Buy `amount` tokens from the liquidity pool and immediately free them.
@@ -328,7 +602,7 @@ contract LiquidGasToken is LiquidERC20 {
             return 0;
         }
         uint256 totalBurned = _totalBurned;
-        uint256 tokenReserve = _totalMinted.sub(totalBurned + _ownedSupply);
+        uint256 tokenReserve = uint256(_totalMinted).sub(totalBurned + _ownedSupply);
         if (tokenReserve < amount) {
             refundTo.call{value: msg.value}("");
             return 0;
@@ -362,12 +636,186 @@ contract LiquidGasToken is LiquidERC20 {
         require(deadline >= now); // dev: deadline passed
         uint256 ethReserve = address(this).balance - msg.value;
         uint256 totalBurned = _totalBurned;
-        uint256 tokenReserve = _totalMinted.sub(totalBurned + _ownedSupply);
+        uint256 tokenReserve = uint256(_totalMinted).sub(totalBurned + _ownedSupply);
         uint256 tokensBought = getInputPrice(msg.value, ethReserve, tokenReserve);
         _destroyContracts(tokensBought, totalBurned);
         return tokensBought;
     }
 
+    /// @notice Burn `amount` liquidity shares, receive their ether and immediately free their tokens.
+    /// @dev The tokens are freed directly from the liquidity pool without being
+    ///      transferred to the `sender` first.
+    /// @param amount Amount of liquidity shares to burn.
+    /// @param minEth Minimum amount of ether to withdraw.
+    /// @param minTokens Minimum amount of tokens to free.
+    /// @param deadline The time after which the transaction can no longer be executed.
+    ///        Will revert if the current timestamp is after the deadline.
+    /// @return ethAmount The amount of ether withdrawn.
+    /// @return tokenAmount The amount of tokens freed.
+    function removeLiquidityAndFree(uint256 amount, uint256 minEth, uint256 minTokens, uint256 deadline)
+        external
+        returns (uint256 ethAmount, uint256 tokenAmount)
+    {
+        require(deadline >= now); // dev: deadline passed
+        require(amount != 0); // dev: amount of liquidity to remove must be positive
+        require(minEth != 0); // dev: must remove positive eth amount
+        require(minTokens != 0); // dev: must remove positive token amount
+        uint256 totalLiquidity = _poolTotalSupply;
+        uint256 totalBurned = _totalBurned;
+        uint256 tokenReserve = uint256(_totalMinted).sub(totalBurned + _ownedSupply);
+        ethAmount = amount.mul(address(this).balance) / totalLiquidity;
+        tokenAmount = amount.mul(tokenReserve) / totalLiquidity;
+        require(ethAmount >= minEth); // dev: can't remove enough eth
+        require(tokenAmount >= minTokens); // dev: can't remove enough tokens
+
+        // Remove liquidity shares
+        _poolBalances[msg.sender] = _poolBalances[msg.sender].sub(amount);
+        _poolTotalSupply = uint112(totalLiquidity.sub(amount));
+
+        emit RemoveLiquidity(msg.sender, ethAmount, tokenAmount);
+
+        // Free tokens straight from the pool
+        _destroyContracts(tokenAmount, totalBurned);
+
+        // Transfer ether
+        msg.sender.call{value: ethAmount}("");
+    }
+
+    // *** Optimal free amount
+    //     Gas model of `buyAndFree`, fitted to the internal benchmarks:
+    //     Buying and freeing `amount` tokens uses FREE_FIXED_GAS + FREE_GAS_PER_TOKEN * amount
+    //     gas before refunds. Each freed token refunds REFUND_PER_TOKEN gas, but the total
+    //     refund is capped at half the gas used by the transaction.
+    //     Freeing owned tokens with `freeUpTo` does not buy from the pool, but updates a balance.
+    //     Its fixed cost PLAIN_FREE_FIXED_GAS is fitted to the `free` benchmarks, the cost
+    //     per token is the same.
+
+    uint256 internal constant FREE_FIXED_GAS = 9818;
+    uint256 internal constant PLAIN_FREE_FIXED_GAS = 18519;
+    uint256 internal constant FREE_GAS_PER_TOKEN = 5855;
+    uint256 internal constant REFUND_PER_TOKEN = 24000;
+
+    /// @dev Gas refunded when freeing `amount` tokens in a transaction that uses
+    ///      `gasBurned` gas before refunds without freeing tokens.
+    ///      `fixedGas` is the fixed cost of the way the tokens are freed.
+    function _freeRefund(uint256 amount, uint256 gasBurned, uint256 fixedGas) internal pure returns (uint256) {
+        uint256 maxRefund = (gasBurned + fixedGas + FREE_GAS_PER_TOKEN * amount) / 2;
+        uint256 refund = REFUND_PER_TOKEN * amount;
+        return refund < maxRefund ? refund : maxRefund;
+    }
+
+    /// @dev The most tokens worth freeing with {freeUpTo} in a transaction that uses `gasBurned`
+    ///      gas before refunds without freeing tokens. Once the refund is capped, another token
+    ///      only adds half of its own gas cost to the refund.
+    function _maxUsefulFreeAmount(uint256 gasBurned) internal pure returns (uint256 amount) {
+        amount = (gasBurned + PLAIN_FREE_FIXED_GAS) / (2 * REFUND_PER_TOKEN - FREE_GAS_PER_TOKEN);
+        if (
+            _freeRefund(amount + 1, gasBurned, PLAIN_FREE_FIXED_GAS)
+                - _freeRefund(amount, gasBurned, PLAIN_FREE_FIXED_GAS) > FREE_GAS_PER_TOKEN
+        ) {
+            amount += 1;
+        }
+        uint256 gasCost = PLAIN_FREE_FIXED_GAS + FREE_GAS_PER_TOKEN * amount;
+        if (_freeRefund(amount, gasBurned, PLAIN_FREE_FIXED_GAS) <= gasCost) {
+            return 0;
+        }
+        return amount;
+    }
+
+    /// @dev True if freeing `amount + 1` tokens saves more than freeing `amount` tokens.
+    function _freeSavingsIncrease(
+        uint256 amount,
+        uint256 gasBurned,
+        uint256 gasPrice,
+        uint256 tokenReserve,
+        uint256 ethReserve
+    )
+        internal
+        pure
+        returns (bool)
+    {
+        uint256 refundIncrease = _freeRefund(amount + 1, gasBurned, FREE_FIXED_GAS)
+            - _freeRefund(amount, gasBurned, FREE_FIXED_GAS);
+        if (refundIncrease <= FREE_GAS_PER_TOKEN) {
+            return false;
+        }
+        uint256 priceIncrease = getOutputPrice(amount + 1, ethReserve, tokenReserve)
+            - getOutputPrice(amount, ethReserve, tokenReserve);
+        return (refundIncrease - FREE_GAS_PER_TOKEN).mul(gasPrice) > priceIncrease;
+    }
+
+    /// @dev True if freeing `amount` tokens bought for `price` saves more than it costs.
+    function _freeSaves(uint256 amount, uint256 gasBurned, uint256 gasPrice, uint256 price)
+        internal
+        pure
+        returns (bool)
+    {
+        uint256 refund = _freeRefund(amount, gasBurned, FREE_FIXED_GAS);
+        uint256 gasCost = FREE_FIXED_GAS + FREE_GAS_PER_TOKEN * amount;
+        return refund > gasCost && (refund - gasCost).mul(gasPrice) > price;
+    }
+
+    /// @dev The amount of tokens to buy and free that maximizes the net savings.
+    ///      Savings are concave in the amount: The refund is linear until it is capped
+    ///      and the price is convex, so a binary search on the marginal savings finds the optimum.
+    function _optimalFreeAmount(
+        uint256 gasBurned,
+        uint256 gasPrice,
+        uint256 tokenReserve,
+        uint256 ethReserve
+    )
+        internal
+        pure
+        returns (uint256)
+    {
+        if (tokenReserve < 2) {
+            return 0;
+        }
+        // freeing more tokens than this can not increase the refund
+        uint256 high = (gasBurned + FREE_FIXED_GAS) / (2 * REFUND_PER_TOKEN - FREE_GAS_PER_TOKEN) + 1;
+        if (high > tokenReserve - 1) {
+            high = tokenReserve - 1;
+        }
+        uint256 low = 1;
+        while (low < high) {
+            uint256 mid = (low + high) / 2;
+            if (_freeSavingsIncrease(mid, gasBurned, gasPrice, tokenReserve, ethReserve)) {
+                low = mid + 1;
+            } else {
+                high = mid;
+            }
+        }
+        if (!_freeSaves(low, gasBurned, gasPrice, getOutputPrice(low, ethReserve, tokenReserve))) {
+            return 0;
+        }
+        return low;
+    }
+
+    /// @notice The amount of tokens to buy and free with {buyAndFree} that maximizes the net
+    ///         savings of a transaction, after paying for the tokens. Respects the refund cap.
+    /// @param gasBurned The gas used by the transaction before refunds, without buying and freeing.
+    ///        This includes the 21000 base gas and calldata costs.
+    /// @param gasPrice The gas price of the transaction.
+    /// @return The optimal amount of tokens, 0 if buying tokens does not save ether.
+    function getOptimalFreeAmount(uint256 gasBurned, uint256 gasPrice) external view returns (uint256) {
+        return _optimalFreeAmount(
+            gasBurned,
+            gasPrice,
+            uint256(_totalMinted).sub(uint256(_totalBurned) + _ownedSupply),
+            address(this).balance
+        );
+    }
+
+    /// @notice The most tokens worth freeing with {freeUpTo}, ignoring their price.
+    ///         Freeing more tokens than this costs more gas than the capped refund returns.
+    ///         {freeUpToRefund} and {freeFromUpToRefund} stop at this amount.
+    /// @param gasBurned The gas used by the transaction before refunds, without freeing.
+    ///        This includes the 21000 base gas and calldata costs.
+    /// @return The amount of tokens, 0 if freeing any tokens costs more gas than it refunds.
+    function getMaxUsefulFreeAmount(uint256 gasBurned) external pure returns (uint256) {
+        return _maxUsefulFreeAmount(gasBurned);
+    }
+
     // ***** Deployment Functions
     //       ------------------
     //       Execute a deployment while buying tokens and freeing them.
@@ -391,7 +839,7 @@ contract LiquidGasToken is LiquidERC20 {
     {
         require(deadline >= now); // dev: deadline passed
         uint256 totalBurned = _totalBurned;
-        uint256 tokenReserve = _totalMinted.sub(totalBurned + _ownedSupply);
+        uint256 tokenReserve = uint256(_totalMinted).sub(totalBurned + _ownedSupply);
         uint256 price = getOutputPrice(tokenAmount, address(this).balance - msg.value, tokenReserve);
         uint256 refund = msg.value.sub(price, "LGT: insufficient ether");
         _destroyContracts(tokenAmount, totalBurned);
@@ -423,7 +871,7 @@ contract LiquidGasToken is LiquidERC20 {
     {
         require(deadline >= now); // dev: deadline passed
         uint256 totalBurned = _totalBurned;
-        uint256 tokenReserve = _totalMinted.sub(totalBurned + _ownedSupply);
+        uint256 tokenReserve = uint256(_totalMinted).sub(totalBurned + _ownedSupply);
         uint256 price = getOutputPrice(tokenAmount, address(this).balance - msg.value, tokenReserve);
         uint256 refund = msg.value.sub(price, "LGT: insufficient ether");
         _destroyContracts(tokenAmount, totalBurned);
@@ -437,6 +885,362 @@ contract LiquidGasToken is LiquidERC20 {
         return contractAddress;
     }
 
+    /// @dev Buy and free the optimal amount of tokens for a transaction that used `gasBurned` gas
+    ///      so far, limited by the ether sent. Any ether not spent is refunded to the `sender`.
+    function _buyAndFreeOptimal(uint256 gasBurned) internal returns (uint256 tokenAmount, uint256 ethSold) {
+        uint256 totalBurned = _totalBurned;
+        uint256 tokenReserve = uint256(_totalMinted).sub(totalBurned + _ownedSupply);
+        uint256 ethReserve = address(this).balance - msg.value;
+        tokenAmount = _optimalFreeAmount(gasBurned, tx.gasprice, tokenReserve, ethReserve);
+        if (tokenAmount != 0) {
+            ethSold = getOutputPrice(tokenAmount, ethReserve, tokenReserve);
+            if (ethSold > msg.value) {
+                // buy as many tokens as the ether allows, one wei is held back because the
+                // output price rounds up. The fixed gas cost can make fewer tokens a loss.
+                tokenAmount = msg.value == 0 ? 0 : getInputPrice(msg.value - 1, ethReserve, tokenReserve);
+                ethSold = tokenAmount == 0 ? 0 : getOutputPrice(tokenAmount, ethReserve, tokenReserve);
+                if (tokenAmount != 0 && !_freeSaves(tokenAmount, gasBurned, tx.gasprice, ethSold)) {
+                    tokenAmount = 0;
+                    ethSold = 0;
+                }
+            }
+            _destroyContracts(tokenAmount, totalBurned);
+        }
+        if (msg.value > ethSold) {
+            msg.sender.call{value: msg.value - ethSold}("");
+        }
+    }
+
+    /// @notice Deploy a contract via create(), then buy and free the amount of tokens
+    ///         that saves the most for the gas used by the deployment and the gas price.
+    ///         Provide enough ether to buy the tokens, any ether not spent is refunded.
+    /// @param deadline The time after which the transaction can no longer be executed.
+    ///        Will revert if the current timestamp is after the deadline.
+    /// @param bytecode The bytecode of the contract you want to deploy.
+    /// @dev The calldata is priced at 4 gas per byte, so the refund cap is never overestimated.
+    ///      Buys fewer tokens if not enough ether is sent.
+    ///      Can't send ether with deployment. Pre-fund the address instead.
+    /// @return contractAddress The address where the contract was deployed.
+    /// @return tokenAmount The number of tokens bought and freed.
+    /// @return ethSold The amount of ether spent to buy the tokens.
+    function deployAuto(uint256 deadline, bytes memory bytecode)
+        external
+        payable
+        returns (address contractAddress, uint256 tokenAmount, uint256 ethSold)
+    {
+        uint256 initialGas = gasleft();
+        require(deadline >= now); // dev: deadline passed
+        assembly {
+            contractAddress := create(0, add(bytecode, 32), mload(bytecode))
+        }
+        (tokenAmount, ethSold) = _buyAndFreeOptimal(initialGas - gasleft() + 21000 + 4 * msg.data.length);
+    }
+
+    /// @notice Deploy a contract via create2(), then buy and free the amount of tokens
+    ///         that saves the most for the gas used by the deployment and the gas price.
+    ///         Provide enough ether to buy the tokens, any ether not spent is refunded.
+    /// @param deadline The time after which the transaction can no longer be executed.
+    ///        Will revert if the current timestamp is after the deadline.
+    /// @param salt The salt is used for create2() to determine the deployment address.
+    /// @param bytecode The bytecode of the contract you want to deploy.
+    /// @dev The calldata is priced at 4 gas per byte, so the refund cap is never overestimated.
+    ///      Buys fewer tokens if not enough ether is sent.
+    ///      Can't send ether with deployment. Pre-fund the address instead.
+    /// @return contractAddress The address where the contract was deployed.
+    /// @return tokenAmount The number of tokens bought and freed.
+    /// @return ethSold The amount of ether spent to buy the tokens.
+    function create2Auto(uint256 deadline, uint256 salt, bytes memory bytecode)
+        external
+        payable
+        returns (address contractAddress, uint256 tokenAmount, uint256 ethSold)
+    {
+        uint256 initialGas = gasleft();
+        require(deadline >= now); // dev: deadline passed
+        assembly {
+            contractAddress := create2(0, add(bytecode, 32), mload(bytecode), salt)
+        }
+        (tokenAmount, ethSold) = _buyAndFreeOptimal(initialGas - gasleft() + 21000 + 4 * msg.data.length);
+    }
+
+    // ***** Batch Operations
+    //       ----------------
+    //       Execute a sequence of pool and gas token operations in one transaction.
+    //       The bookkeeping is done in memory: storage is read once at the start,
+    //       all children are created and destroyed in one go and storage is written
+    //       once at the end. Ether is credited to the sender and paid out at the end.
+
+    // *** Operation codes
+    //     `ops` is a flat list of operation codes, each followed by its arguments.
+    //     Ether amounts are taken from the ether credit of the batch, which starts
+    //     at `msg.value`. Ether received is added to the credit.
+    //     Returns one result per operation, listed after the arguments.
+
+    /// @dev [amount] -> amount
+    uint256 internal constant OP_MINT = 1;
+    /// @dev [maxTokens, ethAmount, minLiquidity] -> liquidityCreated
+    uint256 internal constant OP_MINT_TO_LIQUIDITY = 2;
+    /// @dev [amount, minEth] -> ethBought
+    uint256 internal constant OP_MINT_TO_SELL = 3;
+    /// @dev [ethAmount, maxTokens, minLiquidity] -> liquidityCreated
+    uint256 internal constant OP_ADD_LIQUIDITY = 4;
+    /// @dev [amount, minEth, minTokens] -> tokenAmount
+    uint256 internal constant OP_REMOVE_LIQUIDITY = 5;
+    /// @dev [amount] -> amount
+    uint256 internal constant OP_FREE = 6;
+    /// @dev [amount, maxEth] -> ethSold
+    uint256 internal constant OP_BUY_AND_FREE = 7;
+    /// @dev [ethSold, minTokens] -> tokensBought
+    uint256 internal constant OP_BUY = 8;
+    /// @dev [tokensSold, minEth] -> ethBought
+    uint256 internal constant OP_SELL = 9;
+
+    /// @dev In-memory copy of the state touched by a batch.
+    struct BatchState {
+        uint256 totalMinted;
+        uint256 totalBurned;
+        uint256 ownedSupply;
+        uint256 poolTotalSupply;
+        uint256 balance;
+        uint256 poolBalance;
+        uint256 ethReserve;
+        uint256 credit;
+    }
+
+    /// @notice Execute a sequence of operations for the `sender` in one transaction.
+    ///         All operations succeed or the whole batch reverts.
+    ///         Emits {AddLiquidity} and {RemoveLiquidity} events like the single operations.
+    /// @dev Unlike `free`, freeing more tokens than owned reverts instead of returning False.
+    ///      Children are created before any are destroyed, so tokens minted in a batch
+    ///      can be freed in the same batch.
+    /// @param ops Operation codes, each followed by its arguments. See `OP_*`.
+    /// @param deadline The time after which the transaction can no longer be executed.
+    ///        Will revert if the current timestamp is after the deadline.
+    /// @return results The result of each operation.
+    function batch(uint256[] calldata ops, uint256 deadline)
+        external
+        payable
+        returns (uint256[] memory results)
+    {
+        require(deadline >= now); // dev: deadline passed
+        uint256 totalMinted = _totalMinted;
+        uint256 totalBurned = _totalBurned;
+        // assigned one by one, the struct constructor would need all fields on the stack at once
+        BatchState memory s;
+        s.totalMinted = totalMinted;
+        s.totalBurned = totalBurned;
+        s.ownedSupply = _ownedSupply;
+        s.poolTotalSupply = _poolTotalSupply;
+        s.balance = _balances[msg.sender];
+        s.poolBalance = _poolBalances[msg.sender];
+        s.ethReserve = address(this).balance - msg.value;
+        s.credit = msg.value;
+
+        results = new uint256[](ops.length);
+        uint256 count;
+        uint256 i;
+        while (i < ops.length) {
+            (results[count], i) = _batchOperation(s, ops, i);
+            count++;
+        }
+        assembly { mstore(results, count) }
+
+        // create and destroy all children, then write back the state
+        _createChildren(s.totalMinted - totalMinted, totalMinted);
+        _destroyChildren(s.totalBurned - totalBurned, totalBurned);
+        _writeSupply(s.ownedSupply, s.totalBurned, s.totalMinted, s.poolTotalSupply);
+        _balances[msg.sender] = s.balance;
+        _poolBalances[msg.sender] = s.poolBalance;
+
+        // pay out the remaining ether credit
+        if (s.credit != 0) {
+            (bool success, ) = msg.sender.call{value: s.credit}("");
+            require(success); // dev: ether transfer failed
+        }
+        return results;
+    }
+
+    /// @dev Write all supply counters with a single SSTORE, they fill the whole slot.
+    function _writeSupply(uint256 ownedSupply, uint256 totalBurned, uint256 totalMinted, uint256 poolTotalSupply)
+        internal
+    {
+        require((ownedSupply | totalBurned | totalMinted) <= type(uint48).max); // dev: supply overflow
+        require(poolTotalSupply <= type(uint112).max); // dev: liquidity overflow
+        assembly {
+            sstore(_ownedSupply_slot, or(
+                or(
+                    shl(mul(_ownedSupply_offset, 8), and(ownedSupply, 0xffffffffffff)),
+                    shl(mul(_totalBurned_offset, 8), and(totalBurned, 0xffffffffffff))
+                ),
+                or(
+                    shl(mul(_totalMinted_offset, 8), and(totalMinted, 0xffffffffffff)),
+                    shl(mul(_poolTotalSupply_offset, 8), poolTotalSupply)
+                )
+            ))
+        }
+    }
+
+    /// @dev Execute the operation at `ops[i]` on `s`.
+    ///      Returns its result and the index of the next operation.
+    function _batchOperation(BatchState memory s, uint256[] calldata ops, uint256 i)
+        internal
+        returns (uint256 result, uint256 next)
+    {
+        uint256 op = ops[i];
+        if (op == OP_MINT || op == OP_FREE) {
+            next = i + 2;
+        } else if (op == OP_MINT_TO_SELL || op == OP_BUY_AND_FREE || op == OP_BUY || op == OP_SELL) {
+            next = i + 3;
+        } else if (op == OP_MINT_TO_LIQUIDITY || op == OP_ADD_LIQUIDITY || op == OP_REMOVE_LIQUIDITY) {
+            next = i + 4;
+        } else {
+            revert(); // dev: unknown operation
+        }
+        require(next <= ops.length); // dev: missing arguments
+
+        if (op == OP_MINT) {
+            s.totalMinted += ops[i + 1];
+            s.balance += ops[i + 1];
+            s.ownedSupply += ops[i + 1];
+            result = ops[i + 1];
+        } else if (op == OP_MINT_TO_LIQUIDITY) {
+            result = _batchMintToLiquidity(s, ops[i + 1], ops[i + 2], ops[i + 3]);
+        } else if (op == OP_MINT_TO_SELL) {
+            require(ops[i + 1] != 0); // dev: must sell one or more tokens
+            result = getInputPrice(ops[i + 1], _batchTokenReserve(s), s.ethReserve);
+            require(result >= ops[i + 2]); // dev: tokens not worth enough
+            s.totalMinted += ops[i + 1];
+            s.ethReserve -= result;
+            s.credit += result;
+        } else if (op == OP_ADD_LIQUIDITY) {
+            result = _batchAddLiquidity(s, ops[i + 1], ops[i + 2], ops[i + 3]);
+        } else if (op == OP_REMOVE_LIQUIDITY) {
+            result = _batchRemoveLiquidity(s, ops[i + 1], ops[i + 2], ops[i + 3]);
+        } else if (op == OP_FREE) {
+            s.balance = s.balance.sub(ops[i + 1], "LGT: amount exceeds balance");
+            s.ownedSupply -= ops[i + 1];
+            s.totalBurned += ops[i + 1];
+            result = ops[i + 1];
+        } else if (op == OP_BUY_AND_FREE) {
+            result = getOutputPrice(ops[i + 1], s.ethReserve, _batchTokenReserve(s));
+            require(result <= ops[i + 2]); // dev: tokens cost too much
+            s.credit = s.credit.sub(result, "LGT: insufficient ether");
+            s.ethReserve += result;
+            s.totalBurned += ops[i + 1];
+        } else if (op == OP_BUY) {
+            require(ops[i + 1] != 0); // dev: no eth to sell
+            require(ops[i + 2] != 0); // dev: must buy one or more tokens
+            result = getInputPrice(ops[i + 1], s.ethReserve, _batchTokenReserve(s));
+            require(result >= ops[i + 2]); // dev: not enough eth to buy tokens
+            s.credit = s.credit.sub(ops[i + 1], "LGT: insufficient ether");
+            s.ethReserve += ops[i + 1];
+            s.balance += result;
+            s.ownedSupply += result;
+        } else {
+            require(ops[i + 1] != 0); // dev: must sell one or more tokens
+            require(ops[i + 2] != 0); // dev: minEth not set
+            result = getInputPrice(ops[i + 1], _batchTokenReserve(s), s.ethReserve);
+            require(result >= ops[i + 2]); // dev: tokens not worth enough
+            s.balance = s.balance.sub(ops[i + 1], "LGT: amount exceeds balance");
+            s.ownedSupply -= ops[i + 1];
+            s.ethReserve -= result;
+            s.credit += result;
+        }
+        return (result, next);
+    }
+
+    /// @dev The token reserve of the liquidity pool during a batch.
+    function _batchTokenReserve(BatchState memory s) internal pure returns (uint256) {
+        return s.totalMinted.sub(s.totalBurned + s.ownedSupply);
+    }
+
+    /// @dev Batch version of `mintToLiquidity`, with `ethAmount` taken from the credit.
+    function _batchMintToLiquidity(
+        BatchState memory s,
+        uint256 maxTokens,
+        uint256 ethAmount,
+        uint256 minLiquidity
+    )
+        internal
+        returns (uint256 liquidityCreated)
+    {
+        require(maxTokens != 0); // dev: can't mint less than 1 token
+        require(ethAmount != 0); // dev: must provide ether to add liquidity
+        uint256 tokenReserve = _batchTokenReserve(s);
+        uint256 ethReserve = s.ethReserve;
+        uint256 tokenAmount = maxTokens;
+        uint256 ethAdded = (tokenAmount.mul(ethReserve) / tokenReserve).sub(1);
+        if (ethAdded > ethAmount) {
+            // reduce amount of tokens minted to provide maximum possible liquidity
+            tokenAmount = (ethAmount + 1).mul(tokenReserve) / ethReserve;
+            ethAdded = (tokenAmount.mul(ethReserve) / tokenReserve).sub(1);
+        }
+        liquidityCreated = ethAdded.mul(s.poolTotalSupply) / ethReserve;
+        require(liquidityCreated >= minLiquidity); // dev: not enough liquidity can be created
+
+        s.credit = s.credit.sub(ethAdded, "LGT: insufficient ether");
+        s.ethReserve = ethReserve + ethAdded;
+        s.totalMinted += tokenAmount;
+        s.poolTotalSupply += liquidityCreated;
+        s.poolBalance += liquidityCreated;
+        emit AddLiquidity(msg.sender, ethAdded, tokenAmount);
+    }
+
+    /// @dev Batch version of `addLiquidity`, with `ethAmount` taken from the credit.
+    function _batchAddLiquidity(
+        BatchState memory s,
+        uint256 ethAmount,
+        uint256 maxTokens,
+        uint256 minLiquidity
+    )
+        internal
+        returns (uint256 liquidityCreated)
+    {
+        require(maxTokens != 0); // dev: no tokens to add
+        require(ethAmount != 0); // dev: no ether to add
+        require(minLiquidity != 0); // dev: no min_liquidity specified
+        uint256 ethReserve = s.ethReserve;
+        uint256 tokenAmount = ethAmount.mul(_batchTokenReserve(s)) / ethReserve + 1;
+        liquidityCreated = ethAmount.mul(s.poolTotalSupply) / ethReserve;
+        require(maxTokens >= tokenAmount); // dev: need more tokens
+        require(liquidityCreated >= minLiquidity); // dev: not enough liquidity can be created
+
+        s.credit = s.credit.sub(ethAmount, "LGT: insufficient ether");
+        s.ethReserve = ethReserve + ethAmount;
+        s.poolTotalSupply += liquidityCreated;
+        s.poolBalance += liquidityCreated;
+        s.balance = s.balance.sub(tokenAmount, "LGT: amount exceeds balance");
+        s.ownedSupply -= tokenAmount;
+        emit AddLiquidity(msg.sender, ethAmount, tokenAmount);
+    }
+
+    /// @dev Batch version of `removeLiquidity`, the ether is added to the credit.
+    function _batchRemoveLiquidity(
+        BatchState memory s,
+        uint256 amount,
+        uint256 minEth,
+        uint256 minTokens
+    )
+        internal
+        returns (uint256 tokenAmount)
+    {
+        require(amount != 0); // dev: amount of liquidity to remove must be positive
+        require(minEth != 0); // dev: must remove positive eth amount
+        require(minTokens != 0); // dev: must remove positive token amount
+        uint256 totalLiquidity = s.poolTotalSupply;
+        uint256 ethAmount = amount.mul(s.ethReserve) / totalLiquidity;
+        tokenAmount = amount.mul(_batchTokenReserve(s)) / totalLiquidity;
+        require(ethAmount >= minEth); // dev: can't remove enough eth
+        require(tokenAmount >= minTokens); // dev: can't remove enough tokens
+
+        s.poolBalance = s.poolBalance.sub(amount);
+        s.poolTotalSupply = totalLiquidity.sub(amount);
+        s.balance += tokenAmount;
+        s.ownedSupply += tokenAmount;
+        s.ethReserve -= ethAmount;
+        s.credit += ethAmount;
+        emit RemoveLiquidity(msg.sender, ethAmount, tokenAmount);
+    }
+
     // ***** Advanced Functions !!! USE AT YOUR OWN RISK !!!
     //       -----------------------------------------------
     //       These functions are gas optimized and intended for experienced users.
@@ -455,7 +1259,7 @@ contract LiquidGasToken is LiquidERC20 {
         uint256 totalMinted = _totalMinted;
         uint256 ethBought = getInputPrice(
             amount,
-            totalMinted.sub(_totalBurned + _ownedSupply),
+            totalMinted.sub(uint256(_totalBurned) + _ownedSupply),
             address(this).balance
         );
         _createContracts(amount, totalMinted);
@@ -472,7 +1276,7 @@ contract LiquidGasToken is LiquidERC20 {
         uint256 totalMinted = _totalMinted;
         uint256 ethBought = getInputPrice(
             amount,
-            totalMinted.sub(_totalBurned + _ownedSupply),
+            totalMinted.sub(uint256(_totalBurned) + _ownedSupply),
             address(this).balance
         );
         _createContracts(amount, totalMinted);
@@ -493,7 +1297,7 @@ contract LiquidGasToken is LiquidERC20 {
         uint256 ethSold = getOutputPrice(
             amount,
             address(this).balance - msg.value,
-            _totalMinted.sub(totalBurned + _ownedSupply)
+            uint256(_totalMinted).sub(totalBurned + _ownedSupply)
         );
         if (msg.value >= ethSold) {
             _destroyContracts(amount, totalBurned);
@@ -0,0 +1,74 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.6.9;
+
+import "./LocalGasToken.sol";
+
+/// @title Local stand-in for Chi Gastoken (CHI)
+/// @dev Children are created with CREATE2 and their index as salt,
+///      like https://github.com/CryptoManiacsZone/chi/blob/master/contracts/ChiToken.sol
+/// @author Matthias Nadler
+contract LocalCHI is LocalGasToken {
+
+    uint256 internal totalMinted;
+    uint256 internal totalBurned;
+
+    /// @param target The address this code will run at, address(0) for this contract.
+    constructor(address target) public LocalGasToken("Chi Gastoken by 1inch", "CHI", target) {
+        _setupDecimals(0);
+    }
+
+    /// @notice Address of the child with `salt`.
+    function computeAddress2(uint256 salt) public view returns (address) {
+        bytes32 data = keccak256(abi.encodePacked(byte(0xff), address(this), salt, _initCodeHash));
+        return address(uint256(data));
+    }
+
+    /// @dev Destroy the `amount` oldest children.
+    function _destroyChildren(uint256 amount) internal {
+        uint256 burned = totalBurned;
+        for (uint256 i = burned; i < burned + amount; i++) {
+            computeAddress2(i).call("");
+        }
+        totalBurned = burned + amount;
+    }
+
+    /// @notice Mint `value` tokens to the caller.
+    function mint(uint256 value) external {
+        uint256 minted = totalMinted;
+        _createChildren2(minted, minted + value);
+        totalMinted = minted + value;
+        _mint(msg.sender, value);
+    }
+
+    /// @notice Free `value` tokens of the caller.
+    function free(uint256 value) external returns (uint256) {
+        _burn(msg.sender, value);
+        _destroyChildren(value);
+        return value;
+    }
+
+    /// @notice Free up to `value` tokens of the caller.
+    function freeUpTo(uint256 value) external returns (uint256 freed) {
+        freed = balanceOf(msg.sender) < value ? balanceOf(msg.sender) : value;
+        _burn(msg.sender, freed);
+        _destroyChildren(freed);
+    }
+
+    /// @notice Free `value` tokens of `from`.
+    function freeFrom(address from, uint256 value) external returns (uint256) {
+        _approve(from, msg.sender, allowance(from, msg.sender).sub(value, "CHI: freeFrom exceeds allowance"));
+        _burn(from, value);
+        _destroyChildren(value);
+        return value;
+    }
+
+    /// @notice Free up to `value` tokens of `from`, limited by balance and allowance.
+    function freeFromUpTo(address from, uint256 value) external returns (uint256 freed) {
+        uint256 allowed = allowance(from, msg.sender);
+        freed = balanceOf(from) < value ? balanceOf(from) : value;
+        freed = allowed < freed ? allowed : freed;
+        _approve(from, msg.sender, allowed - freed);
+        _burn(from, freed);
+        _destroyChildren(freed);
+    }
+}
@@ -0,0 +1,103 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.6.9;
+
+import "./LocalGasToken.sol";
+
+/// @title Local stand-in for GasToken2 (GST2)
+/// @dev Children are created with CREATE and addressed by the nonce of the token,
+///      like https://github.com/projectchicago/gastoken/blob/master/contract/GST2_ETH.sol
+/// @author Matthias Nadler
+contract LocalGST2 is LocalGasToken {
+
+    // Nonce of the token account before the first child is created.
+    // Contracts start at 1, accounts with injected code usually at 0.
+    uint256 private immutable _nonceBase;
+
+    uint256 internal s_head;
+    uint256 internal s_tail;
+
+    /// @param target The address this code will run at, address(0) for this contract.
+    /// @param nonceBase The nonce of `target` before its first CREATE.
+    constructor(address target, uint256 nonceBase)
+        public
+        LocalGasToken("Gastoken.io", "GST2", target)
+    {
+        _setupDecimals(2);
+        _nonceBase = nonceBase;
+    }
+
+    /// @dev Address of the child created at `nonce`, RLP encoding as in GST2.
+    function _childAddress(uint256 nonce) internal view returns (address) {
+        bytes memory rlp;
+        if (nonce == 0) {
+            rlp = abi.encodePacked(byte(0xd6), byte(0x94), address(this), byte(0x80));
+        } else if (nonce <= 0x7f) {
+            rlp = abi.encodePacked(byte(0xd6), byte(0x94), address(this), uint8(nonce));
+        } else if (nonce <= 0xff) {
+            rlp = abi.encodePacked(byte(0xd7), byte(0x94), address(this), byte(0x81), uint8(nonce));
+        } else if (nonce <= 0xffff) {
+            rlp = abi.encodePacked(byte(0xd8), byte(0x94), address(this), byte(0x82), uint16(nonce));
+        } else if (nonce <= 0xffffff) {
+            rlp = abi.encodePacked(byte(0xd9), byte(0x94), address(this), byte(0x83), uint24(nonce));
+        } else {
+            rlp = abi.encodePacked(byte(0xda), byte(0x94), address(this), byte(0x84), uint32(nonce));
+        }
+        return address(uint256(keccak256(rlp)));
+    }
+
+    /// @dev Destroy the `amount` oldest children.
+    function _destroyChildren(uint256 amount) internal {
+        uint256 tail = s_tail;
+        uint256 nonce = _nonceBase + tail;
+        for (uint256 i = nonce; i < nonce + amount; i++) {
+            _childAddress(i).call("");
+        }
+        s_tail = tail + amount;
+    }
+
+    /// @notice Mint `value` tokens to the caller.
+    function mint(uint256 value) external {
+        _createChildren(value);
+        s_head += value;
+        _mint(msg.sender, value);
+    }
+
+    /// @notice Free `value` tokens of the caller. Returns false if the balance is too low.
+    function free(uint256 value) external returns (bool success) {
+        if (balanceOf(msg.sender) < value) {
+            return false;
+        }
+        _burn(msg.sender, value);
+        _destroyChildren(value);
+        return true;
+    }
+
+    /// @notice Free up to `value` tokens of the caller.
+    function freeUpTo(uint256 value) external returns (uint256 freed) {
+        freed = balanceOf(msg.sender) < value ? balanceOf(msg.sender) : value;
+        _burn(msg.sender, freed);
+        _destroyChildren(freed);
+    }
+
+    /// @notice Free `value` tokens of `from`. Returns false if the balance or allowance is too low.
+    function freeFrom(address from, uint256 value) external returns (bool success) {
+        uint256 allowed = allowance(from, msg.sender);
+        if (balanceOf(from) < value || allowed < value) {
+            return false;
+        }
+        _approve(from, msg.sender, allowed - value);
+        _burn(from, value);
+        _destroyChildren(value);
+        return true;
+    }
+
+    /// @notice Free up to `value` tokens of `from`, limited by balance and allowance.
+    function freeFromUpTo(address from, uint256 value) external returns (uint256 freed) {
+        uint256 allowed = allowance(from, msg.sender);
+        freed = balanceOf(from) < value ? balanceOf(from) : value;
+        freed = allowed < freed ? allowed : freed;
+        _approve(from, msg.sender, allowed - freed);
+        _burn(from, freed);
+        _destroyChildren(freed);
+    }
+}
@@ -0,0 +1,97 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.6.9;
+
+import "OpenZeppelin/openzeppelin-contracts@3.0.1/contracts/token/ERC20/ERC20.sol";
+
+/// @title Base for local stand-ins of third party gas tokens
+/// @dev Only used to run gas token comparisons on a development chain.
+///      The runtime code can be copied to any address (e.g. the main net address
+///      of the original token), so the init code of the children embeds the
+///      `target` address instead of the address this contract is deployed at.
+///      Storage is not copied with the code: token metadata is only available
+///      on the originally deployed instance.
+/// @author Matthias Nadler
+abstract contract LocalGasToken is ERC20 {
+
+    // ***** Child Contracts
+    //       ---------------
+    //       Same layout as the children of GST2, CHI and LGT:
+    //       PUSHn target CALLER XOR PC JUMPI CALLER SELFDESTRUCT
+    //       where leading zero bytes of `target` are not pushed.
+
+    bytes32 private immutable _initCodeHead;
+    bytes32 private immutable _initCodeTail;
+    uint256 private immutable _initCodeLength;
+    bytes32 internal immutable _initCodeHash;
+
+    /// @param target The address this code will run at, address(0) for this contract.
+    constructor(string memory tokenName, string memory tokenSymbol, address target)
+        internal
+        ERC20(tokenName, tokenSymbol)
+    {
+        bytes memory code = _childInitCode(target == address(0) ? address(this) : target);
+        bytes32 head;
+        bytes32 tail;
+        assembly {
+            head := mload(add(code, 0x20))
+            tail := mload(add(code, 0x40))
+        }
+        _initCodeHead = head;
+        _initCodeTail = tail;
+        _initCodeLength = code.length;
+        _initCodeHash = keccak256(code);
+    }
+
+    /// @dev Init code returning the child runtime code for `token`.
+    function _childInitCode(address token) private pure returns (bytes memory code) {
+        uint256 addr = uint256(token);
+        uint256 addressLength = 20;
+        while (addressLength > 1 && addr >> (8 * (addressLength - 1)) == 0) {
+            addressLength--;
+        }
+        uint256 runtimeLength = addressLength + 7;
+        bytes memory suffix = abi.encodePacked(
+            hex"3318585733ff600052",
+            uint8(0x60), uint8(runtimeLength), // PUSH1 runtimeLength
+            uint8(0x60), uint8(32 - runtimeLength), // PUSH1 offset
+            hex"f3" // RETURN
+        );
+        code = new bytes(2 + addressLength + suffix.length);
+        code[0] = byte(uint8(0x5f + runtimeLength));
+        code[1] = byte(uint8(0x5f + addressLength));
+        for (uint256 i = 0; i < addressLength; i++) {
+            code[2 + i] = byte(uint8(addr >> (8 * (addressLength - 1 - i))));
+        }
+        for (uint256 i = 0; i < suffix.length; i++) {
+            code[2 + addressLength + i] = suffix[i];
+        }
+    }
+
+    /// @dev Create `amount` children with CREATE.
+    function _createChildren(uint256 amount) internal {
+        bytes32 head = _initCodeHead;
+        bytes32 tail = _initCodeTail;
+        uint256 length = _initCodeLength;
+        assembly {
+            mstore(0, head)
+            mstore(32, tail)
+            for {let i := 0} lt(i, amount) {i := add(i, 1)} {
+                pop(create(0, 0, length))
+            }
+        }
+    }
+
+    /// @dev Create the children with salts [start, end) with CREATE2.
+    function _createChildren2(uint256 start, uint256 end) internal {
+        bytes32 head = _initCodeHead;
+        bytes32 tail = _initCodeTail;
+        uint256 length = _initCodeLength;
+        assembly {
+            mstore(0, head)
+            mstore(32, tail)
+            for {let i := start} lt(i, end) {i := add(i, 1)} {
+                pop(create2(0, 0, length, i))
+            }
+        }
+    }
+}
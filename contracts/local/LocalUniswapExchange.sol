@@ -0,0 +1,284 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.6.9;
+
+import "OpenZeppelin/openzeppelin-contracts@3.0.1/contracts/math/SafeMath.sol";
+import "OpenZeppelin/openzeppelin-contracts@3.0.1/contracts/token/ERC20/IERC20.sol";
+
+/// @title Local stand-in for a Uniswap V1 exchange
+/// @dev Only used to run gas token comparisons on a development chain.
+///      Port of the trading and liquidity functions of
+///      https://github.com/Uniswap/uniswap-v1/blob/master/contracts/uniswap_exchange.vy
+///      The token is immutable, so the runtime code can be copied to any address.
+///      Token to token trades and liquidity share transfers are not implemented.
+/// @author Matthias Nadler
+contract LocalUniswapExchange {
+    using SafeMath for uint256;
+
+    IERC20 private immutable _token;
+
+    uint256 public totalSupply;
+    mapping (address => uint256) public balanceOf;
+
+    event TokenPurchase(address indexed buyer, uint256 indexed eth_sold, uint256 indexed tokens_bought);
+    event EthPurchase(address indexed buyer, uint256 indexed tokens_sold, uint256 indexed eth_bought);
+    event AddLiquidity(address indexed provider, uint256 indexed eth_amount, uint256 indexed token_amount);
+    event RemoveLiquidity(address indexed provider, uint256 indexed eth_amount, uint256 indexed token_amount);
+
+    constructor(address token) public {
+        _token = IERC20(token);
+    }
+
+    function tokenAddress() external view returns (address) {
+        return address(_token);
+    }
+
+    receive() external payable {
+        _ethToTokenInput(msg.value, 1, now, msg.sender, msg.sender);
+    }
+
+    // ***** Liquidity
+
+    function addLiquidity(uint256 minLiquidity, uint256 maxTokens, uint256 deadline)
+        external
+        payable
+        returns (uint256)
+    {
+        require(deadline > now && maxTokens > 0 && msg.value > 0);
+        uint256 totalLiquidity = totalSupply;
+        if (totalLiquidity > 0) {
+            require(minLiquidity > 0);
+            uint256 ethReserve = address(this).balance - msg.value;
+            uint256 tokenReserve = _token.balanceOf(address(this));
+            uint256 tokenAmount = msg.value.mul(tokenReserve) / ethReserve + 1;
+            uint256 liquidityMinted = msg.value.mul(totalLiquidity) / ethReserve;
+            require(maxTokens >= tokenAmount && liquidityMinted >= minLiquidity);
+            balanceOf[msg.sender] += liquidityMinted;
+            totalSupply = totalLiquidity + liquidityMinted;
+            require(_token.transferFrom(msg.sender, address(this), tokenAmount));
+            emit AddLiquidity(msg.sender, msg.value, tokenAmount);
+            return liquidityMinted;
+        }
+        require(msg.value >= 1000000000);
+        uint256 initialLiquidity = address(this).balance;
+        totalSupply = initialLiquidity;
+        balanceOf[msg.sender] = initialLiquidity;
+        require(_token.transferFrom(msg.sender, address(this), maxTokens));
+        emit AddLiquidity(msg.sender, msg.value, maxTokens);
+        return initialLiquidity;
+    }
+
+    function removeLiquidity(uint256 amount, uint256 minEth, uint256 minTokens, uint256 deadline)
+        external
+        returns (uint256, uint256)
+    {
+        require(amount > 0 && deadline > now && minEth > 0 && minTokens > 0);
+        uint256 totalLiquidity = totalSupply;
+        require(totalLiquidity > 0);
+        uint256 tokenReserve = _token.balanceOf(address(this));
+        uint256 ethAmount = amount.mul(address(this).balance) / totalLiquidity;
+        uint256 tokenAmount = amount.mul(tokenReserve) / totalLiquidity;
+        require(ethAmount >= minEth && tokenAmount >= minTokens);
+        balanceOf[msg.sender] = balanceOf[msg.sender].sub(amount);
+        totalSupply = totalLiquidity - amount;
+        msg.sender.transfer(ethAmount);
+        require(_token.transfer(msg.sender, tokenAmount));
+        emit RemoveLiquidity(msg.sender, ethAmount, tokenAmount);
+        return (ethAmount, tokenAmount);
+    }
+
+    // ***** Pricing
+
+    function _getInputPrice(uint256 inputAmount, uint256 inputReserve, uint256 outputReserve)
+        internal
+        pure
+        returns (uint256)
+    {
+        require(inputReserve > 0 && outputReserve > 0);
+        uint256 inputAmountWithFee = inputAmount.mul(997);
+        uint256 numerator = inputAmountWithFee.mul(outputReserve);
+        uint256 denominator = inputReserve.mul(1000).add(inputAmountWithFee);
+        return numerator / denominator;
+    }
+
+    function _getOutputPrice(uint256 outputAmount, uint256 inputReserve, uint256 outputReserve)
+        internal
+        pure
+        returns (uint256)
+    {
+        require(inputReserve > 0 && outputReserve > 0);
+        uint256 numerator = inputReserve.mul(outputAmount).mul(1000);
+        uint256 denominator = outputReserve.sub(outputAmount).mul(997);
+        return numerator / denominator + 1;
+    }
+
+    function getEthToTokenInputPrice(uint256 ethSold) external view returns (uint256) {
+        require(ethSold > 0);
+        return _getInputPrice(ethSold, address(this).balance, _token.balanceOf(address(this)));
+    }
+
+    function getEthToTokenOutputPrice(uint256 tokensBought) external view returns (uint256) {
+        require(tokensBought > 0);
+        return _getOutputPrice(tokensBought, address(this).balance, _token.balanceOf(address(this)));
+    }
+
+    function getTokenToEthInputPrice(uint256 tokensSold) external view returns (uint256) {
+        require(tokensSold > 0);
+        return _getInputPrice(tokensSold, _token.balanceOf(address(this)), address(this).balance);
+    }
+
+    function getTokenToEthOutputPrice(uint256 ethBought) external view returns (uint256) {
+        require(ethBought > 0);
+        return _getOutputPrice(ethBought, _token.balanceOf(address(this)), address(this).balance);
+    }
+
+    // ***** Trade ETH to Token
+
+    function _ethToTokenInput(
+        uint256 ethSold,
+        uint256 minTokens,
+        uint256 deadline,
+        address buyer,
+        address recipient
+    )
+        internal
+        returns (uint256)
+    {
+        require(deadline >= now && ethSold > 0 && minTokens > 0);
+        uint256 tokenReserve = _token.balanceOf(address(this));
+        uint256 tokensBought = _getInputPrice(ethSold, address(this).balance - ethSold, tokenReserve);
+        require(tokensBought >= minTokens);
+        require(_token.transfer(recipient, tokensBought));
+        emit TokenPurchase(buyer, ethSold, tokensBought);
+        return tokensBought;
+    }
+
+    function ethToTokenSwapInput(uint256 minTokens, uint256 deadline) external payable returns (uint256) {
+        return _ethToTokenInput(msg.value, minTokens, deadline, msg.sender, msg.sender);
+    }
+
+    function ethToTokenTransferInput(uint256 minTokens, uint256 deadline, address recipient)
+        external
+        payable
+        returns (uint256)
+    {
+        require(recipient != address(this) && recipient != address(0));
+        return _ethToTokenInput(msg.value, minTokens, deadline, msg.sender, recipient);
+    }
+
+    function _ethToTokenOutput(
+        uint256 tokensBought,
+        uint256 maxEth,
+        uint256 deadline,
+        address payable buyer,
+        address recipient
+    )
+        internal
+        returns (uint256)
+    {
+        require(deadline >= now && tokensBought > 0 && maxEth > 0);
+        uint256 tokenReserve = _token.balanceOf(address(this));
+        uint256 ethSold = _getOutputPrice(tokensBought, address(this).balance - maxEth, tokenReserve);
+        uint256 ethRefund = maxEth.sub(ethSold);
+        if (ethRefund > 0) {
+            buyer.transfer(ethRefund);
+        }
+        require(_token.transfer(recipient, tokensBought));
+        emit TokenPurchase(buyer, ethSold, tokensBought);
+        return ethSold;
+    }
+
+    function ethToTokenSwapOutput(uint256 tokensBought, uint256 deadline) external payable returns (uint256) {
+        return _ethToTokenOutput(tokensBought, msg.value, deadline, msg.sender, msg.sender);
+    }
+
+    function ethToTokenTransferOutput(uint256 tokensBought, uint256 deadline, address recipient)
+        external
+        payable
+        returns (uint256)
+    {
+        require(recipient != address(this) && recipient != address(0));
+        return _ethToTokenOutput(tokensBought, msg.value, deadline, msg.sender, recipient);
+    }
+
+    // ***** Trade Token to ETH
+
+    function _tokenToEthInput(
+        uint256 tokensSold,
+        uint256 minEth,
+        uint256 deadline,
+        address buyer,
+        address payable recipient
+    )
+        internal
+        returns (uint256)
+    {
+        require(deadline >= now && tokensSold > 0 && minEth > 0);
+        uint256 tokenReserve = _token.balanceOf(address(this));
+        uint256 ethBought = _getInputPrice(tokensSold, tokenReserve, address(this).balance);
+        require(ethBought >= minEth);
+        recipient.transfer(ethBought);
+        require(_token.transferFrom(buyer, address(this), tokensSold));
+        emit EthPurchase(buyer, tokensSold, ethBought);
+        return ethBought;
+    }
+
+    function tokenToEthSwapInput(uint256 tokensSold, uint256 minEth, uint256 deadline)
+        external
+        returns (uint256)
+    {
+        return _tokenToEthInput(tokensSold, minEth, deadline, msg.sender, msg.sender);
+    }
+
+    function tokenToEthTransferInput(
+        uint256 tokensSold,
+        uint256 minEth,
+        uint256 deadline,
+        address payable recipient
+    )
+        external
+        returns (uint256)
+    {
+        require(recipient != address(this) && recipient != address(0));
+        return _tokenToEthInput(tokensSold, minEth, deadline, msg.sender, recipient);
+    }
+
+    function _tokenToEthOutput(
+        uint256 ethBought,
+        uint256 maxTokens,
+        uint256 deadline,
+        address buyer,
+        address payable recipient
+    )
+        internal
+        returns (uint256)
+    {
+        require(deadline >= now && ethBought > 0);
+        uint256 tokenReserve = _token.balanceOf(address(this));
+        uint256 tokensSold = _getOutputPrice(ethBought, tokenReserve, address(this).balance);
+        require(maxTokens >= tokensSold);
+        recipient.transfer(ethBought);
+        require(_token.transferFrom(buyer, address(this), tokensSold));
+        emit EthPurchase(buyer, tokensSold, ethBought);
+        return tokensSold;
+    }
+
+    function tokenToEthSwapOutput(uint256 ethBought, uint256 maxTokens, uint256 deadline)
+        external
+        returns (uint256)
+    {
+        return _tokenToEthOutput(ethBought, maxTokens, deadline, msg.sender, msg.sender);
+    }
+
+    function tokenToEthTransferOutput(
+        uint256 ethBought,
+        uint256 maxTokens,
+        uint256 deadline,
+        address payable recipient
+    )
+        external
+        returns (uint256)
+    {
+        require(recipient != address(this) && recipient != address(0));
+        return _tokenToEthOutput(ethBought, maxTokens, deadline, msg.sender, recipient);
+    }
+}
@@ -14,10 +14,27 @@ interface ILGT is ILiquidERC20 {
     function mintToSellTo(uint256 amount, uint256 minEth, uint256 deadline, address payable recipient)
         external returns (uint256 ethBought);
 
+    // Mint as many tokens as fit into the gas of the transaction, leaving `gasReserve` gas
+    // to settle. `mintMaxToLiquidity` mints at most as many tokens as the sent ether can match.
+    function mintMaxToSell(uint256 gasReserve, uint256 minEth, uint256 deadline)
+        external returns (uint256 amount, uint256 ethBought);
+    function mintMaxToSellTo(uint256 gasReserve, uint256 minEth, uint256 deadline, address payable recipient)
+        external returns (uint256 amount, uint256 ethBought);
+    function mintMaxToLiquidity(uint256 gasReserve, uint256 minLiquidity, uint256 deadline, address recipient)
+        external payable returns (uint256 tokenAmount, uint256 ethAmount, uint256 liquidityCreated);
+
     // Freeing Tokens
     function free(uint256 amount) external returns (bool success);
     function freeFrom(uint256 amount, address owner) external returns (bool success);
 
+    // Free as many tokens as the balance (and allowance) allow, up to `amount`.
+    // The refund variants also stop at `getMaxUsefulFreeAmount(gasBurned)`.
+    function freeUpTo(uint256 amount) external returns (uint256 freed);
+    function freeFromUpTo(uint256 amount, address owner) external returns (uint256 freed);
+    function freeUpToRefund(uint256 amount, uint256 gasBurned) external returns (uint256 freed);
+    function freeFromUpToRefund(uint256 amount, address owner, uint256 gasBurned)
+        external returns (uint256 freed);
+
     // Buying and Freeing Tokens.
     // It is always recommended to check the price for the amount of tokens you intend to buy
     // and then send the exact amount of ether.
@@ -30,6 +47,37 @@ interface ILGT is ILiquidERC20 {
     function buyMaxAndFree(uint256 deadline)
         external payable returns (uint256 tokensBought);
 
+    // Burns liquidity shares, pays out their ether and frees their tokens from the pool.
+    function removeLiquidityAndFree(uint256 amount, uint256 minEth, uint256 minTokens, uint256 deadline)
+        external returns (uint256 ethAmount, uint256 tokenAmount);
+
+    // Amount of tokens to buy and free that maximizes the net savings of a transaction
+    // using `gasBurned` gas before refunds, respecting the refund cap.
+    function getOptimalFreeAmount(uint256 gasBurned, uint256 gasPrice)
+        external view returns (uint256 amount);
+
+    // Most tokens worth freeing in a transaction using `gasBurned` gas before refunds,
+    // ignoring their price.
+    function getMaxUsefulFreeAmount(uint256 gasBurned)
+        external pure returns (uint256 amount);
+
+    // Deploy a contract, then buy and free the optimal amount of tokens for the gas used.
+    // Unspent ether is refunded.
+    function deployAuto(uint256 deadline, bytes calldata bytecode)
+        external payable returns (address contractAddress, uint256 tokenAmount, uint256 ethSold);
+    function create2Auto(uint256 deadline, uint256 salt, bytes calldata bytecode)
+        external payable returns (address contractAddress, uint256 tokenAmount, uint256 ethSold);
+
+    // Batch Operations
+    // Executes a flat list of operation codes and their arguments in one transaction,
+    // all or nothing. Ether is taken from and paid to the sender's ether credit,
+    // which starts at msg.value and is refunded at the end.
+    // 1 mint [amount], 2 mintToLiquidity [maxTokens, ethAmount, minLiquidity],
+    // 3 mintToSell [amount, minEth], 4 addLiquidity [ethAmount, maxTokens, minLiquidity],
+    // 5 removeLiquidity [amount, minEth, minTokens], 6 free [amount],
+    // 7 buyAndFree [amount, maxEth], 8 buy [ethSold, minTokens], 9 sell [tokensSold, minEth]
+    function batch(uint256[] calldata ops, uint256 deadline)
+        external payable returns (uint256[] memory results);
 
 
     // Optimized Functions
@@ -9,6 +9,13 @@ interface ILiquidERC20 is IERC20 {
     function getEthToTokenOutputPrice(uint256 tokensBought) external view returns (uint256 ethSold);
     function getTokenToEthInputPrice(uint256 tokensSold) external view returns (uint256 ethBought);
     function getTokenToEthOutputPrice(uint256 ethBought) external view returns (uint256 tokensSold);
+    function getPriceTable(uint256[] calldata ethAmounts, uint256[] calldata tokenAmounts)
+        external view returns (
+            uint256[] memory ethToTokenInput,
+            uint256[] memory tokenToEthOutput,
+            uint256[] memory ethToTokenOutput,
+            uint256[] memory tokenToEthInput
+        );
 
     // Liquidity Pool
     function poolTotalSupply() external view returns (uint256);
@@ -1,5 +1,7 @@
 from brownie import *
 
+from scripts.tx_batch import TxBatch
+
 
 def main():
     """
@@ -15,31 +17,31 @@ def main():
     coffee.transfer("0x000000000000C1CB11D5c062901F32D06248CE48", "0.001 ether")
     d.deploy(salt)
     lgt = LiquidGasToken.at("0x000000000000C1CB11D5c062901F32D06248CE48")
-    lgt.mint(110, {'from': accounts[0]})
-    lgt.addLiquidity(1, 50, 999999999999999, {'from': accounts[0], 'value': "0.049 ether"})
-    lgt.mint(70, {'from': accounts[1]})
-    lgt.addLiquidity(1, 50, 999999999999999, {'from': accounts[1], 'value': "0.049 ether"})
-    lgt.mint(50, {'from': accounts[2]})
-
-    # Load GST2
     gst = interface.IGST("0x0000000000b3F879cb30FE243b4Dfee438691c04")
-    gst.mint(60, {'from': accounts[0]})
-    gst.mint(20, {'from': accounts[1]})
-    gst.mint(50, {'from': accounts[2]})
-
-    # Load CHI
     chi = interface.ICHI("0x0000000000004946c0e9F43F4Dee607b0eF1fA1c")
     # chi = Contract.from_explorer("0x0000000000004946c0e9F43F4Dee607b0eF1fA1c")
-    chi.mint(60, {'from': accounts[0]})
-    chi.mint(20, {'from': accounts[1]})
-    chi.mint(50, {'from': accounts[2]})
 
-    # deploy helper contract and approve it
-    helper = accounts[0].deploy(LgtHelper)
+    # Load LGT, GST2 and CHI and deploy the helper contract
+    batch = TxBatch()
+    batch.add(lgt.mint, 110, {'from': accounts[0]})
+    batch.add(lgt.mint, 70, {'from': accounts[1]})
+    batch.add(lgt.mint, 50, {'from': accounts[2]})
+    for gas_token in (gst, chi):
+        batch.add(gas_token.mint, 60, {'from': accounts[0]})
+        batch.add(gas_token.mint, 20, {'from': accounts[1]})
+        batch.add(gas_token.mint, 50, {'from': accounts[2]})
+    batch.deploy(LgtHelper, {'from': accounts[0]})
+    helper = batch.send()[-1]
+    # each deposit is priced by the ones before, so they are not batched
+    lgt.addLiquidity(1, 50, 999999999999999, {'from': accounts[0], 'value': "0.049 ether"})
+    lgt.addLiquidity(1, 50, 999999999999999, {'from': accounts[1], 'value': "0.049 ether"})
+
+    # approve the helper contract
     for i in range(5):
-        lgt.approve(helper, 2**256-1, {'from': accounts[i]})
-        gst.approve(helper, 2 ** 256 - 1, {'from': accounts[i]})
-        chi.approve(helper, 2 ** 256 - 1, {'from': accounts[i]})
+        batch.add(lgt.approve, helper, 2 ** 256 - 1, {'from': accounts[i]})
+        batch.add(gst.approve, helper, 2 ** 256 - 1, {'from': accounts[i]})
+        batch.add(chi.approve, helper, 2 ** 256 - 1, {'from': accounts[i]})
+    batch.send()
 
     return lgt, gst, chi, helper, accounts[2]
 # lgt, gst, chi, h, me = run("all_gts")
\ No newline at end of file
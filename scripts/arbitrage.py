@@ -0,0 +1,252 @@
+"""
+Gas price arbitrage by minting tokens and selling them in one transaction.
+
+For every new block the engine refreshes its copy of the pool reserves and the
+gas price, and finds the amount for `mintToSell` that maximizes
+
+    getInputPrice(amount, tokenReserve, ethReserve) - gasPrice * (fixed + perToken * amount)
+
+A transaction is only sent if this profit clears a threshold. In dry-run mode
+decisions are only recorded, together with the time from seeing a block to
+deciding on it.
+"""
+import asyncio
+import json
+import math
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from brownie import *
+from scripts.benchmarks.gas_benchmarks import BENCHMARK_FILE, TEST_SET, deploy_lgt, linear_fit
+from scripts.pricing import PoolReserves
+
+LGT_ADDRESS = "0x000000000000C1CB11D5c062901F32D06248CE48"
+DEADLINE_OFFSET = 300
+
+
+class GasModel(NamedTuple):
+    """ Gas used by a mint function: `fixed + per_token * amount`. """
+    fixed: int
+    per_token: int
+
+    @classmethod
+    def from_benchmarks(cls, function="mintToSell", path=BENCHMARK_FILE) -> "GasModel":
+        """ Fit the model to the gas used in the internal benchmarks, rounded up. """
+        with Path(path).open() as fp:
+            gas_used = json.load(fp)["mint"][function]["gas_used"]
+        fixed, per_token = linear_fit(TEST_SET, gas_used)
+        return cls(math.ceil(fixed), math.ceil(per_token))
+
+    def gas(self, amount: int) -> int:
+        return self.fixed + self.per_token * amount
+
+    def max_amount(self, gas_limit: int) -> int:
+        """ The most tokens that can be minted within `gas_limit`. """
+        return max((gas_limit - self.fixed) // self.per_token, 0)
+
+
+def mint_profit(reserves: PoolReserves, amount: int, gas_price: int, gas_model: GasModel) -> int:
+    """ Ether received for minting and selling `amount` tokens minus the gas costs. """
+    if amount == 0:
+        return 0
+    return reserves.token_to_eth_input(amount) - gas_price * gas_model.gas(amount)
+
+
+def optimal_mint_amount(reserves: PoolReserves, gas_price: int, gas_model: GasModel, max_amount: int) -> int:
+    """
+    The profit maximizing amount of tokens to mint and sell, 0 if no amount is profitable.
+    The proceeds are concave in the amount and the gas costs are linear, so the
+    first amount where minting one more token stops paying off is the optimum
+    (up to the rounding of `getInputPrice`).
+    """
+    if reserves.token_reserve == 0 or max_amount == 0:
+        return 0
+
+    def marginal(amount):
+        return (
+            reserves.token_to_eth_input(amount + 1)
+            - reserves.token_to_eth_input(amount)
+            - gas_price * gas_model.per_token
+        )
+
+    low, high = 0, max_amount
+    while low < high:
+        mid = (low + high) // 2
+        if marginal(mid) > 0:
+            low = mid + 1
+        else:
+            high = mid
+    return low if mint_profit(reserves, low, gas_price, gas_model) > 0 else 0
+
+
+class Decision(NamedTuple):
+    block_number: int
+    gas_price: int
+    amount: int
+    proceeds: int
+    gas_cost: int
+    profit: int
+    latency: float
+    submitted: bool
+
+
+class ArbitrageEngine:
+    """
+    Watches new blocks and mints and sells tokens when it is profitable.
+
+    RPC requests run in a thread pool, so the event loop stays responsive while
+    waiting for the node. `gas_price` can be None (use the node's gas price),
+    a fixed price in wei or a callable taking the block number.
+    """
+
+    def __init__(
+            self,
+            lgt,
+            account,
+            gas_model: GasModel = None,
+            min_profit: int = 0,
+            dry_run: bool = True,
+            gas_price=None,
+            poll_interval: float = 0.2,
+    ):
+        self.lgt = lgt
+        self.account = account
+        self.gas_model = gas_model or GasModel.from_benchmarks()
+        self.min_profit = min_profit
+        self.dry_run = dry_run
+        self.gas_price = gas_price
+        self.poll_interval = poll_interval
+        self.reserves = None
+        self.decisions = []
+        self._executor = ThreadPoolExecutor(4)
+
+    async def _call(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def _get_gas_price(self, block_number):
+        if self.gas_price is None:
+            return await self._call(lambda: web3.eth.gas_price)
+        if callable(self.gas_price):
+            return self.gas_price(block_number)
+        return self.gas_price
+
+    async def watch_blocks(self):
+        """ Yield the number of every new block. Blocks mined while busy are skipped. """
+        last = None
+        while True:
+            number = await self._call(lambda: web3.eth.block_number)
+            if number != last:
+                last = number
+                yield number
+            else:
+                await asyncio.sleep(self.poll_interval)
+
+    async def on_block(self, block_number) -> Decision:
+        """ Refresh the local state for `block_number`, decide and submit if profitable. """
+        seen = time.perf_counter()
+        self.reserves, gas_price, block = await asyncio.gather(
+            self._call(PoolReserves.from_contract, self.lgt, block_number),
+            self._get_gas_price(block_number),
+            self._call(web3.eth.get_block, block_number),
+        )
+        max_amount = self.gas_model.max_amount(block.gasLimit)
+        amount = optimal_mint_amount(self.reserves, gas_price, self.gas_model, max_amount)
+        proceeds = self.reserves.token_to_eth_input(amount) if amount else 0
+        gas_cost = gas_price * self.gas_model.gas(amount) if amount else 0
+        profit = proceeds - gas_cost
+        latency = time.perf_counter() - seen
+
+        submit = amount > 0 and profit >= self.min_profit
+        if submit and not self.dry_run:
+            await self._call(
+                self.lgt.mintToSell,
+                amount,
+                proceeds,
+                block.timestamp + DEADLINE_OFFSET,
+                {'from': self.account, 'gas_price': gas_price}
+            )
+            # keep the local copy in sync until the next block is seen
+            self.reserves = PoolReserves(
+                self.reserves.token_reserve + amount, self.reserves.eth_reserve - proceeds
+            )
+        decision = Decision(block_number, gas_price, amount, proceeds, gas_cost, profit, latency, submit)
+        self.decisions.append(decision)
+        return decision
+
+    async def run(self, blocks: int = None):
+        """ Process new blocks until `blocks` blocks were seen, or forever. """
+        async for block_number in self.watch_blocks():
+            decision = await self.on_block(block_number)
+            print_decision(decision)
+            if blocks is not None and len(self.decisions) >= blocks:
+                break
+
+
+def print_decision(decision: Decision):
+    action = "MINT AND SELL" if decision.submitted else "skip"
+    print(
+        f"  block {decision.block_number}: {decision.gas_price / 1e9:>7.2f} gwei, "
+        f"{decision.amount:>4} tokens, profit {decision.profit / 1e18:>10.6f} ETH, "
+        f"decided in {decision.latency * 1000:.1f} ms -> {action}"
+    )
+
+
+async def _produce_blocks(lgt, trader, interval, seed=0):
+    """ Local chains only mine on transactions: buy random amounts of tokens to move the price. """
+    rng = random.Random(seed)
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        value = rng.randint(1, 5) * 10 ** 15
+        await loop.run_in_executor(
+            None, lambda: lgt.ethToTokenSwapInput(1, 99999999999, {'from': trader, 'value': value})
+        )
+
+
+async def _dry_run(engine, lgt, blocks, interval):
+    producer = asyncio.ensure_future(_produce_blocks(lgt, accounts[1], interval))
+    try:
+        await engine.run(blocks)
+    finally:
+        producer.cancel()
+
+
+def main(dry_run: str = "true", blocks: str = "20", min_profit: str = "0", gas_price_gwei: str = None):
+    """
+    Run the arbitrage engine for `blocks` blocks, 0 to run until interrupted.
+    On a development chain, LGT is deployed and a background trader mines blocks
+    that move the price. Without a fixed gas price, it varies between 10 and 60 gwei.
+    """
+    dry_run = dry_run == "true"
+    blocks = int(blocks) or None
+    gas_price = int(float(gas_price_gwei) * 10 ** 9) if gas_price_gwei else None
+    local = network.show_active() == "development"
+
+    if local:
+        rpc.reset()
+        lgt = deploy_lgt(LiquidGasToken)
+        if gas_price is None:
+            gas_price = lambda block_number: random.Random(block_number).randint(10, 60) * 10 ** 9
+    else:
+        lgt = LiquidGasToken.at(LGT_ADDRESS)
+
+    engine = ArbitrageEngine(
+        lgt, accounts[0], min_profit=int(Wei(f"{min_profit} ether")), dry_run=dry_run, gas_price=gas_price
+    )
+    print(f"Gas model: {engine.gas_model.fixed} + {engine.gas_model.per_token} per token\n")
+    if local:
+        asyncio.run(_dry_run(engine, lgt, blocks, interval=0.5))
+    else:
+        asyncio.run(engine.run(blocks))
+
+    latencies = [d.latency * 1000 for d in engine.decisions]
+    print(
+        f"\n  {len(latencies)} blocks, decision latency "
+        f"mean {statistics.mean(latencies):.1f} ms, median {statistics.median(latencies):.1f} ms, "
+        f"max {max(latencies):.1f} ms"
+    )
+    print(f"  {sum(d.submitted for d in engine.decisions)} profitable blocks")
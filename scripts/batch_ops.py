@@ -0,0 +1,49 @@
+"""
+Encoding of the operation list for `LiquidGasToken.batch`.
+
+A batch is a flat list of uint256: every operation code is followed by its
+arguments. Ether amounts are taken from the ether credit of the batch, which
+starts at `msg.value`; ether received is added to it and the remainder is
+refunded at the end of the batch.
+"""
+from typing import List, Sequence
+
+MINT = 1
+MINT_TO_LIQUIDITY = 2
+MINT_TO_SELL = 3
+ADD_LIQUIDITY = 4
+REMOVE_LIQUIDITY = 5
+FREE = 6
+BUY_AND_FREE = 7
+BUY = 8
+SELL = 9
+
+# operation code: argument names, in order
+ARGUMENTS = {
+    MINT: ("amount",),
+    MINT_TO_LIQUIDITY: ("max_tokens", "eth_amount", "min_liquidity"),
+    MINT_TO_SELL: ("amount", "min_eth"),
+    ADD_LIQUIDITY: ("eth_amount", "max_tokens", "min_liquidity"),
+    REMOVE_LIQUIDITY: ("amount", "min_eth", "min_tokens"),
+    FREE: ("amount",),
+    BUY_AND_FREE: ("amount", "max_eth"),
+    BUY: ("eth_sold", "min_tokens"),
+    SELL: ("tokens_sold", "min_eth"),
+}
+
+
+def encode(*operations: Sequence[int]) -> List[int]:
+    """
+    Flatten `(op, *args)` tuples into the `ops` argument of `batch`.
+
+        encode((MINT_TO_LIQUIDITY, 15, 10 ** 16, 1), (MINT_TO_SELL, 15, 1))
+    """
+    ops = []
+    for op, *args in operations:
+        if op not in ARGUMENTS:
+            raise ValueError(f"Unknown operation code {op}")
+        if len(args) != len(ARGUMENTS[op]):
+            raise ValueError(f"Operation {op} takes arguments {ARGUMENTS[op]}, got {len(args)}")
+        ops.append(op)
+        ops.extend(int(arg) for arg in args)
+    return ops
@@ -0,0 +1,106 @@
+"""
+Gas used by common sequences of operations, sent as separate transactions
+and as a single `batch` transaction.
+"""
+from brownie import *
+from brownie.utils import color
+from scripts import batch_ops
+from scripts.benchmarks.gas_benchmarks import DEADLINE, TEST_SET, deploy_lgt
+
+ETH_VALUE = Wei("0.1 ether")
+
+
+def color_string(string, col):
+    return f"{color(col)}{string}{color}"
+
+
+def _shares_for_tokens(lgt, tokens):
+    """ Liquidity shares to remove to receive at least `tokens` tokens. """
+    total, reserve = lgt.poolTotalSupply(), lgt.poolTokenReserves()
+    return -(-tokens * total // reserve)
+
+
+def _eth_for_tokens(lgt, tokens):
+    """
+    Most ether to add with `addLiquidity` so that at most `tokens` tokens are needed.
+    `addLiquidity` takes value * token reserve // eth reserve + 1 tokens.
+    """
+    return (tokens * lgt.balance() - 1) // lgt.poolTokenReserves()
+
+
+# Every scenario returns the separate transactions as (function, *args),
+# the equivalent batch operations and the ether to send with the batch.
+
+def mint_to_liquidity_and_sell(lgt, account, tokens):
+    separate = [
+        (lgt.mintToLiquidity, tokens, 1, DEADLINE, account, {'from': account, 'value': ETH_VALUE}),
+        (lgt.mintToSell, tokens, 1, DEADLINE, {'from': account}),
+    ]
+    return separate, batch_ops.encode(
+        (batch_ops.MINT_TO_LIQUIDITY, tokens, ETH_VALUE, 1),
+        (batch_ops.MINT_TO_SELL, tokens, 1),
+    ), ETH_VALUE
+
+
+def remove_liquidity_and_free(lgt, account, tokens):
+    shares = _shares_for_tokens(lgt, tokens)
+    separate = [
+        (lgt.removeLiquidity, shares, 1, 1, DEADLINE, {'from': account}),
+        (lgt.free, tokens, {'from': account}),
+    ]
+    return separate, batch_ops.encode(
+        (batch_ops.REMOVE_LIQUIDITY, shares, 1, 1),
+        (batch_ops.FREE, tokens),
+    ), 0
+
+
+def mint_and_add_liquidity(lgt, account, tokens):
+    value = _eth_for_tokens(lgt, tokens)
+    separate = [
+        (lgt.mint, tokens, {'from': account}),
+        (lgt.addLiquidity, 1, tokens, DEADLINE, {'from': account, 'value': value}),
+    ]
+    return separate, batch_ops.encode(
+        (batch_ops.MINT, tokens),
+        (batch_ops.ADD_LIQUIDITY, value, tokens, 1),
+    ), value
+
+
+SCENARIOS = {
+    "mintToLiquidity + mintToSell": mint_to_liquidity_and_sell,
+    "removeLiquidity + free": remove_liquidity_and_free,
+    "mint + addLiquidity": mint_and_add_liquidity,
+}
+
+
+def run_scenario(lgt, account, scenario, tokens):
+    """ Gas used by the separate transactions and by the batch, both from the last snapshot. """
+    rpc.revert()
+    separate, ops, value = scenario(lgt, account, tokens)
+    separate_gas = sum(fn(*args).gas_used for fn, *args in separate)
+    rpc.revert()
+    batch_gas = lgt.batch(ops, DEADLINE, {'from': account, 'value': value}).gas_used
+    return separate_gas, batch_gas
+
+
+def main():
+    rpc.reset()
+    lgt = deploy_lgt(LiquidGasToken)
+    account = accounts[0]
+    # enough liquidity shares to remove the largest test case
+    lgt.mintToLiquidity(max(TEST_SET) * 2, 1, DEADLINE, account, {'from': account, 'value': "0.2 ether"})
+    rpc.snapshot()
+
+    total_saved = 0
+    for name, scenario in SCENARIOS.items():
+        for tokens in TEST_SET:
+            separate_gas, batch_gas = run_scenario(lgt, account, scenario, tokens)
+            saved = separate_gas - batch_gas
+            total_saved += saved
+            out_string = f"{color_string(name, 'bright magenta')}({tokens}) ".rjust(50)
+            out_string += f"separate {str(separate_gas).ljust(8)} batch {str(batch_gas).ljust(8)} "
+            out_string += color_string(
+                f"[ SAVED {saved} ({saved / separate_gas:.1%}) ]", "dark green" if saved > 0 else "dark red"
+            )
+            print(out_string)
+    print(f"\n     TOTAL SAVED: {color_string(total_saved, 'bright yellow')}")
@@ -0,0 +1,66 @@
+"""
+Net cost of deploying contracts of different sizes through LGT with `deployAuto`,
+compared to `deploy` with a manually sized token amount and without tokens.
+The cost is the ether spent on gas and tokens at `GAS_PRICE`.
+"""
+from brownie import *
+from brownie.utils import color
+from scripts.benchmarks.gas_benchmarks import DEADLINE, deploy_lgt
+
+GAS_PRICE = Wei("100 gwei")
+ETH_VALUE = Wei("1 ether")
+BYTECODE_SIZES = [256, 1024, 4096, 8192, 16384, 24576]
+# tokens a user might pick without measuring, as a multiple of the kilobytes deployed
+MANUAL_TOKENS_PER_KB = 2
+
+
+def color_string(string, col):
+    return f"{color(col)}{string}{color}"
+
+
+def init_code(size: int) -> str:
+    """ Init code that deploys `size` bytes of runtime code. """
+    # PUSH2 size DUP1 PUSH1 12 PUSH1 0 CODECOPY PUSH1 0 RETURN, followed by the runtime code
+    return "0x61" + f"{size:04x}" + "80600c6000396000f3" + "fe" * size
+
+
+def deployment_cost(fn, *args):
+    """ Ether spent by the sender on gas and tokens for `fn(*args)`, from the last snapshot. """
+    rpc.revert()
+    initial_balance = accounts[0].balance()
+    fn(*args, {'from': accounts[0], 'value': ETH_VALUE, 'gas_price': GAS_PRICE})
+    return initial_balance - accounts[0].balance()
+
+
+def run_size(lgt, size):
+    """ Cost without tokens, with manually sized tokens, with the estimated optimum and with `deployAuto`. """
+    bytecode = init_code(size)
+    rpc.revert()
+    estimate = lgt.deploy.estimate_gas(0, DEADLINE, bytecode, {'from': accounts[0], 'value': ETH_VALUE})
+    optimal_tokens = lgt.getOptimalFreeAmount(estimate, GAS_PRICE)
+    manual_tokens = max(1, MANUAL_TOKENS_PER_KB * size // 1024)
+    return {
+        "none": deployment_cost(lgt.deploy, 0, DEADLINE, bytecode),
+        f"manual ({manual_tokens})": deployment_cost(lgt.deploy, manual_tokens, DEADLINE, bytecode),
+        f"estimated ({optimal_tokens})": deployment_cost(lgt.deploy, optimal_tokens, DEADLINE, bytecode),
+        "deployAuto": deployment_cost(lgt.deployAuto, DEADLINE, bytecode),
+    }
+
+
+def main():
+    rpc.reset()
+    # the largest deployment can use around 120 tokens
+    lgt = deploy_lgt(LiquidGasToken, max_tokens=200)
+    rpc.snapshot()
+
+    for size in BYTECODE_SIZES:
+        costs = run_size(lgt, size)
+        baseline = costs["none"]
+        print(color_string(f"{size} bytes", "bright magenta"))
+        for name, cost in costs.items():
+            saved = baseline - cost
+            out_string = f"{name}".rjust(24) + f"  {Wei(cost).to('ether'):.6f} ETH  "
+            out_string += color_string(
+                f"[ SAVED {saved / baseline:.1%} ]", "dark green" if saved > 0 else "dark red"
+            )
+            print(out_string)
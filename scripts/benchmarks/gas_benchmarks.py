@@ -1,12 +1,29 @@
+import copy
+import csv
+import io
 import json
+import multiprocessing
+import shutil
+import subprocess
+import tarfile
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from brownie import *
+from brownie._config import CONFIG
+from brownie.exceptions import RPCRequestError
 from brownie.utils import color
+from scripts.benchmarks.history import append_record, current_commit
+from scripts.chain_db import copy_db, launch_with_db, supports_db
 
 DEADLINE = 99999999999
 TEST_SET = [1, 15, 32, 71]
 BENCHMARK_FILE = Path(__file__).parent.absolute().joinpath(Path("benchmarks.json"))
+SWEEP_FILE = Path("build/gas_sweep.csv")
+COMPARE_FILE = Path("build/gas_compare.json")
+# tokens minted per transaction while setting up, stays well below the block gas limit
+MINT_CHUNK = 200
 
 
 class MissedBenchmark(Exception):
@@ -17,46 +34,385 @@ def color_string(string, col):
     return f"{color(col)}{string}{color}"
 
 
-def main(update_benchmarks: str = "never"):
-    # Set up LGT contract
-    rpc.reset()
-    with BENCHMARK_FILE.open() as fp:
-        benchmarks = json.load(fp)
+def linear_fit(xs, ys):
+    """ Least squares fit of ys = intercept + slope * xs. Returns (intercept, slope). """
+    n = len(xs)
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx
+    return mean_y - slope * mean_x, slope
+
+
+def get_struct_logs(txid):
+    """ Raw `debug_traceTransaction` steps without memory, stack and storage. """
+    response = web3.provider.make_request(
+        "debug_traceTransaction",
+        [txid, {"disableStorage": True, "disableMemory": True, "disableStack": True}]
+    )
+    if "error" in response:
+        raise RPCRequestError(response["error"]["message"])
+    return response["result"]["structLogs"]
+
+
+def pre_refund_gas(tx):
+    """ Gas used by `tx` before the refund is applied, including the intrinsic gas. """
+    last_step = get_struct_logs(tx.txid)[-1]
+    return tx.gas_limit - last_step["gas"] + last_step["gasCost"]
 
+
+def deploy_lgt(lgt_container, max_tokens: int = max(TEST_SET)):
+    """
+    Deploy LGT and set up the liquidity pool all benchmarks start from.
+    On top of the original setup, `accounts[0]` mints another `max_tokens` tokens in
+    chunks of `MINT_CHUNK` and approves itself without limit, so `free` and `freeFrom`
+    can run for every token count. These writes only change the values of slots that are
+    already non-zero for the other cases, which does not change the gas they use.
+    Sweeps beyond `TEST_SET` also need a deeper pool to buy and free from.
+    """
     lgt_deployer = accounts.add("0x7d4cbcfd42fe584226a17f385f734b046090f3e9d9fd95b2e10ef53acbbc39e2")
 
     accounts[9].transfer("0x000000000049091f98692b2460500b6d133ae31f", "0.001 ether")
-    lgt = lgt_deployer.deploy(LiquidGasToken)
+    lgt = lgt_deployer.deploy(lgt_container)
     lgt.mint(80, {'from': accounts[0]})
     lgt.addLiquidity(1, 50, DEADLINE, {'from': accounts[0], 'value': "0.049 ether"})
     lgt.mint(80, {'from': accounts[1]})
     lgt.addLiquidity(1, 50, DEADLINE, {'from': accounts[1], 'value': "0.049 ether"})
+    # enough owned tokens and allowance to free the largest test case with `free` and `freeFrom`
+    for i in range(0, max_tokens, MINT_CHUNK):
+        lgt.mint(min(MINT_CHUNK, max_tokens - i), {'from': accounts[0]})
+    lgt.approve(accounts[0], 2 ** 256 - 1, {'from': accounts[0]})
+    if max_tokens > max(TEST_SET):
+        # keep the pool at least twice as deep as the largest amount bought and freed
+        for i in range(0, 2 * max_tokens, MINT_CHUNK):
+            lgt.mintToLiquidity(
+                min(MINT_CHUNK, 2 * max_tokens - i), 1, DEADLINE, accounts[1],
+                {'from': accounts[1], 'value': "1 ether"}
+            )
+    return lgt
+
+
+def run_case(lgt, function, benchmark, tokens):
+    """ Execute `function` with `tokens` as defined in `benchmark` and return the transaction. """
+    args = [accounts[0] if arg == 'account' else arg for arg in benchmark["args"]]
+    tx_args = {'from': accounts[0]}
+    if "value" in benchmark:
+        try:
+            tx_args["value"] = Wei(benchmark["value"])
+        except TypeError:
+            tx_args["value"] = getattr(lgt, benchmark["value"])(tokens)
+    return getattr(lgt, function)(tokens, *args, tx_args)
+
+
+def run_cases(lgt, benchmarks, cases):
+    """
+    Run each (category, function, tokens) case from the last snapshot.
+    Returns the gas used and, for the free category, the gas used before refunds.
+    Refunds are capped at half the gas used, so only the latter shows the cost per freed token.
+    """
+    gas_used = []
+    for category, function, tokens in cases:
+        rpc.revert()
+        tx = run_case(lgt, function, benchmarks[category][function], tokens)
+        gas_used.append((tx.gas_used, pre_refund_gas(tx) if category == "free" else None))
+    return gas_used
+
+
+def _worker_project(project_path):
+    """ The project of a worker process, loaded once per process. """
+    loaded = project.get_loaded_projects()
+    return loaded[0] if loaded else project.load(project_path)
 
+
+def _build_state(project_path, network_id, port, db_path, max_tokens):
+    """ Worker process: build the initial state into the chain database at `db_path`, return the LGT address. """
+    lgt_project = _worker_project(project_path)
+    with launch_with_db(network_id, db_path, port):
+        network.connect(network_id)
+        try:
+            return deploy_lgt(lgt_project.LiquidGasToken, max_tokens).address
+        finally:
+            network.disconnect()
+
+
+def _run_shard(project_path, network_id, port, benchmarks, cases, max_tokens, db_path=None, lgt_address=None):
+    """
+    Worker process: launch a local chain on `port` and run `cases` on it.
+    The chain starts from a copy of the database at `db_path` if given,
+    otherwise the initial state is set up from scratch.
+    """
+    lgt_project = _worker_project(project_path)
+    if db_path is None:
+        CONFIG.networks[network_id]["cmd_settings"]["port"] = port
+        network.connect(network_id)
+    else:
+        worker_db = f"{db_path}-{port}"
+        copy_db(db_path, worker_db)
+        with launch_with_db(network_id, worker_db, port):
+            network.connect(network_id)
+    try:
+        if db_path is None:
+            lgt = deploy_lgt(lgt_project.LiquidGasToken, max_tokens)
+        else:
+            lgt = lgt_project.LiquidGasToken.at(lgt_address)
+        rpc.snapshot()
+        return run_cases(lgt, benchmarks, cases)
+    finally:
+        network.disconnect()
+
+
+def run_parallel(benchmarks, cases, workers, max_tokens: int = max(TEST_SET)):
+    """
+    Shard `cases` over `workers` processes. Every worker launches its own chain
+    on a separate port. On local chains, the initial state is built once into a
+    chain database and every worker starts from a copy of it. On forks, every
+    worker deploys the same initial state. Either way, the gas used is identical
+    to a serial run.
+    """
+    network_id = network.show_active()
+    port = CONFIG.networks[network_id]["cmd_settings"]["port"]
+    project_path = project.get_loaded_projects()[0]._path
+    shards = [list(range(i, len(cases), workers)) for i in range(workers)]
+    gas_used = [None] * len(cases)
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp, ProcessPoolExecutor(workers, mp_context=context) as executor:
+        db_path, lgt_address = None, None
+        if supports_db(network_id):
+            db_path = str(Path(tmp).joinpath("state"))
+            lgt_address = executor.submit(
+                _build_state, project_path, network_id, port + workers + 1, db_path, max_tokens
+            ).result()
+        futures = [
+            executor.submit(
+                _run_shard,
+                project_path,
+                network_id,
+                port + i + 1,
+                benchmarks,
+                [cases[j] for j in shard],
+                max_tokens,
+                db_path,
+                lgt_address,
+            )
+            for i, shard in enumerate(shards)
+        ]
+        for shard, future in zip(shards, futures):
+            for j, gas in zip(shard, future.result()):
+                gas_used[j] = gas
+    return gas_used
+
+
+def print_free_costs(benchmarks, results):
+    """ Print the gas per freed token before refunds and the fitted marginal cost per token. """
+    print("\n     FREE COST PER TOKEN (before refunds):")
+    for function, result in results["free"].items():
+        pre_refund = result["pre_refund_gas"]
+        per_token = "  ".join(f"{tokens}: {gas / tokens:>8.1f}" for tokens, gas in zip(TEST_SET, pre_refund))
+        _, slope = linear_fit(TEST_SET, pre_refund)
+        out_string = f"{color_string(function, 'bright magenta')} {per_token}  marginal: {slope:.1f}"
+        mark = benchmarks["free"][function].get("pre_refund_gas")
+        if mark:
+            _, mark_slope = linear_fit(TEST_SET, mark)
+            out_string += f" (was {mark_slope:.1f})"
+        print(out_string)
+
+
+def cost_curves(token_counts, gas_used):
+    """
+    Per-token marginal and average cost for sorted `token_counts`.
+    The marginal cost of the first count is not defined and returned as None.
+    """
+    marginal = [None] + [
+        (gas_used[i] - gas_used[i - 1]) / (token_counts[i] - token_counts[i - 1])
+        for i in range(1, len(token_counts))
+    ]
+    average = [gas / tokens for tokens, gas in zip(token_counts, gas_used)]
+    return marginal, average
+
+
+def fixed_cost_share(token_counts, gas_used, share: float):
+    """ The fitted fixed cost and the first token count where it is below `share` of the gas used. """
+    fixed_cost, _ = linear_fit(token_counts, gas_used)
+    for tokens, gas in zip(token_counts, gas_used):
+        if fixed_cost < share * gas:
+            return fixed_cost, tokens
+    return fixed_cost, None
+
+
+def sweep(start: str = "1", stop: str = "256", step: str = "1", workers: str = "1", output: str = str(SWEEP_FILE)):
+    """
+    Measure every benchmarked function for each token count in `range(start, stop + 1, step)`
+    and write the gas used, the marginal and the average cost per token to `output` as CSV.
+    For the free category, the curves use the gas before refunds.
+    All cases run from the same snapshot, so no case is affected by another.
+    """
+    with BENCHMARK_FILE.open() as fp:
+        benchmarks = json.load(fp)
+    token_counts = list(range(int(start), int(stop) + 1, int(step)))
+    cases = [
+        (category, function, tokens)
+        for category in benchmarks
+        for function in benchmarks[category]
+        for tokens in token_counts
+    ]
+
+    workers = min(int(workers), len(cases))
+    if workers > 1:
+        gas_used = run_parallel(benchmarks, cases, workers, max(token_counts))
+    else:
+        rpc.reset()
+        lgt = deploy_lgt(LiquidGasToken, max(token_counts))
+        rpc.snapshot()
+        gas_used = run_cases(lgt, benchmarks, cases)
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", newline="") as fp:
+        writer = csv.writer(fp)
+        writer.writerow(
+            ["category", "function", "tokens", "gas_used", "pre_refund_gas", "marginal_gas", "average_gas"]
+        )
+        for i in range(0, len(cases), len(token_counts)):
+            category, function, _ = cases[i]
+            results = gas_used[i:i + len(token_counts)]
+            curve = [pre_refund if category == "free" else gas for gas, pre_refund in results]
+            marginal, average = cost_curves(token_counts, curve)
+            for row in zip(token_counts, results, marginal, average):
+                tokens, (gas, pre_refund), marginal_gas, average_gas = row
+                writer.writerow([
+                    category,
+                    function,
+                    tokens,
+                    gas,
+                    "" if pre_refund is None else pre_refund,
+                    "" if marginal_gas is None else f"{marginal_gas:.1f}",
+                    f"{average_gas:.1f}",
+                ])
+
+            fixed_cost, amortized = fixed_cost_share(token_counts, curve, 0.05)
+            _, per_token = linear_fit(token_counts, curve)
+            out_string = f"{color_string(function, 'bright magenta')}: fixed {fixed_cost:.0f}, " \
+                         f"per token {per_token:.1f}, fixed cost below 5% "
+            out_string += f"from {amortized} tokens" if amortized else "in none of the sampled counts"
+            print(out_string)
+    print(f"\n     Cost curves written to {output}")
+    network.disconnect()
+
+
+def _export_revision(revision: str, project_path: Path, path: Path):
+    """ Write the contracts and interfaces of git `revision` and the current brownie config to `path`. """
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", revision, "contracts", "interfaces"],
+        cwd=project_path, check=True, capture_output=True,
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(path)
+    shutil.copy(Path(project_path).joinpath("brownie-config.yaml"), path)
+
+
+def _measure(lgt_container, benchmarks, cases):
+    rpc.reset()
+    lgt = deploy_lgt(lgt_container)
     rpc.snapshot()
+    return run_cases(lgt, benchmarks, cases)
+
+
+def compare(revision: str, output: str = str(COMPARE_FILE)):
+    """
+    Run the benchmarks against LiquidGasToken as of git `revision` and as in the working tree,
+    with the same compiler settings and on the same chain, and write both to `output` as JSON.
+    Layout changes only apply to new deployments, so this is how their saving is measured.
+    """
+    with BENCHMARK_FILE.open() as fp:
+        benchmarks = json.load(fp)
+    cases = [
+        (category, function, tokens)
+        for category in benchmarks
+        for function in benchmarks[category]
+        for tokens in TEST_SET
+    ]
+
+    current_project = project.get_loaded_projects()[0]
+    with tempfile.TemporaryDirectory() as tmp:
+        _export_revision(revision, current_project._path, Path(tmp))
+        baseline_project = project.load(tmp, name="Baseline")
+        try:
+            before = _measure(baseline_project.LiquidGasToken, benchmarks, cases)
+        finally:
+            baseline_project.close()
+    after = _measure(current_project.LiquidGasToken, benchmarks, cases)
+
+    result = {"revision": revision, "commit": current_commit(), "cases": []}
+    print(f"\n     GAS USED: {revision} -> working tree")
+    for (category, function, tokens), (gas_before, pre_before), (gas_after, pre_after) in zip(cases, before, after):
+        case = {
+            "category": category,
+            "function": function,
+            "tokens": tokens,
+            "gas_used": [gas_before, gas_after],
+        }
+        if category == "free":
+            case["pre_refund_gas"] = [pre_before, pre_after]
+            case["pre_refund_gas_per_token"] = [pre_before / tokens, pre_after / tokens]
+        result["cases"].append(case)
+        change = gas_after - gas_before
+        out_string = f"{color_string(function, 'bright magenta')}({tokens}) ".rjust(50)
+        out_string += f"{str(gas_before).ljust(8)} -> {str(gas_after).ljust(8)} "
+        col = "dark green" if change < 0 else "dark red" if change > 0 else "bright yellow"
+        print(out_string + color_string(f"[ {change:+d} ]", col))
+
+    # the refund cap hides most of the cost of freeing in gas_used
+    print(f"\n     FREE COST PER TOKEN (before refunds): {revision} -> working tree")
+    for function in benchmarks["free"]:
+        free_cases = [c for c in result["cases"] if c["category"] == "free" and c["function"] == function]
+        per_token = "  ".join(
+            f"{c['tokens']}: {c['pre_refund_gas_per_token'][0]:.1f} -> {c['pre_refund_gas_per_token'][1]:.1f}"
+            for c in free_cases
+        )
+        slopes = [linear_fit(TEST_SET, [c["pre_refund_gas"][i] for c in free_cases])[1] for i in (0, 1)]
+        print(f"{color_string(function, 'bright magenta')} {per_token}  "
+              f"marginal: {slopes[0]:.1f} -> {slopes[1]:.1f}")
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w") as fp:
+        json.dump(result, fp, indent=2)
+    print(f"\n     Comparison written to {output}")
+    network.disconnect()
+
+
+def main(update_benchmarks: str = "never", workers: str = "1"):
+    with BENCHMARK_FILE.open() as fp:
+        benchmarks = json.load(fp)
+
+    cases = [
+        (category, function, tokens)
+        for category in benchmarks
+        for function in benchmarks[category]
+        for tokens in TEST_SET
+    ]
 
     # Run benchmarks
-    results = benchmarks.copy()
-    for category in benchmarks:
-        for function in benchmarks[category]:
-            gas_used = []
-            for tokens in TEST_SET:
-                rpc.revert()
-                args = [
-                    accounts[0] if arg == 'account' else arg
-                    for arg in benchmarks[category][function]["args"]
-                ]
-                tx_args = {'from': accounts[0]}
-                if "value" in benchmarks[category][function]:
-                    try:
-                        tx_args["value"] = Wei(benchmarks[category][function]["value"])
-                    except TypeError:
-                        tx_args["value"] = getattr(
-                            lgt,
-                            benchmarks[category][function]["value"]
-                        )(tokens)
-                tx = getattr(lgt, function)(tokens, *args, tx_args)
-                gas_used.append(tx.gas_used)
-            results[category][function]["gas_used"] = gas_used
+    workers = min(int(workers), len(cases))
+    if workers > 1:
+        gas_used = run_parallel(benchmarks, cases, workers)
+    else:
+        rpc.reset()
+        lgt = deploy_lgt(LiquidGasToken)
+        rpc.snapshot()
+        gas_used = run_cases(lgt, benchmarks, cases)
+
+    results = copy.deepcopy(benchmarks)
+    for category in results:
+        for function in results[category]:
+            results[category][function]["gas_used"] = []
+            if category == "free":
+                results[category][function]["pre_refund_gas"] = []
+    for (category, function, tokens), (gas, pre_refund) in zip(cases, gas_used):
+        results[category][function]["gas_used"].append(gas)
+        if category == "free":
+            results[category][function]["pre_refund_gas"].append(pre_refund)
+    append_record(results, TEST_SET, LiquidGasToken.bytecode)
 
     # Process results
     total_improvement = 0
@@ -65,6 +421,11 @@ def main(update_benchmarks: str = "never"):
             mark = benchmarks[category][function]["gas_used"]
             score = results[category][function]["gas_used"]
             for i in range(len(TEST_SET)):
+                if mark[i] is None:
+                    out_string = f"{color_string(function, 'bright magenta')}({TEST_SET[i]}) " \
+                                 f"{str(score[i]).ljust(7)} gas used: "
+                    print(out_string.rjust(60) + color_string("[ NEW BENCHMARK ]", "bright cyan"))
+                    continue
                 improvement = mark[i] - score[i]
                 total_improvement += improvement
                 out_string = f"{color_string(function, 'bright magenta')}({TEST_SET[i]}) " \
@@ -84,6 +445,7 @@ def main(update_benchmarks: str = "never"):
     elif total_improvement < 0:
         ti_col = "dark red"
     print(f"\n     TOTAL IMPROVEMENT: {color_string(total_improvement, ti_col)}")
+    print_free_costs(benchmarks, results)
 
     # Update Benchmarks
     if (
@@ -0,0 +1,134 @@
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from brownie import *
+from brownie.utils import color
+from scripts.benchmarks.gas_benchmarks import (
+    BENCHMARK_FILE, TEST_SET, deploy_lgt, get_struct_logs, linear_fit, run_case
+)
+
+PROFILED_FUNCTIONS = ["mint", "mintToSell9630191", "free", "buyAndFree", "buyAndFree22457070633"]
+TOP_ENTRIES = 12
+
+
+def color_string(string, col):
+    return f"{color(col)}{string}{color}"
+
+
+def step_costs(steps):
+    """
+    Gas used by every step. Calls and creates include the gas used by the frame
+    they open, so the cost of the child contracts is attributed to the
+    create2 / call opcode in the token contract.
+    """
+    costs = []
+    open_frames = {}
+    for i, step in enumerate(steps):
+        depth = step["depth"]
+        # close the frames that returned to this depth
+        for frame_depth in [d for d in open_frames if d >= depth]:
+            start = open_frames.pop(frame_depth)
+            costs[start] = steps[start]["gas"] - step["gas"]
+        following = steps[i + 1] if i + 1 < len(steps) else None
+        if following is not None and following["depth"] == depth:
+            costs.append(step["gas"] - following["gas"])
+        else:
+            if following is not None and following["depth"] > depth:
+                open_frames[depth] = i
+            costs.append(step["gasCost"])
+    return costs
+
+
+class SourceMap:
+    """ Maps program counters of a contract to functions and source ranges via the compiler pcMap. """
+
+    def __init__(self, container):
+        build = container._build
+        self.pc_map = {int(pc): data for pc, data in build["pcMap"].items()}
+        self.paths = build.get("allSourcePaths", {})
+        self._sources = {}
+
+    def _source(self, path_id):
+        if path_id not in self._sources:
+            try:
+                self._sources[path_id] = Path(self.paths[path_id]).read_text()
+            except (KeyError, OSError):
+                self._sources[path_id] = None
+        return self._sources[path_id]
+
+    def location(self, pc):
+        """ (function, source range) of `pc`. Compiler generated code has no source range. """
+        data = self.pc_map.get(pc, {})
+        fn = data.get("fn") or "<compiler>"
+        if "offset" not in data or data.get("path") is None:
+            return fn, "<no source>"
+        start, end = data["offset"]
+        source = self._source(data["path"])
+        path = Path(self.paths.get(data["path"], "?")).name
+        line = source.count("\n", 0, start) + 1 if source else "?"
+        snippet = " ".join(source[start:end].split())[:60] if source else ""
+        return fn, f"{path}:{line} {snippet}"
+
+
+def profile(tx, source_map):
+    """ Group the gas of the outermost frame by opcode and by source range. """
+    steps = get_struct_logs(tx.txid)
+    costs = step_costs(steps)
+    by_opcode = defaultdict(int)
+    by_source = defaultdict(int)
+    execution = 0
+    for step, cost in zip(steps, costs):
+        if step["depth"] != 1:
+            continue
+        execution += cost
+        by_opcode[step["op"]] += cost
+        by_source[source_map.location(step["pc"])] += cost
+    return {
+        "gas_used": tx.gas_used,
+        "execution": execution,
+        "by_opcode": dict(by_opcode),
+        "by_source": dict(by_source),
+    }
+
+
+def print_fits(title, groups, profiles):
+    """ Print fixed overhead and per-token marginal cost for the most expensive groups. """
+    tokens = sorted(profiles)
+    largest = profiles[tokens[-1]][groups]
+    print(f"    {color_string(title, 'bright blue')}{'fixed'.rjust(56 - len(title))}{'per token'.rjust(12)}")
+    for key in sorted(largest, key=largest.get, reverse=True)[:TOP_ENTRIES]:
+        fixed, marginal = linear_fit(tokens, [profiles[t][groups].get(key, 0) for t in tokens])
+        label = key if isinstance(key, str) else f"{key[0]} {key[1]}"
+        print(f"      {label[:50].ljust(50)}{fixed:>10.0f}{marginal:>12.1f}")
+
+
+def main(*token_counts):
+    token_counts = sorted(int(i) for i in token_counts) or TEST_SET
+    with BENCHMARK_FILE.open() as fp:
+        benchmarks = {
+            function: data for functions in json.load(fp).values() for function, data in functions.items()
+        }
+
+    rpc.reset()
+    lgt = deploy_lgt(LiquidGasToken)
+    # make sure the free benchmarks have enough tokens to burn
+    lgt.mint(max(token_counts), {'from': accounts[0]})
+    rpc.snapshot()
+    source_map = SourceMap(LiquidGasToken)
+
+    for function in PROFILED_FUNCTIONS:
+        profiles = {}
+        for tokens in token_counts:
+            rpc.revert()
+            tx = run_case(lgt, function, benchmarks[function], tokens)
+            profiles[tokens] = profile(tx, source_map)
+
+        print(f"\n  {color_string(function, 'bright magenta')}")
+        for key, title in [("gas_used", "gas used (after refund)"), ("execution", "execution gas")]:
+            fixed, marginal = linear_fit(token_counts, [profiles[t][key] for t in token_counts])
+            print(f"    {title.ljust(30)} fixed: {fixed:>9.0f}   per token: {marginal:>9.1f}")
+        print_fits("by opcode", "by_opcode", profiles)
+        print_fits("by source", "by_source", profiles)
+
+    network.disconnect()
@@ -2,6 +2,7 @@ from brownie import *
 
 from brownie.utils import color
 from scripts.all_gts import main as get_all_gas_tokens
+from scripts.local_gts import CHI_EXCHANGE_ADDRESS, GST2_EXCHANGE_ADDRESS, main as get_local_gas_tokens
 
 TOKENS_MINT = 25
 TOKENS_FREE = 25
@@ -9,19 +10,27 @@ BURN = 1000000
 DEADLINE = 999999999999
 
 
-def main():
+def main(offline: str = "false"):
+    """
+    Compare LGT to GST2 and CHI.
+    Runs on a main net fork, or on a development chain with local stand-ins if `offline` is "true".
+    """
     rpc.reset()
     # get gas token contracts
-    lgt, gst, chi, h, me = get_all_gas_tokens()
+    if offline == "true":
+        lgt, gst, chi, h, me = get_local_gas_tokens()
+    else:
+        lgt, gst, chi, h, me = get_all_gas_tokens()
 
     # get uniswap exchanges (and fund them)
-    gst_uniswap = interface.UniswapExchangeInterface("0x929507CD3D90Ab11eC4822E9eB5A48eb3a178F19")
+    gst_uniswap = interface.UniswapExchangeInterface(GST2_EXCHANGE_ADDRESS)
     gst.approve(gst_uniswap, 2 ** 256 - 1, {'from': accounts[0]})
-    chi.mint(150, {'from': accounts[9]})
-    chi_uniswap = interface.UniswapExchangeInterface("0xD772f5ac5c4145f3B2b460515d277f667253E6Dc")
+    chi_uniswap = interface.UniswapExchangeInterface(CHI_EXCHANGE_ADDRESS)
     chi.approve(chi_uniswap, 2 ** 256 - 1, {'from': accounts[0]})
-    chi.approve(chi_uniswap, 2 ** 256 - 1, {'from': accounts[9]})
-    chi_uniswap.addLiquidity(1, 150, 99999999999, {'from': accounts[9], 'value': "0.04 ether"})
+    if offline != "true":
+        chi.mint(150, {'from': accounts[9]})
+        chi.approve(chi_uniswap, 2 ** 256 - 1, {'from': accounts[9]})
+        chi_uniswap.addLiquidity(1, 150, 99999999999, {'from': accounts[9], 'value': "0.04 ether"})
     rpc.snapshot()
     out = "Comparing Liquid Gas Token, CHI and GST2...\n"
 
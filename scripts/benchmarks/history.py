@@ -0,0 +1,139 @@
+import json
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+from brownie.utils import color
+from eth_utils import keccak
+
+HISTORY_FILE = Path("build/benchmark_history.jsonl")
+
+
+class BenchmarkRegression(Exception):
+    pass
+
+
+def color_string(string, col):
+    return f"{color(col)}{string}{color}"
+
+
+def current_commit():
+    """ Commit hash of the working tree, suffixed with `-dirty` if there are local changes. """
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"], text=True).strip()
+        dirty = subprocess.check_output(["git", "status", "--porcelain"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def append_record(results, test_set, bytecode, path=HISTORY_FILE):
+    """
+    Append the gas figures of one benchmark run to the history.
+    `results` has the structure of `benchmarks.json`. Functions that report the
+    gas used before refunds are recorded under `pre_refund_gas` as well.
+    """
+    record = {
+        "commit": current_commit(),
+        "bytecode_hash": "0x" + keccak(hexstr=bytecode).hex(),
+        "timestamp": int(time.time()),
+        "gas_used": {
+            category: {
+                function: {str(tokens): gas for tokens, gas in zip(test_set, data["gas_used"])}
+                for function, data in functions.items()
+            }
+            for category, functions in results.items()
+        },
+        "pre_refund_gas": {
+            category: {
+                function: {str(tokens): gas for tokens, gas in zip(test_set, data["pre_refund_gas"])}
+                for function, data in functions.items()
+                if "pre_refund_gas" in data
+            }
+            for category, functions in results.items()
+        },
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as fp:
+        fp.write(json.dumps(record, sort_keys=True) + "\n")
+    return record
+
+
+def load_records(path=HISTORY_FILE):
+    """ Load all records, collapsing consecutive runs of the same bytecode. """
+    records = []
+    with Path(path).open() as fp:
+        for line in fp:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if records and records[-1]["bytecode_hash"] == record["bytecode_hash"]:
+                records[-1] = record
+            else:
+                records.append(record)
+    return records
+
+
+def find_regressions(records, window=5, tolerance=0, key="gas_used"):
+    """
+    Compare the latest record against the median of the previous `window` records,
+    separately for every function and token count. `key` selects the figures,
+    `gas_used` or `pre_refund_gas`. Figures that were not measured are skipped.
+    Returns a list of (category, function, tokens, baseline, latest) tuples.
+    """
+    *previous, latest = records
+    previous = previous[-window:]
+    regressions = []
+    for category, functions in latest.get(key, {}).items():
+        for function, figures in functions.items():
+            for tokens, gas in figures.items():
+                history = [
+                    record[key][category][function][tokens]
+                    for record in previous
+                    if record.get(key, {}).get(category, {}).get(function, {}).get(tokens) is not None
+                ]
+                if gas is None or not history:
+                    continue
+                baseline = statistics.median(history)
+                if gas > baseline + tolerance:
+                    regressions.append((category, function, int(tokens), baseline, gas))
+    return regressions
+
+
+def main(window: str = "5", tolerance: str = "0", path: str = str(HISTORY_FILE)):
+    """ Print per-function gas trends and flag regressions per token count. """
+    window, tolerance = int(window), int(tolerance)
+    records = load_records(path) if Path(path).exists() else []
+    if len(records) < 2:
+        print("Not enough benchmark history to compare.")
+        return
+
+    shown = records[-(window + 1):]
+    print("Commits: " + " -> ".join(record["commit"][:10] for record in shown))
+    latest = records[-1]
+    for category, functions in latest["gas_used"].items():
+        print(f"\n  {color_string(category, 'bright blue')}")
+        for function, figures in functions.items():
+            for tokens in sorted(figures, key=int):
+                trend = [
+                    str(record["gas_used"].get(category, {}).get(function, {}).get(tokens, "-"))
+                    for record in shown
+                ]
+                label = f"{color_string(function, 'bright magenta')}({tokens})"
+                print(f"{label.rjust(50)} {' -> '.join(trend)}")
+
+    regressions = []
+    print()
+    for key, label in [("gas_used", "gas used"), ("pre_refund_gas", "gas before refunds")]:
+        found = find_regressions(records, window, tolerance, key)
+        for category, function, tokens, baseline, gas in found:
+            print(color_string(
+                f"     REGRESSION {function}({tokens}): {gas} {label}, median of last runs {baseline}",
+                "dark red"
+            ))
+        regressions += found
+    if regressions:
+        raise BenchmarkRegression(f"{len(regressions)} benchmarks regressed")
+    print(color_string("     NO REGRESSIONS", "dark green"))
@@ -0,0 +1,127 @@
+from brownie import *
+from brownie.utils import color
+from scripts.benchmarks.gas_benchmarks import linear_fit, pre_refund_gas
+
+DEADLINE = 99999999999
+BURNS = [100000, 250000, 500000, 1000000, 2000000]
+REFUND_PER_TOKEN = 24000
+
+# (overhead, gas per token, saved gas per token, break-even gas) as hard-coded in the contracts
+# optimal tokens = (gas spent + overhead) // gas per token
+# buy if price < (saved gas per token * tokens - break-even gas) * gas price
+CONSTANT_SETS = {
+    "LGTRelayer.forwardAuto": (55000, 41300, 18145, 24000),
+    "TestModifier.refund": (19560, 41717, 17717, 19560),
+}
+
+
+def color_string(string, col):
+    return f"{color(col)}{string}{color}"
+
+
+def deploy_lgt():
+    """ Deploy LGT at its main net address with a deep liquidity pool. """
+    salt = "0x23ad710e5baee63bb004d962a84d3922e236c107944f2efe53e42d51e6d6f121"
+    coffee = accounts.add("redacted")
+    accounts[0].transfer(coffee, "1 ether")
+    d = coffee.deploy(LGTDeployer)
+    accounts[0].transfer("0x000000000000C1CB11D5c062901F32D06248CE48", "0.001 ether")
+    d.deploy(salt)
+    lgt = LiquidGasToken.at("0x000000000000C1CB11D5c062901F32D06248CE48")
+    lgt.mint(250, {'from': accounts[0]})
+    lgt.addLiquidity(1, 250, DEADLINE, {'from': accounts[0], 'value': "0.2 ether"})
+    return lgt
+
+
+def fit_constants(samples, no_buy, auto):
+    """
+    Fit the linear cost models and derive constants in the form used by the contracts.
+    `samples` maps (gas burned, tokens) to the gas used by `forward` before refunds.
+    `no_buy` maps gas burned to the gas used by `forwardAuto` before refunds when it doesn't buy,
+    `auto` maps gas burned to the tokens bought by `forwardAuto` and the gas used before refunds.
+    """
+    per_burn = {}
+    for burn in BURNS:
+        tokens = sorted(t for b, t in samples if b == burn)
+        per_burn[burn] = linear_fit(tokens, [samples[burn, t] for t in tokens])
+    gas_per_token = sum(slope for _, slope in per_burn.values()) / len(per_burn)
+    fixed, burn_factor = linear_fit(BURNS, [per_burn[b][0] for b in BURNS])
+
+    # the refund is capped at half the gas used:
+    # REFUND_PER_TOKEN * t <= (fixed + burn_factor * burn + gas_per_token * t) / 2
+    overhead = fixed / burn_factor
+    divisor = (2 * REFUND_PER_TOKEN - gas_per_token) / burn_factor
+    saved = REFUND_PER_TOKEN - gas_per_token
+    # the relay overhead is paid either way, buying only adds the gas of the
+    # buy and free call itself: its part that doesn't depend on the amount breaks even
+    break_even = sum(auto[b][1] - no_buy[b] - gas_per_token * auto[b][0] for b in BURNS) / len(BURNS)
+    return (round(overhead), round(divisor), round(saved), round(break_even)), gas_per_token
+
+
+def choose_tokens(constants, burn, price, gas_price, max_tokens):
+    """ Tokens bought by the contract code with `constants`, 0 if its break-even rule doesn't buy. """
+    overhead, divisor, saved, break_even = constants
+    tokens = min((burn + overhead) // divisor, max_tokens)
+    if tokens and price[tokens] < (saved * tokens - break_even) * gas_price:
+        return tokens
+    return 0
+
+
+def main(gas_price: str = "100 gwei"):
+    gas_price = int(Wei(gas_price))
+    rpc.reset()
+    lgt = deploy_lgt()
+    helper = accounts[0].deploy(LgtHelper)
+    relayer = accounts[0].deploy(LGTRelayer)
+    rpc.snapshot()
+
+    samples = {}
+    gas_used = {}
+    no_buy = {}
+    no_buy_used = {}
+    auto = {}
+    price = {}
+    for burn in BURNS:
+        data = helper.burnGas.encode_input(burn)
+        # forwardAuto never buys at a gas price of 0 and always buys at a very high one
+        rpc.revert()
+        tx = relayer.forwardAuto(helper, 0, data, {'from': accounts[0], 'gas_price': 0})
+        no_buy[burn], no_buy_used[burn] = pre_refund_gas(tx), tx.gas_used
+        rpc.revert()
+        reserve = lgt.poolTokenReserves()
+        tx = relayer.forwardAuto(helper, 0, data, {'from': accounts[0], 'value': "1 ether", 'gas_price': "1000 gwei"})
+        tokens = tx.return_value[0]
+        assert reserve - lgt.poolTokenReserves() == tokens > 0
+        auto[burn] = tokens, pre_refund_gas(tx)
+
+        max_tokens = (burn + 60000) * 13 // 10 // 40000 + 2
+        for tokens in range(1, max_tokens + 1):
+            rpc.revert()
+            price[tokens] = lgt.getEthToTokenOutputPrice(tokens)
+            tx = relayer.forward(tokens, DEADLINE, helper, 0, data, {'from': accounts[0], 'value': price[tokens]})
+            samples[burn, tokens] = pre_refund_gas(tx)
+            gas_used[burn, tokens] = tx.gas_used
+
+    fitted, gas_per_token = fit_constants(samples, no_buy, auto)
+    print(f"\n  Freeing costs {gas_per_token:.0f} gas per token before refunds.")
+    print("  Regenerated constants for the current compiler and optimizer settings:")
+    print(f"    optimalTokens = (gasSpent + {fitted[0]}) / {fitted[1]}")
+    print(f"    buy if buyCost < (({fitted[2]} * optimalTokens) - {fitted[3]}) * tx.gasprice")
+
+    print(f"\n  Gas left on the table at {gas_price / 10 ** 9:g} gwei (compared to the best measured token amount).")
+    print("  The ether spent on tokens is counted as gas at this price:")
+    constant_sets = dict(CONSTANT_SETS, fitted=fitted)
+    print("    " + "burned".rjust(10) + "optimum".rjust(10) + "".join(n.rjust(26) for n in constant_sets))
+    for burn in BURNS:
+        cost = {t: g + price[t] // gas_price for (b, t), g in gas_used.items() if b == burn}
+        cost[0] = no_buy_used[burn]
+        optimum = min(cost, key=cost.get)
+        row = f"    {str(burn).rjust(10)}{str(optimum).rjust(10)}"
+        for constants in constant_sets.values():
+            tokens = choose_tokens(constants, burn, price, gas_price, max(cost))
+            wasted = cost[tokens] - cost[optimum]
+            col = "dark green" if wasted == 0 else "dark red"
+            row += color_string(f"{tokens} tokens, {wasted} gas".rjust(26), col)
+        print(row)
+
+    network.disconnect()
@@ -0,0 +1,45 @@
+"""
+Start local chains from a saved ganache database.
+
+Setting up a state with many transactions is slow. The state is built once
+on a chain persisting to a database directory, and later chains start from a
+copy of it, so every copy starts from exactly the same state. Only chains
+launched by brownie without forking are supported.
+"""
+import shutil
+from contextlib import contextmanager
+
+from brownie._config import CONFIG
+
+
+def supports_db(network_id) -> bool:
+    """ True if brownie launches `network_id` itself from a clean chain. """
+    settings = CONFIG.networks[network_id]
+    return "cmd" in settings and not settings["cmd_settings"].get("fork")
+
+
+def db_flag(cmd):
+    """ The database option of the ganache version started by `cmd`. """
+    from brownie.network.rpc.ganache import get_ganache_version
+
+    return "--db" if get_ganache_version(cmd.split(" ")[0]) <= 6 else "--database.dbPath"
+
+
+@contextmanager
+def launch_with_db(network_id, path, port=None):
+    """ Launch `network_id` persisting to the database at `path` (and on `port`) inside the block. """
+    settings = CONFIG.networks[network_id]
+    cmd, original_port = settings["cmd"], settings["cmd_settings"]["port"]
+    settings["cmd"] = f"{cmd} {db_flag(cmd)} {path}"
+    if port is not None:
+        settings["cmd_settings"]["port"] = port
+    try:
+        yield
+    finally:
+        settings["cmd"], settings["cmd_settings"]["port"] = cmd, original_port
+
+
+def copy_db(base, path):
+    """ Replace the database at `path` with a copy of the one at `base`. """
+    shutil.rmtree(path, ignore_errors=True)
+    shutil.copytree(base, path)
@@ -0,0 +1,149 @@
+"""
+Offline computation of Liquid Gas Token child addresses.
+
+Mirrors `LiquidGasToken.computeAddress2`: every child is created with
+create2, using its index as salt and a 30 byte init code that embeds the
+token address. Addresses are computed on multiple cores and stored in a
+memory-mapped index file, so ranges can be looked up without a node.
+"""
+import mmap
+import os
+import struct
+from multiprocessing import Pool
+from pathlib import Path
+
+from eth_utils import keccak, to_checksum_address
+
+LGT_ADDRESS = "0x000000000000C1CB11D5c062901F32D06248CE48"
+INDEX_FILE = Path(__file__).parent.absolute().joinpath(Path("child_addresses.idx"))
+
+CHUNK_SIZE = 65536
+_MAGIC = b"LGTCHILD"
+_HEADER = struct.Struct(">8s20sQ")
+_HEADER_SIZE = 64
+_RECORD_SIZE = 20
+
+
+def child_init_code(lgt_address: str) -> bytes:
+    """ The init code `_createContracts` passes to create2. """
+    word = (
+        (0x746d << 240)
+        + (int(lgt_address, 16) << 0x80)
+        + 0x3318585733ff6000526015600bf30000
+    ) % 2 ** 256
+    return word.to_bytes(32, "big")[:30]
+
+
+def child_init_code_hash(lgt_address: str) -> bytes:
+    return keccak(child_init_code(lgt_address))
+
+
+def _prefix(lgt_address: str) -> bytes:
+    return b"\xff" + bytes.fromhex(lgt_address[2:].rjust(40, "0"))
+
+
+def _compute_range(args) -> bytes:
+    lgt_address, start, stop = args
+    prefix = _prefix(lgt_address)
+    code_hash = child_init_code_hash(lgt_address)
+    return b"".join(
+        keccak(prefix + salt.to_bytes(32, "big") + code_hash)[12:]
+        for salt in range(start, stop)
+    )
+
+
+def compute_address(lgt_address: str, salt: int) -> str:
+    """ Address of the child with `salt`, equal to `computeAddress2(salt)`. """
+    return to_checksum_address(_compute_range((lgt_address, salt, salt + 1)))
+
+
+def compute_addresses(lgt_address: str, start: int, stop: int, processes: int = None) -> bytes:
+    """ Packed 20 byte addresses of the children in [start, stop). """
+    chunks = [
+        (lgt_address, i, min(i + CHUNK_SIZE, stop)) for i in range(start, stop, CHUNK_SIZE)
+    ]
+    if len(chunks) < 2:
+        return b"".join(_compute_range(chunk) for chunk in chunks)
+    with Pool(processes) as pool:
+        return b"".join(pool.imap(_compute_range, chunks))
+
+
+class ChildAddressIndex:
+    """
+    Persistent index of child addresses, ordered by salt.
+
+    The file holds a small header with the token address and the number of
+    indexed children, followed by one 20 byte record per salt starting at 0.
+    """
+
+    def __init__(self, path=INDEX_FILE, lgt_address: str = LGT_ADDRESS):
+        self.path = Path(path)
+        self.lgt_address = to_checksum_address(lgt_address)
+        if not self.path.exists():
+            with self.path.open("wb") as fp:
+                fp.write(self._header(0))
+        self._fp = self.path.open("r+b")
+        magic, address, count = _HEADER.unpack(self._fp.read(_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError(f"{self.path} is not a child address index")
+        if to_checksum_address(address) != self.lgt_address:
+            raise ValueError(f"{self.path} indexes children of {to_checksum_address(address)}")
+        self._count = count
+        self._map = mmap.mmap(self._fp.fileno(), 0)
+
+    def _header(self, count: int) -> bytes:
+        header = _HEADER.pack(_MAGIC, bytes.fromhex(self.lgt_address[2:]), count)
+        return header.ljust(_HEADER_SIZE, b"\x00")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, salt: int) -> str:
+        if not 0 <= salt < self._count:
+            raise IndexError(f"salt {salt} is not indexed")
+        offset = _HEADER_SIZE + salt * _RECORD_SIZE
+        return to_checksum_address(self._map[offset:offset + _RECORD_SIZE])
+
+    def range(self, start: int, stop: int) -> list:
+        """ Addresses of the children in [start, stop), e.g. [_totalBurned, _totalMinted). """
+        if start < 0 or stop > self._count:
+            raise IndexError(f"range {start}:{stop} is not indexed")
+        data = self._map[_HEADER_SIZE + start * _RECORD_SIZE:_HEADER_SIZE + stop * _RECORD_SIZE]
+        return [
+            to_checksum_address(data[i:i + _RECORD_SIZE]) for i in range(0, len(data), _RECORD_SIZE)
+        ]
+
+    def access_list(self, start: int, stop: int) -> list:
+        """ EIP-2930 access list entries for the children in [start, stop). """
+        return [{"address": address, "storageKeys": []} for address in self.range(start, stop)]
+
+    def extend(self, stop: int, processes: int = None) -> None:
+        """ Compute and store all missing addresses up to salt `stop`. """
+        if stop <= self._count:
+            return
+        data = compute_addresses(self.lgt_address, self._count, stop, processes)
+        self._map.close()
+        self._fp.truncate(_HEADER_SIZE + stop * _RECORD_SIZE)
+        self._map = mmap.mmap(self._fp.fileno(), 0)
+        self._map[_HEADER_SIZE + self._count * _RECORD_SIZE:] = data
+        # only update the count once the records are written
+        self._map[:_HEADER_SIZE] = self._header(stop)
+        self._map.flush()
+        self._count = stop
+
+    def close(self) -> None:
+        self._map.close()
+        self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def main(stop: str, path: str = str(INDEX_FILE), processes: str = None):
+    """ Extend the index for the deployed LGT up to salt `stop`. """
+    with ChildAddressIndex(path) as index:
+        index.extend(int(stop), int(processes) if processes else os.cpu_count())
+        print(f"{len(index)} child addresses indexed in {path}")
@@ -0,0 +1,92 @@
+"""
+Optimal amount of tokens to buy and free with `buyAndFree`.
+
+Freeing a token refunds gas, but the total refund of a transaction is capped
+at a fraction of the gas it used. Freeing too many tokens pays for tokens
+whose refund is cut off, freeing too few leaves savings unclaimed. The solver
+maximizes the ether saved net of the `getOutputPrice` cost of the tokens and
+mirrors `LiquidGasToken.getOptimalFreeAmount` for the default model.
+"""
+from typing import NamedTuple
+
+from scripts.pricing import PoolReserves
+
+
+class FreeModel(NamedTuple):
+    """
+    Gas model of `buyAndFree`: `fixed + per_token * amount` gas before refunds,
+    `refund_per_token` gas refunded per token and the refund capped at
+    `1 / refund_quotient` of the gas used. The defaults match the contract.
+    """
+    fixed: int = 9818
+    per_token: int = 5855
+    refund_per_token: int = 24000
+    refund_quotient: int = 2
+
+    def refund(self, amount: int, gas_burned: int) -> int:
+        """ Gas refunded for freeing `amount` tokens in a transaction burning `gas_burned` gas. """
+        max_refund = (gas_burned + self.fixed + self.per_token * amount) // self.refund_quotient
+        return min(self.refund_per_token * amount, max_refund)
+
+    def gas_saved(self, amount: int, gas_burned: int) -> int:
+        """ Net gas saved by freeing `amount` tokens, may be negative. """
+        if amount == 0:
+            return 0
+        return self.refund(amount, gas_burned) - self.fixed - self.per_token * amount
+
+
+DEFAULT_MODEL = FreeModel()
+# `freeUpTo` frees owned tokens: no pool purchase, but a balance update
+PLAIN_FREE_MODEL = FreeModel(fixed=18519)
+
+
+def max_useful_free_amount(gas_burned: int, model: FreeModel = PLAIN_FREE_MODEL) -> int:
+    """
+    The most tokens worth freeing with `freeUpTo` regardless of their price, mirrors
+    `LiquidGasToken.getMaxUsefulFreeAmount`. Beyond this amount the refund
+    is capped and grows by less than the gas of freeing another token.
+    """
+    amount = (gas_burned + model.fixed) // (model.refund_quotient * model.refund_per_token - model.per_token)
+    if model.refund(amount + 1, gas_burned) - model.refund(amount, gas_burned) > model.per_token:
+        amount += 1
+    return amount if model.gas_saved(amount, gas_burned) > 0 else 0
+
+
+def free_savings(
+        reserves: PoolReserves, amount: int, gas_burned: int, gas_price: int, model: FreeModel = DEFAULT_MODEL
+) -> int:
+    """ Ether saved by buying and freeing `amount` tokens, after paying for them. May be negative. """
+    if amount == 0:
+        return 0
+    return model.gas_saved(amount, gas_burned) * gas_price - reserves.eth_to_token_output(amount)
+
+
+def optimal_free_amount(
+        reserves: PoolReserves, gas_burned: int, gas_price: int, model: FreeModel = DEFAULT_MODEL
+) -> int:
+    """
+    The amount of tokens that maximizes `free_savings`, 0 if no amount saves ether.
+    `gas_burned` is the gas used by the transaction before refunds, without
+    buying and freeing tokens, including the 21000 base gas.
+    """
+    if reserves.token_reserve < 2:
+        return 0
+    # freeing more tokens than this can not increase the refund
+    high = (gas_burned + model.fixed) // (model.refund_quotient * model.refund_per_token - model.per_token) + 1
+    high = min(high, reserves.token_reserve - 1)
+
+    def savings_increase(amount):
+        refund_increase = model.refund(amount + 1, gas_burned) - model.refund(amount, gas_burned)
+        if refund_increase <= model.per_token:
+            return False
+        price_increase = reserves.eth_to_token_output(amount + 1) - reserves.eth_to_token_output(amount)
+        return (refund_increase - model.per_token) * gas_price > price_increase
+
+    low = 1
+    while low < high:
+        mid = (low + high) // 2
+        if savings_increase(mid):
+            low = mid + 1
+        else:
+            high = mid
+    return low if free_savings(reserves, low, gas_burned, gas_price, model) > 0 else 0
@@ -0,0 +1,324 @@
+"""
+Incremental indexer for the liquidity pool and token balances.
+
+Streams the `AddLiquidity`, `RemoveLiquidity`, `TransferLiquidity` and
+`Transfer` logs of LGT into a local SQLite store, so dashboards can query
+pool state and positions without touching the node.
+
+Balances are kept up to date from the events where they carry the amount:
+`Transfer` and `TransferLiquidity` are applied as deltas to the stored
+balances. The node is only read for
+- the first balance of an account,
+- the token and liquidity balances of the provider of `AddLiquidity` and
+  `RemoveLiquidity`, which do not contain the liquidity shares and whose
+  tokens may be minted or freed instead of transferred,
+- watched accounts, at the end of every indexed range,
+- the pool state, at blocks with liquidity events and at the end of every
+  indexed range.
+
+Minting, freeing and swapping change balances without emitting any event.
+The balances of accounts that do any of these are only complete if the
+accounts are added with `watch`: unwatched, the indexer misses these changes
+and carries the stale balance forward with the deltas of later transfers.
+
+Reading state at past blocks needs a node that still has it. Full nodes
+prune state older than about 128 blocks, so indexing from an older block
+needs an archive node. The indexer checks this when it is created and raises
+`PrunedStateError` right away if the node has pruned the state of the next
+block to index.
+
+Every balance is stored with the block it was updated at. The block hashes of
+indexed blocks are kept as checkpoints: if a stored hash no longer matches
+the chain, all rows after the newest matching checkpoint are rolled back
+and indexing resumes from there.
+"""
+import sqlite3
+import time
+from pathlib import Path
+
+from brownie import *
+from eth_utils import event_abi_to_log_topic, to_checksum_address
+
+DEFAULT_DB = Path("build/indexer.db")
+EVENTS = ("AddLiquidity", "RemoveLiquidity", "TransferLiquidity", "Transfer")
+LGT_ADDRESS = "0x000000000000C1CB11D5c062901F32D06248CE48"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS checkpoints (block INTEGER PRIMARY KEY, hash TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS events (
+    block INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    event TEXT NOT NULL,
+    account_a TEXT NOT NULL,
+    account_b TEXT,
+    amount_a TEXT NOT NULL,
+    amount_b TEXT,
+    PRIMARY KEY (block, log_index)
+);
+CREATE TABLE IF NOT EXISTS token_balances (
+    account TEXT NOT NULL, block INTEGER NOT NULL, balance TEXT NOT NULL, PRIMARY KEY (account, block)
+);
+CREATE TABLE IF NOT EXISTS pool_balances (
+    account TEXT NOT NULL, block INTEGER NOT NULL, balance TEXT NOT NULL, PRIMARY KEY (account, block)
+);
+CREATE TABLE IF NOT EXISTS pool_state (
+    block INTEGER PRIMARY KEY,
+    token_reserve TEXT NOT NULL,
+    eth_reserve TEXT NOT NULL,
+    pool_total_supply TEXT NOT NULL,
+    owned_supply TEXT NOT NULL,
+    total_supply TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS watched (account TEXT PRIMARY KEY);
+"""
+
+# tables with a block column that are rolled back on a reorg
+BLOCK_TABLES = ("checkpoints", "events", "token_balances", "pool_balances", "pool_state")
+# parts of the errors geth, erigon, nethermind and hosted providers return for pruned state
+PRUNED_STATE_ERRORS = ("missing trie node", "header not found", "state not available", "state is not available",
+                       "pruned", "historical state")
+
+
+class ReorgTooDeep(Exception):
+    """ Raised if no stored checkpoint is part of the canonical chain anymore. """
+
+
+class PrunedStateError(Exception):
+    """ Raised if the node no longer has the state of a block being indexed. """
+
+
+class PoolIndexer:
+    """
+    Index the events of `lgt` into the SQLite database at `db_path`.
+
+    Indexing starts at `start_block` the first time and resumes after the
+    last indexed block afterwards. Blocks newer than `head - confirmations`
+    are not indexed, checkpoints older than `max_reorg_depth` blocks are pruned.
+    """
+
+    def __init__(
+            self,
+            lgt,
+            db_path=DEFAULT_DB,
+            start_block: int = 0,
+            confirmations: int = 0,
+            max_reorg_depth: int = 64,
+            batch_size: int = 2000,
+    ):
+        self.lgt = lgt
+        self.confirmations = confirmations
+        self.max_reorg_depth = max_reorg_depth
+        self.batch_size = batch_size
+        self.db = sqlite3.connect(str(db_path))
+        self.db.executescript(SCHEMA)
+        self.db.execute("INSERT OR IGNORE INTO meta VALUES ('cursor', ?)", (start_block - 1,))
+        self.db.commit()
+
+        contract = web3.eth.contract(address=lgt.address, abi=lgt.abi)
+        self._events = {}
+        for name in EVENTS:
+            event = getattr(contract.events, name)()
+            self._events["0x" + event_abi_to_log_topic(event.abi).hex()] = event
+        self.check_state_available()
+
+    @property
+    def cursor(self) -> int:
+        """ The last indexed block. """
+        return self.db.execute("SELECT value FROM meta WHERE key = 'cursor'").fetchone()[0]
+
+    def check_state_available(self):
+        """ Raise `PrunedStateError` if the node no longer has the state of the next block to index. """
+        block = min(self.cursor + 1, web3.eth.block_number)
+        _read_at(block, web3.eth.get_balance, self.lgt.address, block)
+
+    def watch(self, account):
+        """
+        Read the balances of `account` from the node at the end of every indexed range.
+        Required for accounts that mint, free or swap, see the module docstring.
+        """
+        self.db.execute("INSERT OR IGNORE INTO watched VALUES (?)", (to_checksum_address(str(account)),))
+        self.db.commit()
+
+    # *** Indexing
+
+    def sync(self, to_block: int = None) -> int:
+        """ Index all new blocks up to `to_block` or the confirmed head. Returns the new cursor. """
+        self.check_reorg()
+        head = web3.eth.block_number - self.confirmations
+        to_block = head if to_block is None else min(to_block, head)
+        while self.cursor < to_block:
+            start = self.cursor + 1
+            self._index_range(start, min(start + self.batch_size - 1, to_block))
+        return self.cursor
+
+    def check_reorg(self):
+        """ Roll back to the newest checkpoint that is still on the canonical chain. """
+        checkpoints = self.db.execute("SELECT block, hash FROM checkpoints ORDER BY block DESC").fetchall()
+        for i, (block, block_hash) in enumerate(checkpoints):
+            if _hex(web3.eth.get_block(block).hash) == block_hash:
+                if i:
+                    self.rollback(block)
+                return
+        if checkpoints:
+            raise ReorgTooDeep(f"No checkpoint since block {checkpoints[-1][0]} is canonical")
+
+    def rollback(self, block: int):
+        """ Delete everything indexed after `block`. """
+        for table in BLOCK_TABLES:
+            self.db.execute(f"DELETE FROM {table} WHERE block > ?", (block,))
+        self.db.execute("UPDATE meta SET value = ? WHERE key = 'cursor'", (block,))
+        self.db.commit()
+
+    def _index_range(self, start: int, end: int):
+        logs = web3.eth.get_logs({
+            "address": self.lgt.address,
+            "fromBlock": start,
+            "toBlock": end,
+            "topics": [list(self._events)],
+        })
+        # block -> token deltas, liquidity deltas, accounts to read tokens and liquidity for
+        touched = {}
+        for log in logs:
+            event = self._events[_hex(log["topics"][0])].process_log(log)
+            block = event.blockNumber
+            token_deltas, pool_deltas, token_reads, pool_reads = touched.setdefault(block, ({}, {}, set(), set()))
+            args = list(event.args.values())
+            if event.event in ("AddLiquidity", "RemoveLiquidity"):
+                token_reads.add(args[0])
+                pool_reads.add(args[0])
+                accounts, amounts = (args[0], None), args[1:]
+            else:
+                deltas = token_deltas if event.event == "Transfer" else pool_deltas
+                sender, recipient, amount = args[:3]
+                deltas[sender] = deltas.get(sender, 0) - amount
+                deltas[recipient] = deltas.get(recipient, 0) + amount
+                accounts, amounts = args[:2], (amount, None)
+            self.db.execute(
+                "INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (block, event.logIndex, _hex(event.transactionHash), event.event, *accounts,
+                 *[None if a is None else str(a) for a in amounts])
+            )
+            self.db.execute("INSERT OR REPLACE INTO checkpoints VALUES (?, ?)", (block, _hex(log["blockHash"])))
+
+        watched = {row[0] for row in self.db.execute("SELECT account FROM watched")}
+        _, _, token_reads, pool_reads = touched.setdefault(end, ({}, {}, set(), set()))
+        token_reads.update(watched)
+        pool_reads.update(watched)
+
+        for block, (token_deltas, pool_deltas, token_reads, pool_reads) in sorted(touched.items()):
+            self._update_balances("token_balances", token_deltas, token_reads, block, self.lgt.balanceOf)
+            self._update_balances("pool_balances", pool_deltas, pool_reads, block, self.lgt.poolBalanceOf)
+            if pool_reads or block == end:
+                self._store_pool_state(block)
+
+        self.db.execute(
+            "INSERT OR REPLACE INTO checkpoints VALUES (?, ?)", (end, _hex(web3.eth.get_block(end).hash))
+        )
+        self.db.execute("DELETE FROM checkpoints WHERE block < ?", (end - self.max_reorg_depth,))
+        self.db.execute("UPDATE meta SET value = ? WHERE key = 'cursor'", (end,))
+        self.db.commit()
+
+    def _update_balances(self, table, deltas, reads, block, getter):
+        """ Apply `deltas` to the stored balances, read `reads` and unknown accounts from the node. """
+        for account in set(deltas) | reads:
+            if int(account, 16) == 0 or account == self.lgt.address:
+                continue
+            balance = self._latest_or_none(table, account)
+            if balance is None or account in reads:
+                balance = _read_at(block, getter, account, block_identifier=block)
+            else:
+                balance += deltas[account]
+            self.db.execute(f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?)", (account, block, str(balance)))
+
+    def _store_pool_state(self, block):
+        self.db.execute(
+            "INSERT OR REPLACE INTO pool_state VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                block,
+                str(_read_at(block, self.lgt.poolTokenReserves, block_identifier=block)),
+                str(_read_at(block, web3.eth.get_balance, self.lgt.address, block)),
+                str(_read_at(block, self.lgt.poolTotalSupply, block_identifier=block)),
+                str(_read_at(block, self.lgt.ownedSupply, block_identifier=block)),
+                str(_read_at(block, self.lgt.totalSupply, block_identifier=block)),
+            )
+        )
+
+    # *** Queries, served from the database only
+
+    def balance_of(self, account) -> int:
+        return self._latest("token_balances", account)
+
+    def pool_balance_of(self, account) -> int:
+        return self._latest("pool_balances", account)
+
+    def _latest(self, table, account) -> int:
+        balance = self._latest_or_none(table, account)
+        return 0 if balance is None else balance
+
+    def _latest_or_none(self, table, account):
+        row = self.db.execute(
+            f"SELECT balance FROM {table} WHERE account = ? ORDER BY block DESC LIMIT 1",
+            (to_checksum_address(str(account)),)
+        ).fetchone()
+        return int(row[0]) if row else None
+
+    def holders(self, table="token_balances") -> dict:
+        """ Latest non-zero balance of every indexed account. """
+        rows = self.db.execute(
+            f"SELECT account, balance FROM {table} AS t WHERE block = "
+            f"(SELECT MAX(block) FROM {table} WHERE account = t.account)"
+        )
+        return {account: int(balance) for account, balance in rows if int(balance)}
+
+    def providers(self) -> dict:
+        """ Latest non-zero liquidity share balance of every indexed provider. """
+        return self.holders("pool_balances")
+
+    def pool_state(self) -> dict:
+        """ The pool state at the end of the last indexed range. """
+        row = self.db.execute("SELECT * FROM pool_state ORDER BY block DESC LIMIT 1").fetchone()
+        if row is None:
+            return {}
+        keys = ("block", "token_reserve", "eth_reserve", "pool_total_supply", "owned_supply", "total_supply")
+        return dict(zip(keys, map(int, row)))
+
+
+def _read_at(block, fn, *args, **kwargs):
+    """ Call `fn`, which reads state at `block`, and explain errors for pruned state. """
+    try:
+        return fn(*args, **kwargs)
+    except Exception as e:
+        if any(message in str(e).lower() for message in PRUNED_STATE_ERRORS):
+            raise PrunedStateError(
+                f"The node has pruned the state of block {block}. Indexing blocks older than "
+                "the node keeps state for needs an archive node, or start closer to the head."
+            ) from e
+        raise
+
+
+def _hex(value) -> str:
+    return value if isinstance(value, str) else "0x" + bytes(value).hex()
+
+
+def main(db_path: str = str(DEFAULT_DB), start_block: str = "0", follow: str = "false", interval: str = "5",
+         watch: str = ""):
+    """
+    Index LGT into `db_path`, then keep following new blocks if `follow` is true.
+    `watch` is a comma separated list of accounts that mint, free or swap.
+    """
+    lgt = LiquidGasToken.at(LGT_ADDRESS)
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    indexer = PoolIndexer(lgt, db_path, start_block=int(start_block), confirmations=2)
+    for account in filter(None, watch.split(",")):
+        indexer.watch(account.strip())
+    while True:
+        cursor = indexer.sync()
+        state = indexer.pool_state()
+        print(f"  indexed up to block {cursor}: {len(indexer.providers())} providers, "
+              f"{len(indexer.holders())} holders, pool {state.get('token_reserve', '-')} LGT / "
+              f"{int(state.get('eth_reserve', 0)) / 1e18:.4f} ETH")
+        if follow != "true":
+            break
+        time.sleep(float(interval))
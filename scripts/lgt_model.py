@@ -0,0 +1,502 @@
+"""
+Executable Python model of the LGT state machine.
+
+`LGTModel` holds the supply counters, the ether reserve and the token and
+liquidity balances, and implements the state changing functions of
+`LiquidGasToken` with the same integer math, the same checks and the same
+return values. Methods are named after the contract functions and take
+the same arguments, including the brownie transaction dict, so a call can
+be replayed against the chain unchanged:
+
+    model.mint(5, {'from': accounts[1]})
+    lgt.mint(5, {'from': accounts[1]})
+
+Where the contract would revert, `ModelRevert` is raised and the model
+state is left unchanged. Ether sent and received by accounts is tracked as
+a delta per account in `ether`, gas costs are not modelled.
+"""
+from collections import defaultdict
+from functools import wraps
+from typing import Iterable
+
+from brownie.convert import Wei
+from eth_utils import to_checksum_address
+
+from scripts.pricing import PriceModelError, get_input_price, get_output_price
+from scripts.state_reader import PoolSnapshot, read_state
+
+LGT_ADDRESS = "0x000000000000C1CB11D5c062901F32D06248CE48"
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+UINT48_MASK = 2 ** 48 - 1
+UINT112_MAX = 2 ** 112 - 1
+
+
+class ModelRevert(Exception):
+    """ Raised where the contract would revert, with its revert reason or dev comment. """
+
+
+def _address(account) -> str:
+    return to_checksum_address(str(account))
+
+
+def _sub(a: int, b: int, message: str = "SafeMath: subtraction overflow") -> int:
+    if b > a:
+        raise ModelRevert(message)
+    return a - b
+
+
+def _require(condition, message: str):
+    if not condition:
+        raise ModelRevert(message)
+
+
+def _input_price(input_amount, input_reserve, output_reserve):
+    try:
+        return get_input_price(input_amount, input_reserve, output_reserve)
+    except PriceModelError as e:
+        raise ModelRevert(str(e)) from None
+
+
+def _output_price(output_amount, input_reserve, output_reserve):
+    try:
+        return get_output_price(output_amount, input_reserve, output_reserve)
+    except PriceModelError as e:
+        raise ModelRevert(str(e)) from None
+
+
+def _transaction(fn):
+    """ Receive `msg.value` before the call and roll everything back on a revert. """
+
+    @wraps(fn)
+    def wrapper(self, *args):
+        *args, tx = args
+        sender = _address(tx['from'])
+        value = int(Wei(tx.get('value', 0)))
+        state = self._save()
+        try:
+            self.ether[sender] -= value
+            self.eth_reserve += value
+            return fn(self, *args, sender=sender, value=value)
+        except ModelRevert:
+            self._restore(state)
+            raise
+        except ZeroDivisionError:
+            # unchecked division by zero is an invalid opcode in the contract
+            self._restore(state)
+            raise ModelRevert("division by zero") from None
+
+    return wrapper
+
+
+class LGTModel:
+    """ The state of one LGT deployment and the functions that change it. """
+
+    def __init__(
+            self,
+            total_minted: int,
+            total_burned: int,
+            owned_supply: int,
+            pool_total_supply: int,
+            eth_reserve: int,
+            balances: dict = None,
+            pool_balances: dict = None,
+            address: str = LGT_ADDRESS,
+            timestamp: int = 0,
+    ):
+        self.total_minted = total_minted
+        self.total_burned = total_burned
+        self.owned_supply = owned_supply
+        self.pool_total_supply = pool_total_supply
+        self.eth_reserve = eth_reserve
+        self.balances = defaultdict(int, {_address(k): v for k, v in (balances or {}).items()})
+        self.pool_balances = defaultdict(int, {_address(k): v for k, v in (pool_balances or {}).items()})
+        self.allowances = defaultdict(int)
+        self.ether = defaultdict(int)
+        self.address = _address(address)
+        # deadlines are compared against this instead of the block timestamp
+        self.timestamp = timestamp
+
+    @classmethod
+    def from_contract(
+            cls, lgt, accounts: Iterable = (), pool_accounts: Iterable = (), block_identifier: int = None
+    ) -> "LGTModel":
+        """ Start from the state of a deployed LGT. Only `accounts` and `pool_accounts` are loaded. """
+        snapshot = read_state(lgt.address, accounts, pool_accounts, block_identifier)
+        return cls(
+            total_minted=snapshot.total_minted,
+            total_burned=snapshot.total_burned,
+            owned_supply=snapshot.owned_supply,
+            pool_total_supply=snapshot.pool_total_supply,
+            eth_reserve=snapshot.eth_reserve,
+            balances=snapshot.balances,
+            pool_balances=snapshot.pool_balances,
+            address=lgt.address,
+        )
+
+    def snapshot(self, accounts: Iterable = (), pool_accounts: Iterable = (), block: int = None) -> PoolSnapshot:
+        """ The model state in the form `read_state` returns for the chain. """
+        return PoolSnapshot(
+            block=block,
+            owned_supply=self.owned_supply,
+            total_burned=self.total_burned,
+            total_minted=self.total_minted,
+            pool_total_supply=self.pool_total_supply,
+            eth_reserve=self.eth_reserve,
+            balances={_address(a): self.balances[_address(a)] for a in accounts},
+            pool_balances={_address(a): self.pool_balances[_address(a)] for a in pool_accounts},
+        )
+
+    def _save(self):
+        return (
+            self.total_minted, self.total_burned, self.owned_supply, self.pool_total_supply,
+            self.eth_reserve, dict(self.balances), dict(self.pool_balances),
+            dict(self.allowances), dict(self.ether),
+        )
+
+    def _restore(self, state):
+        (
+            self.total_minted, self.total_burned, self.owned_supply, self.pool_total_supply,
+            self.eth_reserve, balances, pool_balances, allowances, ether,
+        ) = state
+        self.balances = defaultdict(int, balances)
+        self.pool_balances = defaultdict(int, pool_balances)
+        self.allowances = defaultdict(int, allowances)
+        self.ether = defaultdict(int, ether)
+
+    def _pay(self, recipient, amount: int):
+        self.eth_reserve -= amount
+        self.ether[_address(recipient)] += amount
+
+    def _check_deadline(self, deadline: int):
+        _require(deadline >= self.timestamp, "dev: deadline passed")
+
+    # *** Views
+
+    def token_reserve(self) -> int:
+        return _sub(self.total_minted, self.total_burned + self.owned_supply)
+
+    def total_supply(self) -> int:
+        return self.total_minted - self.total_burned
+
+    def balanceOf(self, account) -> int:
+        return self.balances[_address(account)]
+
+    def poolBalanceOf(self, account) -> int:
+        return self.pool_balances[_address(account)]
+
+    # *** Gas token core, the children are not modelled
+
+    def _create_contracts(self, amount: int):
+        self.total_minted = (self.total_minted + amount) & UINT48_MASK
+
+    def _destroy_contracts(self, amount: int):
+        self.total_burned = (self.total_burned + amount) & UINT48_MASK
+
+    # ***** ERC20
+
+    @_transaction
+    def transfer(self, recipient, amount, sender, value):
+        recipient = _address(recipient)
+        _require(recipient != ZERO_ADDRESS, "ERC20: transfer to zero address")
+        if recipient == self.address:
+            self._token_to_eth_input(amount, 1, self.timestamp, sender, sender)
+        else:
+            self.balances[sender] = _sub(self.balances[sender], amount, "ERC20: transfer exceeds balance")
+            self.balances[recipient] += amount
+        return True
+
+    @_transaction
+    def transferFrom(self, owner, recipient, amount, sender, value):
+        owner, recipient = _address(owner), _address(recipient)
+        _require(recipient != ZERO_ADDRESS, "ERC20: transfer to zero address")
+        if recipient == self.address:
+            self._token_to_eth_input(amount, 1, self.timestamp, owner, owner)
+        else:
+            self.balances[owner] = _sub(self.balances[owner], amount, "ERC20: transfer exceeds balance")
+            self.balances[recipient] += amount
+        self.allowances[owner, sender] = _sub(
+            self.allowances[owner, sender], amount, "ERC20: exceeds allowance"
+        )
+        return True
+
+    @_transaction
+    def approve(self, spender, amount, sender, value):
+        self.allowances[sender, _address(spender)] = amount
+        return True
+
+    # ***** Liquidity pool
+
+    @_transaction
+    def poolTransfer(self, recipient, amount, sender, value):
+        recipient = _address(recipient)
+        _require(recipient != ZERO_ADDRESS, "dev: can't transfer liquidity to zero address")
+        _require(recipient != self.address, "dev: can't transfer liquidity to token contract")
+        self.pool_balances[sender] = _sub(self.pool_balances[sender], amount, "LGT: transfer exceeds balance")
+        self.pool_balances[recipient] += amount
+        return True
+
+    @_transaction
+    def addLiquidity(self, min_liquidity, max_tokens, deadline, sender, value):
+        self._check_deadline(deadline)
+        _require(max_tokens != 0, "dev: no tokens to add")
+        _require(value != 0, "dev: no ether to add")
+        _require(min_liquidity != 0, "dev: no min_liquidity specified")
+        eth_reserve = self.eth_reserve - value
+        token_reserve = self.token_reserve()
+        token_amount = value * token_reserve // eth_reserve + 1
+        liquidity_created = value * self.pool_total_supply // eth_reserve
+        _require(max_tokens >= token_amount, "dev: need more tokens")
+        _require(liquidity_created >= min_liquidity, "dev: not enough liquidity can be created")
+        self._set_pool_total_supply(self.pool_total_supply + liquidity_created)
+        self.pool_balances[sender] += liquidity_created
+        self.balances[sender] = _sub(self.balances[sender], token_amount, "LGT: amount exceeds balance")
+        self.owned_supply = _sub(self.owned_supply, token_amount) & UINT48_MASK
+        return liquidity_created
+
+    @_transaction
+    def removeLiquidity(self, amount, min_eth, min_tokens, deadline, sender, value):
+        self._check_deadline(deadline)
+        _require(amount != 0, "dev: amount of liquidity to remove must be positive")
+        _require(min_eth != 0, "dev: must remove positive eth amount")
+        _require(min_tokens != 0, "dev: must remove positive token amount")
+        total_liquidity = self.pool_total_supply
+        eth_amount = amount * self.eth_reserve // total_liquidity
+        token_amount = amount * self.token_reserve() // total_liquidity
+        _require(eth_amount >= min_eth, "dev: can't remove enough eth")
+        _require(token_amount >= min_tokens, "dev: can't remove enough tokens")
+        self.pool_balances[sender] = _sub(self.pool_balances[sender], amount)
+        self.pool_total_supply = _sub(total_liquidity, amount)
+        self.balances[sender] += token_amount
+        self.owned_supply = (self.owned_supply + token_amount) & UINT48_MASK
+        self._pay(sender, eth_amount)
+        return eth_amount, token_amount
+
+    @_transaction
+    def removeLiquidityAndFree(self, amount, min_eth, min_tokens, deadline, sender, value):
+        self._check_deadline(deadline)
+        _require(amount != 0, "dev: amount of liquidity to remove must be positive")
+        _require(min_eth != 0, "dev: must remove positive eth amount")
+        _require(min_tokens != 0, "dev: must remove positive token amount")
+        total_liquidity = self.pool_total_supply
+        eth_amount = amount * self.eth_reserve // total_liquidity
+        token_amount = amount * self.token_reserve() // total_liquidity
+        _require(eth_amount >= min_eth, "dev: can't remove enough eth")
+        _require(token_amount >= min_tokens, "dev: can't remove enough tokens")
+        self.pool_balances[sender] = _sub(self.pool_balances[sender], amount)
+        self.pool_total_supply = _sub(total_liquidity, amount)
+        self._destroy_contracts(token_amount)
+        self._pay(sender, eth_amount)
+        return eth_amount, token_amount
+
+    def _set_pool_total_supply(self, pool_total_supply: int):
+        _require(pool_total_supply <= UINT112_MAX, "dev: liquidity overflow")
+        self.pool_total_supply = pool_total_supply
+
+    # ***** Trade ether to tokens
+
+    def _eth_to_token_input(self, eth_sold, min_tokens, deadline, recipient):
+        self._check_deadline(deadline)
+        _require(eth_sold != 0, "dev: no eth to sell")
+        _require(min_tokens != 0, "dev: must buy one or more tokens")
+        token_reserve = self.token_reserve()
+        eth_reserve = _sub(self.eth_reserve, eth_sold)
+        tokens_bought = _input_price(eth_sold, eth_reserve, token_reserve)
+        _require(tokens_bought >= min_tokens, "dev: not enough eth to buy tokens")
+        self.balances[recipient] += tokens_bought
+        self.owned_supply = (self.owned_supply + tokens_bought) & UINT48_MASK
+        return tokens_bought
+
+    @_transaction
+    def ethToTokenSwapInput(self, min_tokens, deadline, sender, value):
+        return self._eth_to_token_input(value, min_tokens, deadline, sender)
+
+    @_transaction
+    def ethToTokenTransferInput(self, min_tokens, deadline, recipient, sender, value):
+        recipient = _address(recipient)
+        _require(recipient != self.address, "dev: can't send to liquid token contract")
+        _require(recipient != ZERO_ADDRESS, "dev: can't send to zero address")
+        return self._eth_to_token_input(value, min_tokens, deadline, recipient)
+
+    def _eth_to_token_output(self, tokens_bought, max_eth, deadline, buyer, recipient):
+        self._check_deadline(deadline)
+        _require(tokens_bought != 0, "dev: must buy one or more tokens")
+        _require(max_eth != 0, "dev: maxEth must greater than 0")
+        token_reserve = self.token_reserve()
+        eth_reserve = _sub(self.eth_reserve, max_eth)
+        eth_sold = _output_price(tokens_bought, eth_reserve, token_reserve)
+        eth_refund = _sub(max_eth, eth_sold, "LGT: not enough ETH")
+        self.balances[recipient] += tokens_bought
+        self.owned_supply = (self.owned_supply + tokens_bought) & UINT48_MASK
+        self._pay(buyer, eth_refund)
+        return eth_sold
+
+    @_transaction
+    def ethToTokenSwapOutput(self, tokens_bought, deadline, sender, value):
+        return self._eth_to_token_output(tokens_bought, value, deadline, sender, sender)
+
+    @_transaction
+    def ethToTokenTransferOutput(self, tokens_bought, deadline, recipient, sender, value):
+        recipient = _address(recipient)
+        _require(recipient != self.address, "dev: can't send to liquid token contract")
+        _require(recipient != ZERO_ADDRESS, "dev: can't send to zero address")
+        return self._eth_to_token_output(tokens_bought, value, deadline, sender, recipient)
+
+    # ***** Trade tokens to ether
+
+    def _token_to_eth_input(self, tokens_sold, min_eth, deadline, buyer, recipient):
+        self._check_deadline(deadline)
+        _require(tokens_sold != 0, "dev: must sell one or more tokens")
+        _require(min_eth != 0, "dev: minEth not set")
+        eth_bought = _input_price(tokens_sold, self.token_reserve(), self.eth_reserve)
+        _require(eth_bought >= min_eth, "dev: tokens not worth enough")
+        self.balances[buyer] = _sub(self.balances[buyer], tokens_sold, "LGT: amount exceeds balance")
+        self.owned_supply = _sub(self.owned_supply, tokens_sold)
+        self._pay(recipient, eth_bought)
+        return eth_bought
+
+    @_transaction
+    def tokenToEthSwapInput(self, tokens_sold, min_eth, deadline, sender, value):
+        return self._token_to_eth_input(tokens_sold, min_eth, deadline, sender, sender)
+
+    @_transaction
+    def tokenToEthTransferInput(self, tokens_sold, min_eth, deadline, recipient, sender, value):
+        recipient = _address(recipient)
+        _require(recipient != self.address, "dev: can't send to liquid token contract")
+        _require(recipient != ZERO_ADDRESS, "dev: can't send to zero address")
+        return self._token_to_eth_input(tokens_sold, min_eth, deadline, sender, recipient)
+
+    def _token_to_eth_output(self, eth_bought, max_tokens, deadline, buyer, recipient):
+        self._check_deadline(deadline)
+        _require(eth_bought != 0, "dev: must buy more than 0 eth")
+        tokens_sold = _output_price(eth_bought, self.token_reserve(), self.eth_reserve)
+        _require(max_tokens >= tokens_sold, "dev: need more tokens to sell")
+        self.balances[buyer] = _sub(self.balances[buyer], tokens_sold, "LGT: amount exceeds balance")
+        self.owned_supply = _sub(self.owned_supply, tokens_sold)
+        self._pay(recipient, eth_bought)
+        return tokens_sold
+
+    @_transaction
+    def tokenToEthSwapOutput(self, eth_bought, max_tokens, deadline, sender, value):
+        return self._token_to_eth_output(eth_bought, max_tokens, deadline, sender, sender)
+
+    @_transaction
+    def tokenToEthTransferOutput(self, eth_bought, max_tokens, deadline, recipient, sender, value):
+        recipient = _address(recipient)
+        _require(recipient != self.address, "dev: can't send to liquid token contract")
+        _require(recipient != ZERO_ADDRESS, "dev: can't send to zero address")
+        return self._token_to_eth_output(eth_bought, max_tokens, deadline, sender, recipient)
+
+    # ***** Gas token minting
+
+    @_transaction
+    def mint(self, amount, sender, value):
+        self._create_contracts(amount)
+        self.balances[sender] += amount
+        self.owned_supply = (self.owned_supply + amount) & UINT48_MASK
+
+    @_transaction
+    def mintFor(self, amount, recipient, sender, value):
+        self._create_contracts(amount)
+        self.balances[_address(recipient)] += amount
+        self.owned_supply = (self.owned_supply + amount) & UINT48_MASK
+
+    @_transaction
+    def mintToLiquidity(self, max_tokens, min_liquidity, deadline, recipient, sender, value):
+        self._check_deadline(deadline)
+        _require(max_tokens != 0, "dev: can't mint less than 1 token")
+        _require(value != 0, "dev: must provide ether to add liquidity")
+        token_amount = max_tokens
+        token_reserve = self.token_reserve()
+        eth_reserve = self.eth_reserve - value
+        eth_amount = _sub(token_amount * eth_reserve // token_reserve, 1)
+        if eth_amount > value:
+            token_amount = (value + 1) * token_reserve // eth_reserve
+            eth_amount = _sub(token_amount * eth_reserve // token_reserve, 1)
+        liquidity_created = eth_amount * self.pool_total_supply // eth_reserve
+        _require(liquidity_created >= min_liquidity, "dev: not enough liquidity can be created")
+        self._create_contracts(token_amount)
+        self._set_pool_total_supply(self.pool_total_supply + liquidity_created)
+        self.pool_balances[_address(recipient)] += liquidity_created
+        if value > eth_amount:
+            self._pay(sender, value - eth_amount)
+        return token_amount, eth_amount, liquidity_created
+
+    def _mint_to_sell_to(self, amount, min_eth, deadline, recipient):
+        self._check_deadline(deadline)
+        _require(amount != 0, "dev: must sell one or more tokens")
+        eth_bought = _input_price(amount, self.token_reserve(), self.eth_reserve)
+        _require(eth_bought >= min_eth, "dev: tokens not worth enough")
+        self._create_contracts(amount)
+        self._pay(recipient, eth_bought)
+        return eth_bought
+
+    @_transaction
+    def mintToSell(self, amount, min_eth, deadline, sender, value):
+        return self._mint_to_sell_to(amount, min_eth, deadline, sender)
+
+    @_transaction
+    def mintToSellTo(self, amount, min_eth, deadline, recipient, sender, value):
+        return self._mint_to_sell_to(amount, min_eth, deadline, recipient)
+
+    # ***** Gas token freeing
+
+    @_transaction
+    def free(self, amount, sender, value):
+        if self.balances[sender] < amount:
+            return False
+        self.balances[sender] -= amount
+        self.owned_supply = _sub(self.owned_supply, amount)
+        self._destroy_contracts(amount)
+        return True
+
+    @_transaction
+    def freeFrom(self, amount, owner, sender, value):
+        owner = _address(owner)
+        allowance = self.allowances[owner, sender]
+        if self.balances[owner] < amount or allowance < amount:
+            return False
+        self.balances[owner] -= amount
+        self.owned_supply = _sub(self.owned_supply, amount)
+        self.allowances[owner, sender] = allowance - amount
+        self._destroy_contracts(amount)
+        return True
+
+    @_transaction
+    def freeUpTo(self, amount, sender, value):
+        freed = min(amount, self.balances[sender])
+        self.balances[sender] -= freed
+        self.owned_supply = _sub(self.owned_supply, freed)
+        self._destroy_contracts(freed)
+        return freed
+
+    @_transaction
+    def freeFromUpTo(self, amount, owner, sender, value):
+        owner = _address(owner)
+        freed = min(amount, self.balances[owner], self.allowances[owner, sender])
+        self.balances[owner] -= freed
+        self.owned_supply = _sub(self.owned_supply, freed)
+        self.allowances[owner, sender] -= freed
+        self._destroy_contracts(freed)
+        return freed
+
+    @_transaction
+    def buyAndFree(self, amount, deadline, refund_to, sender, value):
+        token_reserve = self.token_reserve()
+        if deadline < self.timestamp or token_reserve < amount:
+            self._pay(refund_to, value)
+            return 0
+        eth_sold = _output_price(amount, self.eth_reserve - value, token_reserve)
+        if value < eth_sold:
+            self._pay(refund_to, value)
+            return 0
+        self._destroy_contracts(amount)
+        self._pay(refund_to, value - eth_sold)
+        return eth_sold
+
+    @_transaction
+    def buyMaxAndFree(self, deadline, sender, value):
+        self._check_deadline(deadline)
+        tokens_bought = _input_price(value, self.eth_reserve - value, self.token_reserve())
+        self._destroy_contracts(tokens_bought)
+        return tokens_bought
@@ -0,0 +1,118 @@
+from brownie import *
+from brownie.exceptions import RPCRequestError
+
+GST2_ADDRESS = "0x0000000000b3F879cb30FE243b4Dfee438691c04"
+CHI_ADDRESS = "0x0000000000004946c0e9F43F4Dee607b0eF1fA1c"
+GST2_EXCHANGE_ADDRESS = "0x929507CD3D90Ab11eC4822E9eB5A48eb3a178F19"
+CHI_EXCHANGE_ADDRESS = "0xD772f5ac5c4145f3B2b460515d277f667253E6Dc"
+DEADLINE = 999999999999
+
+
+# an address without code, used to probe whether the chain can set code
+PROBE_ADDRESS = "0x000000000000000000000000000000000000dEaD"
+SET_CODE_METHODS = ("evm_setAccountCode", "hardhat_setCode")
+
+
+def set_code_method():
+    """
+    The RPC method that replaces the code at an address, or None if the chain has none.
+    ganache-cli 6 supports neither, ganache 7 and hardhat support one of them.
+    """
+    for method in SET_CODE_METHODS:
+        response = web3.provider.make_request(method, [PROBE_ADDRESS, "0x"])
+        if "error" not in response:
+            return method
+    return None
+
+
+def set_code(address, code):
+    """ Replace the code at `address`, raises if the chain does not support it. """
+    method = set_code_method()
+    if method is None:
+        raise RPCRequestError(f"Can not set code on this chain, it supports none of {SET_CODE_METHODS}")
+    response = web3.provider.make_request(method, [address, code])
+    if "error" in response:
+        raise RPCRequestError(response["error"]["message"])
+
+
+def deploy_at(container, address, *args):
+    """
+    Deploy `container` and copy its runtime code to `address`.
+    If `address` is None, the deployed contract is used as is.
+    """
+    contract = accounts[0].deploy(container, *args)
+    if address is None:
+        return contract
+    set_code(address, "0x" + bytes(web3.eth.get_code(contract.address)).hex())
+    return container.at(address)
+
+
+def deploy_local_gas_tokens(at_main_net: bool = None):
+    """
+    Deploy GST2, CHI and a Uniswap V1 exchange for each on a development chain.
+    With `at_main_net`, the code is then copied to the main net addresses, so contracts with
+    hard-coded addresses like `LgtHelper` work unchanged. This needs a chain that can set code.
+    By default, the main net addresses are used if the chain supports it, otherwise the
+    stand-ins stay at the addresses they were deployed at.
+    """
+    if at_main_net is None:
+        at_main_net = set_code_method() is not None
+    if at_main_net:
+        gst = deploy_at(LocalGST2, GST2_ADDRESS, GST2_ADDRESS, web3.eth.get_transaction_count(GST2_ADDRESS))
+        chi = deploy_at(LocalCHI, CHI_ADDRESS, CHI_ADDRESS)
+        gst_exchange = deploy_at(LocalUniswapExchange, GST2_EXCHANGE_ADDRESS, gst)
+        chi_exchange = deploy_at(LocalUniswapExchange, CHI_EXCHANGE_ADDRESS, chi)
+    else:
+        # contracts start with nonce 1
+        gst = deploy_at(LocalGST2, None, ZERO_ADDRESS, 1)
+        chi = deploy_at(LocalCHI, None, ZERO_ADDRESS)
+        gst_exchange = deploy_at(LocalUniswapExchange, None, gst)
+        chi_exchange = deploy_at(LocalUniswapExchange, None, chi)
+    return gst, chi, gst_exchange, chi_exchange
+
+
+def main(at_main_net: bool = True):
+    """
+    Deploys, funds and approves GST2, CHI and LGT on a development chain.
+    Offline equivalent of `all_gts`, the Uniswap exchanges are funded as well.
+    `LgtHelper` uses the main net addresses, so by default the chain must be able to set code,
+    see `deploy_local_gas_tokens`.
+    """
+    rpc.reset()
+    # Deploy and fund LGT
+    salt = "0x23ad710e5baee63bb004d962a84d3922e236c107944f2efe53e42d51e6d6f121"
+    coffee = accounts.add("redacted")
+    accounts[0].transfer(coffee, "1 ether")
+    d = coffee.deploy(LGTDeployer)  # 0x8EE26bA26c87Beb287eB71245ADEf44ede1bF190
+    coffee.transfer("0x000000000000C1CB11D5c062901F32D06248CE48", "0.001 ether")
+    d.deploy(salt)
+    lgt = LiquidGasToken.at("0x000000000000C1CB11D5c062901F32D06248CE48")
+    lgt.mint(110, {'from': accounts[0]})
+    lgt.addLiquidity(1, 50, DEADLINE, {'from': accounts[0], 'value': "0.049 ether"})
+    lgt.mint(70, {'from': accounts[1]})
+    lgt.addLiquidity(1, 50, DEADLINE, {'from': accounts[1], 'value': "0.049 ether"})
+    lgt.mint(50, {'from': accounts[2]})
+
+    gst, chi, gst_exchange, chi_exchange = deploy_local_gas_tokens(at_main_net)
+    gst.mint(60, {'from': accounts[0]})
+    gst.mint(20, {'from': accounts[1]})
+    gst.mint(50, {'from': accounts[2]})
+    chi.mint(60, {'from': accounts[0]})
+    chi.mint(20, {'from': accounts[1]})
+    chi.mint(50, {'from': accounts[2]})
+
+    # seed the exchanges like the main net pools
+    for token, exchange in [(gst, gst_exchange), (chi, chi_exchange)]:
+        token.mint(150, {'from': accounts[9]})
+        token.approve(exchange, 2 ** 256 - 1, {'from': accounts[9]})
+        exchange.addLiquidity(1, 150, DEADLINE, {'from': accounts[9], 'value': "0.04 ether"})
+
+    # deploy helper contract and approve it
+    helper = accounts[0].deploy(LgtHelper)
+    for i in range(5):
+        lgt.approve(helper, 2**256-1, {'from': accounts[i]})
+        gst.approve(helper, 2 ** 256 - 1, {'from': accounts[i]})
+        chi.approve(helper, 2 ** 256 - 1, {'from': accounts[i]})
+
+    return lgt, gst, chi, helper, accounts[2]
+# lgt, gst, chi, h, me = run("local_gts")
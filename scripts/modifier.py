@@ -1,17 +1,18 @@
 from brownie import *
 
 from archive.deploy_lgt import deploy_lgt
+from scripts.tx_batch import TxBatch
 
 
 def main():
     lgt = deploy_lgt()
+    batch = TxBatch()
     for _ in range(6):
-        lgt.mint(100, {'from': accounts[1]})
-    lgt.addLiquidity(0, 500, 99999999999, {'from': accounts[1], 'value': "0.1 ether"})
-    lgt.transfer(accounts[0], 10, {'from': accounts[1]})
-
-    helper = TestModifier.deploy({'from': accounts[1]})
-
+        batch.add(lgt.mint, 100, {'from': accounts[1]})
+    batch.add(lgt.addLiquidity, 0, 500, 99999999999, {'from': accounts[1], 'value': "0.1 ether"})
+    batch.add(lgt.transfer, accounts[0], 10, {'from': accounts[1]})
+    batch.deploy(TestModifier, {'from': accounts[1]})
+    helper = batch.send()[-1]
 
     return lgt, helper, accounts[0]
 
@@ -0,0 +1,212 @@
+"""
+Offline implementation of the LiquidERC20 constant price model.
+
+All quotes are calculated from a single reserve snapshot and match the
+contract's price views to the wei, including the fee and integer rounding.
+Amounts can be passed as a single integer, a sequence of integers or a
+NumPy array. NumPy is optional and only required for the array path.
+`get_price_table` fetches the same quotes from the contract in batches.
+"""
+from typing import NamedTuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+FEE_MODIFIER = 995
+FEE_DENOMINATOR = 1000
+UINT256_MAX = 2 ** 256 - 1
+
+
+class PriceModelError(ArithmeticError):
+    """ Raised for inputs where the contract would revert. """
+
+
+def _check_uint256(value, name):
+    if value < 0 or value > UINT256_MAX:
+        raise PriceModelError(f"SafeMath: {name} overflow")
+    return value
+
+
+def get_input_price(input_amount: int, input_reserve: int, output_reserve: int) -> int:
+    """ Exact copy of `LiquidERC20.getInputPrice`. """
+    input_amount_with_fee = _check_uint256(input_amount * FEE_MODIFIER, "multiplication")
+    numerator = _check_uint256(input_amount_with_fee * output_reserve, "multiplication")
+    denominator = _check_uint256(
+        _check_uint256(input_reserve * FEE_DENOMINATOR, "multiplication") + input_amount_with_fee,
+        "addition"
+    )
+    if denominator == 0:
+        raise PriceModelError("division by zero")
+    return numerator // denominator
+
+
+def get_output_price(output_amount: int, input_reserve: int, output_reserve: int) -> int:
+    """ Exact copy of `LiquidERC20.getOutputPrice`. """
+    numerator = _check_uint256(
+        _check_uint256(input_reserve * output_amount, "multiplication") * FEE_DENOMINATOR,
+        "multiplication"
+    )
+    if output_amount > output_reserve:
+        raise PriceModelError("SafeMath: subtraction overflow")
+    denominator = _check_uint256((output_reserve - output_amount) * FEE_MODIFIER, "multiplication")
+    if denominator == 0:
+        raise PriceModelError("SafeMath: division by zero")
+    return numerator // denominator + 1
+
+
+def _to_object_array(amounts):
+    # uint256 math does not fit into any native dtype, object arrays keep the
+    # arithmetic exact while still running the loops inside NumPy.
+    amounts = np.asarray(amounts, dtype=object)
+    if amounts.size and (amounts.min() < 0 or amounts.max() > UINT256_MAX):
+        raise PriceModelError("amount is not a uint256")
+    return amounts
+
+
+def get_input_price_array(input_amounts, input_reserve: int, output_reserve: int):
+    """ Vectorized `getInputPrice` for a NumPy array of amounts. """
+    input_amounts = _to_object_array(input_amounts)
+    if not input_amounts.size:
+        return input_amounts
+    # all intermediate values are monotonic in the amount: the largest amount
+    # detects an overflow anywhere in the array, the smallest a zero denominator
+    get_input_price(input_amounts.max(), input_reserve, output_reserve)
+    get_input_price(input_amounts.min(), input_reserve, output_reserve)
+    input_amounts_with_fee = input_amounts * FEE_MODIFIER
+    numerator = input_amounts_with_fee * output_reserve
+    denominator = input_reserve * FEE_DENOMINATOR + input_amounts_with_fee
+    return numerator // denominator
+
+
+def get_output_price_array(output_amounts, input_reserve: int, output_reserve: int):
+    """ Vectorized `getOutputPrice` for a NumPy array of amounts. """
+    output_amounts = _to_object_array(output_amounts)
+    if not output_amounts.size:
+        return output_amounts
+    # the largest amount has both the largest numerator and the smallest denominator
+    get_output_price(output_amounts.max(), input_reserve, output_reserve)
+    numerator = input_reserve * output_amounts * FEE_DENOMINATOR
+    denominator = (output_reserve - output_amounts) * FEE_MODIFIER
+    return numerator // denominator + 1
+
+
+def _quote(amounts, scalar_function, array_function, input_reserve, output_reserve):
+    if isinstance(amounts, int) or (np is not None and isinstance(amounts, np.integer)):
+        return scalar_function(int(amounts), input_reserve, output_reserve)
+    if np is not None and isinstance(amounts, np.ndarray):
+        return array_function(amounts, input_reserve, output_reserve)
+    return [scalar_function(int(amount), input_reserve, output_reserve) for amount in amounts]
+
+
+class PoolReserves(NamedTuple):
+    """
+    Snapshot of the liquidity pool reserves.
+
+    `token_reserve` is `_totalMinted - _totalBurned - _ownedSupply`,
+    `eth_reserve` is the ether balance of the token contract.
+    The quote methods mirror the public price views of `LiquidERC20`.
+    """
+    token_reserve: int
+    eth_reserve: int
+
+    @classmethod
+    def from_contract(cls, lgt, block_identifier=None) -> "PoolReserves":
+        """ Read the reserves of a deployed LGT, optionally pinned to a block. """
+        from brownie import web3
+
+        if block_identifier is None:
+            block_identifier = web3.eth.block_number
+        return cls(
+            token_reserve=int(lgt.poolTokenReserves(block_identifier=block_identifier)),
+            eth_reserve=int(web3.eth.get_balance(lgt.address, block_identifier)),
+        )
+
+    def eth_to_token_input(self, eth_sold):
+        """ Mirrors `getEthToTokenInputPrice`: tokens bought for `eth_sold` ether. """
+        return _quote(
+            eth_sold, get_input_price, get_input_price_array, self.eth_reserve, self.token_reserve
+        )
+
+    def eth_to_token_output(self, tokens_bought):
+        """ Mirrors `getEthToTokenOutputPrice`: ether needed to buy `tokens_bought` tokens. """
+        return _quote(
+            tokens_bought, get_output_price, get_output_price_array, self.eth_reserve, self.token_reserve
+        )
+
+    def token_to_eth_input(self, tokens_sold):
+        """ Mirrors `getTokenToEthInputPrice`: ether received for `tokens_sold` tokens. """
+        return _quote(
+            tokens_sold, get_input_price, get_input_price_array, self.token_reserve, self.eth_reserve
+        )
+
+    def token_to_eth_output(self, eth_bought):
+        """ Mirrors `getTokenToEthOutputPrice`: tokens needed to buy `eth_bought` ether. """
+        return _quote(
+            eth_bought, get_output_price, get_output_price_array, self.token_reserve, self.eth_reserve
+        )
+
+
+# ***** Batched on-chain quotes
+
+DEFAULT_GAS_CAP = 50000000  # default `--rpc.gascap` of geth
+QUOTE_TABLE_BASE_GAS = 40000
+QUOTE_TABLE_GAS_PER_AMOUNT = 2000
+
+
+class PriceTable(NamedTuple):
+    """ The four quote types of `getPriceTable`, in the order of the amounts. """
+    eth_to_token_input: list
+    token_to_eth_output: list
+    eth_to_token_output: list
+    token_to_eth_input: list
+
+
+def quote_table_gas(amounts: int) -> int:
+    """ Upper bound for the gas `getPriceTable` uses to quote `amounts` ether and token amounts. """
+    # every amount produces two result words in memory, copied once more for the return data
+    memory_words = 4 * amounts
+    return QUOTE_TABLE_BASE_GAS + QUOTE_TABLE_GAS_PER_AMOUNT * amounts + memory_words ** 2 // 512
+
+
+def max_quote_table_size(gas_cap: int = DEFAULT_GAS_CAP) -> int:
+    """ The most amounts that can be quoted in one `eth_call` with `gas_cap`. """
+    low, high = 1, gas_cap
+    while low < high:
+        mid = (low + high + 1) // 2
+        if quote_table_gas(mid) <= gas_cap:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def get_price_table(
+        lgt, eth_amounts, token_amounts, gas_cap: int = DEFAULT_GAS_CAP, block_identifier=None
+) -> PriceTable:
+    """
+    Quote many amounts with `LiquidERC20.getPriceTable`.
+    Large inputs are split into as many calls as needed to stay below the node's
+    `eth_call` gas cap. All calls are pinned to the same block, so the table is
+    consistent even if a new block arrives in between.
+    """
+    from brownie import web3
+
+    if block_identifier is None:
+        block_identifier = web3.eth.block_number
+    eth_amounts = [int(i) for i in eth_amounts]
+    token_amounts = [int(i) for i in token_amounts]
+    size = max_quote_table_size(gas_cap)
+
+    table = PriceTable([], [], [], [])
+    eth_index = token_index = 0
+    while eth_index < len(eth_amounts) or token_index < len(token_amounts):
+        eth_chunk = eth_amounts[eth_index:eth_index + size]
+        token_chunk = token_amounts[token_index:token_index + size - len(eth_chunk)]
+        eth_index += len(eth_chunk)
+        token_index += len(token_chunk)
+        result = lgt.getPriceTable(eth_chunk, token_chunk, block_identifier=block_identifier)
+        for column, values in zip(table, result):
+            column.extend(int(i) for i in values)
+    return table
@@ -0,0 +1,176 @@
+"""
+Read the pool state of LGT straight from storage in one JSON-RPC batch.
+
+Instead of one call per view (`totalSupply`, `ownedSupply`,
+`poolTokenReserves`, `poolTotalSupply`, `balanceOf`, ...), the storage slots
+are fetched with `eth_getStorageAt` and decoded with the layout of
+`ERC20PointerSupply` and `LiquidERC20`. Contracts compiled from this tree
+pack the counters into one slot:
+
+    slot 0  _balances          mapping(address => uint256)
+    slot 1  _allowances        mapping(address => mapping(address => uint256))
+    slot 2  _ownedSupply (uint48) | _totalBurned (uint48) | _totalMinted (uint48) | _poolTotalSupply (uint112)
+    slot 3  _poolBalances      mapping(address => uint256)
+
+The LGT deployed at 0x000000000000C1CB11D5c062901F32D06248CE48 predates the
+packing and keeps every counter in its own slot:
+
+    slot 2  _ownedSupply       uint256
+    slot 3  _totalBurned       uint256
+    slot 4  _totalMinted       uint256
+    slot 5  _poolTotalSupply   uint256
+    slot 6  _poolBalances      mapping(address => uint256)
+
+The constructor of both versions creates the initial liquidity, so slot 5 is
+never zero in the unpacked layout and never written in the packed one. Unless
+a layout is passed, it is detected from that slot first.
+
+All requests are pinned to the same block. If no block is given, the
+latest block number is fetched first.
+"""
+from typing import Dict, Iterable, NamedTuple, Tuple
+
+from eth_utils import keccak, to_checksum_address
+
+from scripts.pricing import PoolReserves
+
+BALANCES_SLOT = 0
+ALLOWANCES_SLOT = 1
+COUNTERS_SLOT = 2
+POOL_BALANCES_SLOT = 3
+
+UINT48_MASK = 2 ** 48 - 1
+
+
+class StorageLayout(NamedTuple):
+    """ Where the counters and `_poolBalances` are stored. """
+    name: str
+    counter_slots: Tuple[int, ...]
+    pool_balances_slot: int
+
+    def decode(self, words) -> Tuple[int, int, int, int]:
+        """ (ownedSupply, totalBurned, totalMinted, poolTotalSupply) from the words at `counter_slots`. """
+        if len(self.counter_slots) == 1:
+            return decode_counters(words[0])
+        return tuple(words)
+
+
+PACKED_LAYOUT = StorageLayout("packed", (COUNTERS_SLOT,), POOL_BALANCES_SLOT)
+UNPACKED_LAYOUT = StorageLayout("unpacked", (2, 3, 4, 5), 6)
+# `_poolTotalSupply` in the unpacked layout, empty in the packed one
+LAYOUT_PROBE_SLOT = 5
+
+
+class PoolSnapshot(NamedTuple):
+    """ State of LGT at `block`, decoded from storage. """
+    block: int
+    owned_supply: int
+    total_burned: int
+    total_minted: int
+    pool_total_supply: int
+    eth_reserve: int
+    balances: Dict[str, int]
+    pool_balances: Dict[str, int]
+
+    @property
+    def total_supply(self) -> int:
+        return self.total_minted - self.total_burned
+
+    @property
+    def token_reserve(self) -> int:
+        return self.total_minted - self.total_burned - self.owned_supply
+
+    @property
+    def reserves(self) -> PoolReserves:
+        """ The reserves in the form the pricing code expects. """
+        return PoolReserves(self.token_reserve, self.eth_reserve)
+
+
+def mapping_slot(key: str, slot: int) -> int:
+    """ Storage slot of `mapping[key]` for an address keyed mapping at `slot`. """
+    return int.from_bytes(
+        keccak(bytes.fromhex(key[2:].rjust(64, "0")) + slot.to_bytes(32, "big")), "big"
+    )
+
+
+def decode_counters(word: int):
+    """ Split the packed counter slot into (ownedSupply, totalBurned, totalMinted, poolTotalSupply). """
+    return word & UINT48_MASK, (word >> 48) & UINT48_MASK, (word >> 96) & UINT48_MASK, word >> 144
+
+
+def _batch_request(web3, requests):
+    """ Send `(method, params)` requests in one JSON-RPC batch, one by one if the provider can't batch. """
+    try:
+        responses = web3.provider.make_batch_request(requests)
+    except (AttributeError, NotImplementedError):
+        responses = [web3.provider.make_request(method, params) for method, params in requests]
+    if isinstance(responses, dict):
+        # a failed batch is answered with a single error object
+        raise ValueError(responses.get("error", responses))
+    results = []
+    for response in responses:
+        if "error" in response:
+            raise ValueError(response["error"])
+        results.append(response["result"])
+    return results
+
+
+def _to_int(result: str) -> int:
+    # empty storage may be returned as "0x"
+    return int(result, 16) if result != "0x" else 0
+
+
+def detect_layout(lgt_address: str, block_identifier: int, web3) -> StorageLayout:
+    """ The storage layout of the LGT at `lgt_address`, see the module docstring. """
+    probe = web3.provider.make_request(
+        "eth_getStorageAt", [str(lgt_address), hex(LAYOUT_PROBE_SLOT), hex(block_identifier)]
+    )
+    if "error" in probe:
+        raise ValueError(probe["error"])
+    return UNPACKED_LAYOUT if _to_int(probe["result"]) else PACKED_LAYOUT
+
+
+def read_state(
+        lgt_address: str,
+        accounts: Iterable[str] = (),
+        pool_accounts: Iterable[str] = (),
+        block_identifier: int = None,
+        web3=None,
+        layout: StorageLayout = None,
+) -> PoolSnapshot:
+    """
+    Read the counters, the ether reserve and the token and liquidity balances
+    of `accounts` and `pool_accounts` at `block_identifier` in one batch.
+    If `layout` is not given, it is detected with one additional request.
+    """
+    if web3 is None:
+        from brownie import web3
+    if block_identifier is None:
+        block_identifier = web3.eth.block_number
+    block = hex(block_identifier)
+    lgt_address = str(lgt_address)
+    accounts = [to_checksum_address(str(a)) for a in accounts]
+    pool_accounts = [to_checksum_address(str(a)) for a in pool_accounts]
+    if layout is None:
+        layout = detect_layout(lgt_address, block_identifier, web3)
+
+    slots = list(layout.counter_slots)
+    slots += [mapping_slot(a, BALANCES_SLOT) for a in accounts]
+    slots += [mapping_slot(a, layout.pool_balances_slot) for a in pool_accounts]
+    requests = [("eth_getBalance", [lgt_address, block])]
+    requests += [("eth_getStorageAt", [lgt_address, hex(slot), block]) for slot in slots]
+    results = _batch_request(web3, requests)
+
+    eth_reserve, *words = [_to_int(result) for result in results]
+    counters, words = words[:len(layout.counter_slots)], words[len(layout.counter_slots):]
+    owned_supply, total_burned, total_minted, pool_total_supply = layout.decode(counters)
+    return PoolSnapshot(
+        block=block_identifier,
+        owned_supply=owned_supply,
+        total_burned=total_burned,
+        total_minted=total_minted,
+        pool_total_supply=pool_total_supply,
+        eth_reserve=eth_reserve,
+        balances=dict(zip(accounts, words[:len(accounts)])),
+        pool_balances=dict(zip(pool_accounts, words[len(accounts):])),
+    )
@@ -0,0 +1,144 @@
+"""
+Broadcast many transactions at once and wait for all receipts together.
+
+Brownie waits for the receipt of every transaction before sending the
+next one. For setup with dozens of independent transactions, `TxBatch`
+assigns nonces locally per sender, broadcasts everything without waiting
+and then collects the receipts, so the setup takes about as long as the
+slowest transaction.
+
+Transactions of the same sender are mined in the order they were added.
+Transactions of different senders are not ordered: if one depends on
+another account's transaction, send them in separate batches.
+
+    batch = TxBatch()
+    for account in accounts[:5]:
+        batch.add(lgt.approve, helper, 2 ** 256 - 1, {'from': account})
+    batch.send()
+"""
+from brownie import *
+from brownie._config import CONFIG
+from brownie.network.account import LocalAccount
+from web3.exceptions import ContractLogicError
+
+# estimated gas is multiplied by this, state can change until the transaction is mined
+GAS_BUFFER = 1.2
+# brownie's names for transaction fields, substituted like brownie does for contract calls
+TX_KEY_ALIASES = [("amount", "value"), ("gas_limit", "gas"), ("gas_price", "gasPrice")]
+
+
+class TxBatchError(Exception):
+    """ Raised if transactions of a batch reverted, after all receipts were collected. """
+
+    def __init__(self, failed):
+        self.failed = failed
+        super().__init__(f"{len(failed)} transaction(s) reverted: {', '.join(failed)}")
+
+
+def _default_gas_price():
+    gas_price = CONFIG.active_network.get("settings", {}).get("gas_price")
+    if isinstance(gas_price, (int, str)) and gas_price not in ("auto", None):
+        return int(Wei(gas_price))
+    return web3.eth.gas_price
+
+
+class TxBatch:
+    """
+    Collect transactions with `add`, `transfer` and `deploy`, then `send` them.
+    Without `gas_limit`, the gas of each transaction is estimated against the pending
+    state right before it is broadcast, with a margin of `GAS_BUFFER`. If the estimate
+    reverts, e.g. because the transaction depends on another one that isn't pending
+    yet, the block gas limit is used instead.
+    """
+
+    def __init__(self, gas_limit: int = None, gas_price: int = None, timeout: int = 120):
+        self.gas_limit = gas_limit
+        self.gas_price = gas_price
+        self.timeout = timeout
+        self._transactions = []
+        self._nonces = {}
+
+    def __len__(self):
+        return len(self._transactions)
+
+    def add(self, fn, *args):
+        """ Queue a contract call `fn(*args, tx)`, `tx` must contain 'from'. """
+        *args, tx = args
+        self._queue(tx, to=fn._address, data=fn.encode_input(*args))
+
+    def transfer(self, sender, to, amount, gas_limit: int = 21000):
+        """ Queue an ether transfer. """
+        self._queue({'from': sender, 'value': amount, 'gas': gas_limit}, to=str(to), data="0x")
+
+    def deploy(self, container, *args):
+        """ Queue a deployment, `send` returns the deployed contract in its place. """
+        *args, tx = args
+        self._queue(tx, to=None, data=container.deploy.encode_input(*args), container=container)
+
+    def _queue(self, tx, to, data, container=None):
+        tx = dict(tx)
+        for key, target in TX_KEY_ALIASES:
+            if key in tx:
+                tx[target] = tx[key]
+        sender = tx['from']
+        if not isinstance(sender, LocalAccount):
+            sender = accounts.at(str(sender), force=True)
+        address = sender.address
+        if address not in self._nonces:
+            self._nonces[address] = web3.eth.get_transaction_count(address, "pending")
+        params = {
+            'from': address,
+            'nonce': self._nonces[address],
+            'value': int(Wei(tx.get('value', 0))),
+            'data': data,
+        }
+        if to is not None:
+            params['to'] = to
+        if 'gas' in tx:
+            params['gas'] = tx['gas']
+        if 'gasPrice' in tx:
+            params['gasPrice'] = int(Wei(tx['gasPrice']))
+        self._nonces[address] += 1
+        self._transactions.append((sender, params, container))
+
+    @staticmethod
+    def _estimate_gas(params, block_gas_limit):
+        estimate_params = {k: v for k, v in params.items() if k != 'nonce'}
+        try:
+            gas = web3.eth.estimate_gas(estimate_params, "pending")
+        except (ValueError, ContractLogicError):
+            return block_gas_limit
+        return min(int(gas * GAS_BUFFER), block_gas_limit)
+
+    def send(self) -> list:
+        """
+        Broadcast all queued transactions, then wait for every receipt.
+        Returns the receipts in the order the transactions were added,
+        with deployments replaced by the deployed contracts.
+        """
+        block_gas_limit = web3.eth.get_block("latest").gasLimit
+        gas_price = _default_gas_price() if self.gas_price is None else self.gas_price
+        chain_id = web3.eth.chain_id
+        tx_hashes = []
+        for sender, params, _ in self._transactions:
+            if 'gas' not in params:
+                params['gas'] = self.gas_limit or self._estimate_gas(params, block_gas_limit)
+            params.setdefault('gasPrice', gas_price)
+            params['chainId'] = chain_id
+            if isinstance(sender, LocalAccount):
+                signed = sender._acct.sign_transaction(params)
+                tx_hashes.append(web3.eth.send_raw_transaction(signed.raw_transaction))
+            else:
+                tx_hashes.append(web3.eth.send_transaction(params))
+
+        receipts = [web3.eth.wait_for_transaction_receipt(h, timeout=self.timeout) for h in tx_hashes]
+        self._transactions, transactions = [], self._transactions
+        self._nonces = {}
+
+        failed = ["0x" + bytes(r.transactionHash).hex() for r in receipts if r.status == 0]
+        if failed:
+            raise TxBatchError(failed)
+        return [
+            container.at(receipt.contractAddress) if container is not None else receipt
+            for (_, _, container), receipt in zip(transactions, receipts)
+        ]
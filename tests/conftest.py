@@ -1,21 +1,112 @@
 #!/usr/bin/python3
-import os
+import hashlib
+import inspect
+import shutil
+from pathlib import Path
 
+import brownie
 import pytest
+from brownie._config import CONFIG
 
+from scripts.chain_db import copy_db, db_flag, launch_with_db, supports_db
 
-@pytest.fixture(scope="function", autouse=True)
-def isolate(fn_isolation):
-    pass
+LGT_ADDRESS = "0x000000000000C1CB11D5c062901F32D06248CE48"
+CHAIN_CACHE = Path(__file__).parent.parent.joinpath("build", "chain_cache")
 
 
-@pytest.fixture(scope="module")
-def lgt(LiquidGasToken, LGTDeployer, accounts):
+def pytest_addoption(parser):
+    parser.addoption(
+        "--chain-cache",
+        action="store_true",
+        default=False,
+        help="Build the deployed LGT state once and start every local chain from a copy of it",
+    )
+
+
+def deploy_base_state(lgt_container, deployer_container, accounts):
+    """ The state every test module starts from: LGT at its main net address with 30 tokens minted. """
     salt = "0x23ad710e5baee63bb004d962a84d3922e236c107944f2efe53e42d51e6d6f121"
     coffee = accounts.add("redacted")
-    d = coffee.deploy(LGTDeployer)  # 0x8EE26bA26c87Beb287eB71245ADEf44ede1bF190
-    accounts[0].transfer("0x000000000000C1CB11D5c062901F32D06248CE48", "0.001 ether")
+    d = coffee.deploy(deployer_container)  # 0x8EE26bA26c87Beb287eB71245ADEf44ede1bF190
+    accounts[0].transfer(LGT_ADDRESS, "0.001 ether")
     d.deploy(salt)
-    lgt = LiquidGasToken.at("0x000000000000C1CB11D5c062901F32D06248CE48")
+    lgt = lgt_container.at(LGT_ADDRESS)
     lgt.mint(30, {'from': accounts[0]})
-    yield lgt
+    return lgt
+
+
+def _cache_key(network_id, lgt_project):
+    """ Changes whenever the contracts, the chain settings or the base state do. """
+    settings = CONFIG.networks[network_id]
+    cmd_settings = {k: v for k, v in settings["cmd_settings"].items() if k != "port"}
+    key = hashlib.sha1()
+    for part in (
+        lgt_project.LiquidGasToken.bytecode,
+        lgt_project.LGTDeployer.bytecode,
+        settings["cmd"] + repr(sorted(cmd_settings.items())),
+        inspect.getsource(deploy_base_state),
+    ):
+        key.update(part.encode())
+    return key.hexdigest()[:16]
+
+
+def _build_chain_cache(network_id, lgt_project, path):
+    """ Launch a chain persisting to `path`, deploy the base state and shut it down. """
+    # use a separate port so the chain is gone before the tests connect
+    port = CONFIG.networks[network_id]["cmd_settings"]["port"] + 1000
+    with launch_with_db(network_id, path, port):
+        brownie.network.connect(network_id)
+        deploy_base_state(lgt_project.LiquidGasToken, lgt_project.LGTDeployer, brownie.accounts)
+        brownie.network.disconnect()
+
+
+def pytest_sessionstart(session):
+    """
+    With `--chain-cache`, the base state is built once into a ganache database
+    and every process (including xdist workers) launches its chain from a copy.
+    Brownie connects after collection, so only the launch command is changed here.
+    """
+    if not session.config.getoption("chain_cache"):
+        return
+    network_id = CONFIG.argv["network"] or CONFIG.settings["networks"]["default"]
+    if not supports_db(network_id):
+        return
+
+    # not available on every platform, only needed with --chain-cache
+    import fcntl
+
+    lgt_project = brownie.project.get_loaded_projects()[0]
+    key = _cache_key(network_id, lgt_project)
+    CHAIN_CACHE.mkdir(parents=True, exist_ok=True)
+    base = CHAIN_CACHE.joinpath(key)
+    with CHAIN_CACHE.joinpath(f"{key}.lock").open("w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if not base.joinpath(".complete").exists():
+            shutil.rmtree(base, ignore_errors=True)
+            base.mkdir()
+            _build_chain_cache(network_id, lgt_project, base)
+            base.joinpath(".complete").touch()
+    if session.config.getoption("numprocesses", None) and not hasattr(session.config, "workerinput"):
+        # the xdist master does not connect
+        return
+
+    worker_id = getattr(session.config, "workerinput", {}).get("workerid", "master")
+    worker_db = CHAIN_CACHE.joinpath(f"{key}-{worker_id}")
+    copy_db(base, worker_db)
+    # brownie connects later, so the command is not restored
+    settings = CONFIG.networks[network_id]
+    settings["cmd"] = f"{settings['cmd']} {db_flag(settings['cmd'])} {worker_db}"
+
+
+@pytest.fixture(scope="function", autouse=True)
+def isolate(fn_isolation):
+    pass
+
+
+@pytest.fixture(scope="module")
+def lgt(LiquidGasToken, LGTDeployer, accounts, web3):
+    if web3.eth.get_code(LGT_ADDRESS):
+        # the chain was launched from the chain cache
+        yield LiquidGasToken.at(LGT_ADDRESS)
+    else:
+        yield deploy_base_state(LiquidGasToken, LGTDeployer, accounts)
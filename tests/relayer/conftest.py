@@ -1,11 +1,16 @@
 import pytest
 
+from scripts.tx_batch import TxBatch
+
 
 @pytest.fixture(scope="module")
 def liquid_lgt(lgt, accounts):
-    lgt.mint(50, {'from': accounts[0]})
+    batch = TxBatch()
+    batch.add(lgt.mint, 50, {'from': accounts[0]})
+    batch.add(lgt.mint, 80, {'from': accounts[1]})
+    batch.send()
+    # the second deposit is priced by the first, so they can't share a batch
     lgt.addLiquidity(1, 51, 99999999999, {'from': accounts[0], 'value': "0.05 ether"})
-    lgt.mint(80, {'from': accounts[1]})
     lgt.addLiquidity(1, 50, 99999999999, {'from': accounts[1], 'value': "0.049 ether"})
     yield lgt
 
@@ -0,0 +1,55 @@
+from brownie import Wei
+
+GAS_PRICE = Wei("50 gwei")
+
+
+def test_forward_batch_executes_calls(liquid_lgt, relayer, storage, helper, accounts):
+    calls = [
+        (storage, 0, storage.set.encode_input(7)),
+        (helper, 0, helper.burnGas.encode_input(100000)),
+        (storage, "0.01 ether", storage.setPayable.encode_input(9)),
+    ]
+    tx = relayer.forwardBatch(calls, {'from': accounts[0], 'value': "0.01 ether"})
+    success, gas_used, tokens_freed, eth_sold = tx.return_value
+    assert success == (True, True, True)
+    assert gas_used[1] > 100000
+    assert storage.get() == 9
+    # no tokens are bought at a gas price of 0
+    assert tokens_freed == eth_sold == 0
+
+
+def test_forward_batch_failed_call_refund(liquid_lgt, relayer, storage, accounts):
+    initial_balance = accounts[0].balance()
+    calls = [
+        (storage, "0.01 ether", "0x12345678"),
+        (storage, 0, storage.set.encode_input(3)),
+    ]
+    tx = relayer.forwardBatch(calls, {'from': accounts[0], 'value': "0.01 ether"})
+    success, _, _, _ = tx.return_value
+    assert success == (False, True)
+    assert storage.get() == 3
+    assert accounts[0].balance() == initial_balance
+
+
+def test_forward_batch_frees_once(liquid_lgt, relayer, helper, accounts):
+    initial_tokens = liquid_lgt.poolTokenReserves()
+    initial_balance = accounts[0].balance()
+    calls = [(helper, 0, helper.burnGas.encode_input(300000))] * 4
+    tx = relayer.forwardBatch(calls, {'from': accounts[0], 'value': "1 ether", 'gas_price': GAS_PRICE})
+    success, gas_used, tokens_freed, eth_sold = tx.return_value
+    assert all(success)
+    assert min(gas_used) > 300000
+    assert tokens_freed > 0
+    assert liquid_lgt.poolTokenReserves() == initial_tokens - tokens_freed
+    assert initial_balance - accounts[0].balance() == eth_sold + tx.gas_used * GAS_PRICE
+
+
+def test_forward_batch_insufficient_ether_refund(liquid_lgt, relayer, helper, accounts):
+    initial_tokens = liquid_lgt.poolTokenReserves()
+    initial_balance = accounts[0].balance()
+    calls = [(helper, 0, helper.burnGas.encode_input(500000))] * 2
+    tx = relayer.forwardBatch(calls, {'from': accounts[0], 'value': 1, 'gas_price': GAS_PRICE})
+    _, _, tokens_freed, eth_sold = tx.return_value
+    assert tokens_freed == eth_sold == 0
+    assert liquid_lgt.poolTokenReserves() == initial_tokens
+    assert initial_balance - accounts[0].balance() == tx.gas_used * GAS_PRICE
@@ -0,0 +1,58 @@
+import json
+
+from scripts.benchmarks.history import find_regressions, load_records
+
+
+def record(bytecode_hash, gas, pre_refund=None, commit="abc"):
+    """ A history record with one function measured for 1 token. """
+    return {
+        "commit": commit,
+        "bytecode_hash": bytecode_hash,
+        "timestamp": 0,
+        "gas_used": {"mint": {"mint": {"1": gas}}},
+        "pre_refund_gas": {"free": {"free": {"1": pre_refund}}} if pre_refund else {},
+    }
+
+
+def write_history(path, records):
+    path.write_text("".join(json.dumps(r) + "\n" for r in records) + "\n")
+
+
+def test_load_records_collapses_same_bytecode(tmp_path):
+    path = tmp_path.joinpath("history.jsonl")
+    write_history(path, [record("0x01", 100), record("0x01", 90), record("0x02", 80), record("0x01", 70)])
+    records = load_records(path)
+    # consecutive runs of the same bytecode keep the latest, later runs are kept again
+    assert [(r["bytecode_hash"], r["gas_used"]["mint"]["mint"]["1"]) for r in records] == [
+        ("0x01", 90), ("0x02", 80), ("0x01", 70)
+    ]
+
+
+def test_regression_against_median():
+    records = [record(hex(i), gas) for i, gas in enumerate([100, 300, 110, 105])]
+    # median of 100, 300, 110 is 110
+    assert find_regressions(records) == []
+    # median of 100, 300, 110, 105 is 107.5
+    records.append(record("0xff", 108))
+    assert find_regressions(records) == [("mint", "mint", 1, 107.5, 108)]
+
+
+def test_window_limits_history():
+    records = [record(hex(i), gas) for i, gas in enumerate([200, 200, 200, 100, 100, 150])]
+    assert find_regressions(records, window=5) == []
+    assert find_regressions(records, window=2) == [("mint", "mint", 1, 100, 150)]
+
+
+def test_tolerance():
+    records = [record("0x01", 100), record("0x02", 105)]
+    assert find_regressions(records, tolerance=5) == []
+    assert find_regressions(records, tolerance=4) == [("mint", "mint", 1, 100, 105)]
+
+
+def test_pre_refund_gas():
+    records = [record("0x01", 100, 200), record("0x02", 100, 210), record("0x03", 100)]
+    # the gas used did not change, the gas before refunds did
+    assert find_regressions(records[:2]) == []
+    assert find_regressions(records[:2], key="pre_refund_gas") == [("free", "free", 1, 200, 210)]
+    # records without the figure are skipped
+    assert find_regressions(records, key="pre_refund_gas") == []
@@ -0,0 +1,22 @@
+import json
+
+from brownie import *
+
+from scripts.benchmarks.gas_benchmarks import BENCHMARK_FILE, deploy_lgt, run_cases, run_parallel
+
+CASES = [
+    ("mint", "mint", 1),
+    ("mint", "mintToLiquidity", 15),
+    ("free", "free", 15),
+    ("free", "buyAndFree", 32),
+]
+
+
+def test_parallel_matches_serial(LiquidGasToken):
+    with BENCHMARK_FILE.open() as fp:
+        benchmarks = json.load(fp)
+    parallel = run_parallel(benchmarks, CASES, 2)
+
+    lgt = deploy_lgt(LiquidGasToken)
+    rpc.snapshot()
+    assert run_cases(lgt, benchmarks, CASES) == parallel
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+from brownie import *
+from brownie.test import given
+from hypothesis import settings, strategies as st
+
+from scripts.arbitrage import ArbitrageEngine, GasModel, mint_profit, optimal_mint_amount
+from scripts.pricing import PoolReserves
+
+DEADLINE = 99999999999
+GAS_MODEL = GasModel(37877, 36489)
+
+
+@pytest.fixture(scope="module")
+def liquid_lgt(lgt, accounts):
+    lgt.addLiquidity(1, 20, DEADLINE, {'from': accounts[0], 'value': "0.019 ether"})
+    yield lgt
+
+
+@given(
+    token_reserve=st.integers(min_value=1, max_value=500),
+    eth_reserve=st.integers(min_value=10 ** 15, max_value=10 ** 19),
+    gas_price=st.integers(min_value=0, max_value=500 * 10 ** 9),
+)
+@settings(max_examples=50)
+def test_optimal_amount_is_best(token_reserve, eth_reserve, gas_price):
+    reserves = PoolReserves(token_reserve, eth_reserve)
+    amount = optimal_mint_amount(reserves, gas_price, GAS_MODEL, 300)
+    best = max(mint_profit(reserves, i, gas_price, GAS_MODEL) for i in range(301))
+    assert mint_profit(reserves, amount, gas_price, GAS_MODEL) == best
+
+
+def test_unprofitable_gas_price():
+    reserves = PoolReserves(20, 10 ** 16)
+    assert optimal_mint_amount(reserves, 10 ** 12, GAS_MODEL, 300) == 0
+
+
+def test_engine_decision(liquid_lgt, accounts):
+    engine = ArbitrageEngine(liquid_lgt, accounts[4], GAS_MODEL, dry_run=False, gas_price=10 ** 9)
+    decision = asyncio.run(engine.on_block(web3.eth.block_number))
+    assert decision.submitted
+    assert decision.amount > 0
+    assert decision.profit == decision.proceeds - decision.gas_cost > 0
+    assert liquid_lgt.poolTokenReserves() == engine.reserves.token_reserve
+    assert liquid_lgt.balance() == engine.reserves.eth_reserve
+
+
+def test_engine_dry_run(liquid_lgt, accounts):
+    engine = ArbitrageEngine(liquid_lgt, accounts[4], GAS_MODEL, dry_run=True, gas_price=10 ** 9)
+    initial_reserves = liquid_lgt.poolTokenReserves()
+    decision = asyncio.run(engine.on_block(web3.eth.block_number))
+    assert decision.submitted
+    assert liquid_lgt.poolTokenReserves() == initial_reserves
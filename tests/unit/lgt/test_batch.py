@@ -0,0 +1,162 @@
+import pytest
+from brownie import *
+import brownie
+
+from scripts.batch_ops import (
+    ADD_LIQUIDITY, BUY, BUY_AND_FREE, FREE, MINT, MINT_TO_LIQUIDITY, MINT_TO_SELL, REMOVE_LIQUIDITY, SELL, encode
+)
+
+DEADLINE = 99999999999
+
+
+@pytest.fixture(scope="module")
+def liquid_lgt(lgt, accounts):
+    lgt.addLiquidity(1, 20, DEADLINE, {'from': accounts[0], 'value': "0.019 ether"})
+    yield lgt
+
+
+def state(lgt, account):
+    return (
+        lgt.poolTokenReserves(),
+        lgt.balance(),
+        lgt.ownedSupply(),
+        lgt.totalSupply(),
+        lgt.poolTotalSupply(),
+        lgt.balanceOf(account),
+        lgt.poolBalanceOf(account),
+        account.balance(),
+    )
+
+
+def assert_matches_separate(lgt, account, separate, ops, value):
+    """ The batch leaves the same state as the separate transactions. """
+    results = [fn(*args).return_value for fn, *args in separate]
+    expected = state(lgt, account)
+    chain.undo(len(separate))
+    tx = lgt.batch(ops, DEADLINE, {'from': account, 'value': value})
+    assert state(lgt, account) == expected
+    return results, tx.return_value
+
+
+def test_mint_to_liquidity_and_sell(liquid_lgt, accounts):
+    separate = [
+        (liquid_lgt.mintToLiquidity, 15, 1, DEADLINE, accounts[0], {'from': accounts[0], 'value': "0.1 ether"}),
+        (liquid_lgt.mintToSell, 10, 1, DEADLINE, {'from': accounts[0]}),
+    ]
+    ops = encode((MINT_TO_LIQUIDITY, 15, Wei("0.1 ether"), 1), (MINT_TO_SELL, 10, 1))
+    separate_results, batch_results = assert_matches_separate(
+        liquid_lgt, accounts[0], separate, ops, "0.1 ether"
+    )
+    assert batch_results == [separate_results[0][2], separate_results[1]]
+
+
+def test_remove_liquidity_and_free(liquid_lgt, accounts):
+    separate = [
+        (liquid_lgt.removeLiquidity, "0.01 ether", 1, 1, DEADLINE, {'from': accounts[0]}),
+        (liquid_lgt.free, 20, {'from': accounts[0]}),
+    ]
+    ops = encode((REMOVE_LIQUIDITY, Wei("0.01 ether"), 1, 1), (FREE, 20))
+    separate_results, batch_results = assert_matches_separate(liquid_lgt, accounts[0], separate, ops, 0)
+    assert batch_results == [separate_results[0][1], 20]
+
+
+def test_mint_and_add_liquidity(liquid_lgt, accounts):
+    separate = [
+        (liquid_lgt.mint, 12, {'from': accounts[1]}),
+        (liquid_lgt.addLiquidity, 1, 12, DEADLINE, {'from': accounts[1], 'value': "0.01 ether"}),
+    ]
+    ops = encode((MINT, 12), (ADD_LIQUIDITY, Wei("0.01 ether"), 12, 1))
+    separate_results, batch_results = assert_matches_separate(
+        liquid_lgt, accounts[1], separate, ops, "0.01 ether"
+    )
+    assert batch_results == [12, separate_results[1]]
+
+
+def test_buy_and_sell(liquid_lgt, accounts):
+    separate = [
+        (liquid_lgt.ethToTokenSwapInput, 1, DEADLINE, {'from': accounts[2], 'value': "0.005 ether"}),
+        (liquid_lgt.tokenToEthSwapInput, 2, 1, DEADLINE, {'from': accounts[2]}),
+    ]
+    ops = encode((BUY, Wei("0.005 ether"), 1), (SELL, 2, 1))
+    separate_results, batch_results = assert_matches_separate(
+        liquid_lgt, accounts[2], separate, ops, "0.005 ether"
+    )
+    assert batch_results == separate_results
+
+
+def test_buy_and_free(liquid_lgt, accounts):
+    price = liquid_lgt.getEthToTokenOutputPrice(5)
+    tx = liquid_lgt.batch(encode((BUY_AND_FREE, 5, price)), DEADLINE, {'from': accounts[2], 'value': price})
+    assert tx.return_value == [price]
+    assert liquid_lgt.poolTokenReserves() == 16
+    assert liquid_lgt.totalSupply() == 26
+    assert liquid_lgt.balance() == Wei("0.02 ether") + price
+
+
+def test_mint_and_free(liquid_lgt, accounts):
+    """ Tokens minted in a batch can be freed in the same batch. """
+    tx = liquid_lgt.batch(encode((MINT, 40), (FREE, 45)), DEADLINE, {'from': accounts[0]})
+    assert tx.return_value == [40, 45]
+    assert liquid_lgt.balanceOf(accounts[0]) == 5
+    assert liquid_lgt.totalSupply() == 26
+    assert liquid_lgt.poolTokenReserves() == 21
+
+
+def test_refund(liquid_lgt, accounts):
+    initial_balance = accounts[3].balance()
+    tx = liquid_lgt.batch(
+        encode((MINT_TO_LIQUIDITY, 5, Wei("0.1 ether"), 1), (MINT_TO_SELL, 5, 1)),
+        DEADLINE,
+        {'from': accounts[3], 'value': "1 ether"}
+    )
+    assert tx.events['AddLiquidity']['token_amount'] == 5
+    eth_added = tx.events['AddLiquidity']['eth_amount']
+    assert accounts[3].balance() == initial_balance - eth_added + tx.return_value[1]
+
+
+def test_empty_batch(liquid_lgt, accounts):
+    initial_state = state(liquid_lgt, accounts[0])
+    tx = liquid_lgt.batch([], DEADLINE, {'from': accounts[0]})
+    assert tx.return_value == []
+    assert state(liquid_lgt, accounts[0]) == initial_state
+
+
+def test_all_or_nothing(liquid_lgt, accounts):
+    initial_state = state(liquid_lgt, accounts[0])
+    with brownie.reverts("dev: tokens not worth enough"):
+        liquid_lgt.batch(encode((MINT, 5), (MINT_TO_SELL, 5, "1 ether")), DEADLINE, {'from': accounts[0]})
+    assert state(liquid_lgt, accounts[0]) == initial_state
+
+
+def test_free_exceeds_balance_reverts(liquid_lgt, accounts):
+    with brownie.reverts("LGT: amount exceeds balance"):
+        liquid_lgt.batch(encode((FREE, 11)), DEADLINE, {'from': accounts[0]})
+
+
+def test_insufficient_ether_reverts(liquid_lgt, accounts):
+    with brownie.reverts("LGT: insufficient ether"):
+        liquid_lgt.batch(
+            encode((BUY, Wei("0.01 ether"), 1)), DEADLINE, {'from': accounts[0], 'value': "0.005 ether"}
+        )
+
+
+def test_deadline_reverts(liquid_lgt, accounts):
+    with brownie.reverts("dev: deadline passed"):
+        liquid_lgt.batch(encode((MINT, 1)), 1, {'from': accounts[0]})
+
+
+def test_unknown_operation_reverts(liquid_lgt, accounts):
+    with brownie.reverts("dev: unknown operation"):
+        liquid_lgt.batch([10, 1], DEADLINE, {'from': accounts[0]})
+
+
+def test_missing_arguments_reverts(liquid_lgt, accounts):
+    with brownie.reverts("dev: missing arguments"):
+        liquid_lgt.batch([MINT_TO_SELL, 1], DEADLINE, {'from': accounts[0]})
+
+
+def test_encode_checks_arguments():
+    with pytest.raises(ValueError):
+        encode((MINT, 1, 2))
+    with pytest.raises(ValueError):
+        encode((0, 1))
@@ -0,0 +1,27 @@
+from brownie import web3
+
+from scripts.child_addresses import ChildAddressIndex, compute_address
+
+
+def test_compute_address(lgt):
+    for salt in [0, 1, 29, 30, 2**64]:
+        assert compute_address(lgt.address, salt) == lgt.computeAddress2(salt)
+
+
+def test_children_alive(lgt):
+    """ The constructor and the fixture mint 31 children, salts 0 to 30. """
+    assert web3.eth.get_code(compute_address(lgt.address, 30)) != b""
+    assert web3.eth.get_code(compute_address(lgt.address, 31)) == b""
+
+
+def test_index_persists(lgt, tmp_path):
+    path = tmp_path.joinpath("children.idx")
+    with ChildAddressIndex(path, lgt.address) as index:
+        index.extend(20, processes=2)
+        assert len(index) == 20
+    with ChildAddressIndex(path, lgt.address) as index:
+        assert len(index) == 20
+        index.extend(31)
+        assert index.range(0, 31) == [lgt.computeAddress2(i) for i in range(31)]
+        assert index[30] == lgt.computeAddress2(30)
+        assert index.access_list(3, 4) == [{"address": lgt.computeAddress2(3), "storageKeys": []}]
@@ -0,0 +1,8 @@
+from brownie import *
+
+# EIP-170
+MAX_CODE_SIZE = 24576
+
+
+def test_runtime_code_fits_eip170(lgt):
+    assert len(web3.eth.get_code(lgt.address)) <= MAX_CODE_SIZE
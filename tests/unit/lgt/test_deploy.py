@@ -94,3 +94,83 @@ def test_create2_refund(liquid_lgt, accounts):
 def test_create2_deadline_reverts(liquid_lgt, accounts):
     with brownie.reverts("dev: deadline passed"):
         liquid_lgt.create2(4, 1, "0xabc", storage_bytecode, {'from': accounts[0], 'value': "1 ether"})
+
+
+def test_deploy_auto(liquid_lgt, accounts, Contract):
+    initial_tokens = liquid_lgt.poolTokenReserves()
+    initial_balance = accounts[0].balance()
+    tx = liquid_lgt.deployAuto(
+        DEADLINE, storage_bytecode, {'from': accounts[0], 'value': "1 ether", 'gas_price': "500 gwei"}
+    )
+    address, token_amount, eth_sold = tx.return_value
+    assert token_amount > 0
+    contract = Contract.from_abi(name="Storage", address=address, abi=storage_abi, owner=accounts[0])
+    assert contract.get() == 5
+    assert initial_tokens - token_amount == liquid_lgt.poolTokenReserves()
+    assert initial_balance - eth_sold - tx.gas_used * tx.gas_price == accounts[0].balance()
+
+
+def test_deploy_auto_not_worth_it(liquid_lgt, accounts):
+    initial_tokens = liquid_lgt.poolTokenReserves()
+    initial_balance = accounts[0].balance()
+    tx = liquid_lgt.deployAuto(DEADLINE, storage_bytecode, {'from': accounts[0], 'value': "1 ether", 'gas_price': 0})
+    assert tx.return_value[1:] == (0, 0)
+    assert initial_tokens == liquid_lgt.poolTokenReserves()
+    assert initial_balance == accounts[0].balance()
+
+
+def test_deploy_auto_limited_by_ether(liquid_lgt, accounts):
+    optimal = liquid_lgt.deployAuto(
+        DEADLINE, storage_bytecode, {'from': accounts[0], 'value': "1 ether", 'gas_price': "500 gwei"}
+    ).return_value[1]
+    brownie.chain.undo()
+    price = liquid_lgt.getEthToTokenOutputPrice(optimal - 1)
+    tx = liquid_lgt.deployAuto(
+        DEADLINE, storage_bytecode, {'from': accounts[0], 'value': price, 'gas_price': "500 gwei"}
+    )
+    assert 0 < tx.return_value[1] < optimal
+    assert tx.return_value[2] <= price
+
+
+def test_deploy_auto_deadline_reverts(liquid_lgt, accounts):
+    with brownie.reverts("dev: deadline passed"):
+        liquid_lgt.deployAuto(1, storage_bytecode, {'from': accounts[0], 'value': "1 ether"})
+
+
+def test_create2_auto(liquid_lgt, accounts, Contract):
+    initial_tokens = liquid_lgt.poolTokenReserves()
+    initial_balance = accounts[0].balance()
+    tx = liquid_lgt.create2Auto(
+        DEADLINE, "0xabc", storage_bytecode, {'from': accounts[0], 'value': "1 ether", 'gas_price': "500 gwei"}
+    )
+    address, token_amount, eth_sold = tx.return_value
+    assert token_amount > 0
+    contract = Contract.from_abi(name="Storage", address=address, abi=storage_abi, owner=accounts[0])
+    assert contract.get() == 5
+    assert initial_tokens - token_amount == liquid_lgt.poolTokenReserves()
+    assert initial_balance - eth_sold - tx.gas_used * tx.gas_price == accounts[0].balance()
+
+
+def test_create2_auto_deadline_reverts(liquid_lgt, accounts):
+    with brownie.reverts("dev: deadline passed"):
+        liquid_lgt.create2Auto(1, "0xabc", storage_bytecode, {'from': accounts[0], 'value': "1 ether"})
+
+
+def test_deploy_auto_skips_unprofitable_amount(liquid_lgt, accounts):
+    """ One token doesn't cover the fixed gas cost of freeing at this gas price, a few tokens do. """
+    gas_price = liquid_lgt.getEthToTokenOutputPrice(1) // 9000
+    optimal = liquid_lgt.deployAuto(
+        DEADLINE, storage_bytecode, {'from': accounts[0], 'value': "1 ether", 'gas_price': gas_price}
+    ).return_value[1]
+    assert optimal >= 2
+    brownie.chain.undo()
+    initial_tokens = liquid_lgt.poolTokenReserves()
+    initial_balance = accounts[0].balance()
+    # only enough ether for a single token
+    value = liquid_lgt.getEthToTokenOutputPrice(2) - 1
+    tx = liquid_lgt.deployAuto(
+        DEADLINE, storage_bytecode, {'from': accounts[0], 'value': value, 'gas_price': gas_price}
+    )
+    assert tx.return_value[1:] == (0, 0)
+    assert initial_tokens == liquid_lgt.poolTokenReserves()
+    assert initial_balance - tx.gas_used * tx.gas_price == accounts[0].balance()
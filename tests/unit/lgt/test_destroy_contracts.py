@@ -0,0 +1,35 @@
+"""
+`_destroyContracts` is unrolled 32 ways. Freeing must destroy exactly the
+children a plain loop over the salts would, for any start and amount.
+"""
+from brownie import *
+from brownie.test import given
+from hypothesis import settings, strategies as st
+
+from scripts.child_addresses import compute_address
+
+
+def destroyed(lgt, start, stop):
+    return [len(web3.eth.get_code(compute_address(lgt.address, salt))) == 0 for salt in range(start, stop)]
+
+
+@given(
+    first=st.integers(min_value=1, max_value=70),
+    second=st.integers(min_value=0, max_value=70),
+)
+@settings(max_examples=20)
+def test_destroys_contiguous_salts(lgt, accounts, first, second):
+    lgt.mint(first + second, {'from': accounts[0]})
+    total = 31 + first + second
+    assert lgt.free(first, {'from': accounts[0]}).return_value
+    assert lgt.free(second, {'from': accounts[0]}).return_value
+    burned = first + second
+    assert destroyed(lgt, 0, total) == [True] * burned + [False] * (total - burned)
+    assert lgt.totalSupply() == total - burned
+
+
+def test_unrolled_boundaries(lgt, accounts):
+    lgt.mint(70, {'from': accounts[0]})
+    for amount in [31, 32, 33]:
+        assert lgt.free(amount, {'from': accounts[0]}).return_value
+    assert destroyed(lgt, 0, 101) == [True] * 96 + [False] * 5
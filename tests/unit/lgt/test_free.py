@@ -64,3 +64,67 @@ def test_insufficient_owner_balance_fails(lgt, accounts):
     lgt.approve(spender, 100, {'from': owner})
     tx = lgt.freeFrom(50, owner, {'from': spender})
     assert not tx.return_value
+
+
+def test_free_up_to(lgt, accounts):
+    tx = lgt.freeUpTo(10, {'from': accounts[0]})
+    assert tx.return_value == 10
+    assert lgt.balanceOf(accounts[0]) == 20
+
+
+def test_free_up_to_partial_balance(lgt, accounts):
+    total_supply = lgt.totalSupply()
+    tx = lgt.freeUpTo(50, {'from': accounts[0]})
+    assert tx.return_value == 30
+    assert lgt.balanceOf(accounts[0]) == 0
+    assert lgt.totalSupply() == total_supply - 30
+
+
+def test_free_up_to_empty_balance(lgt, accounts):
+    tx = lgt.freeUpTo(10, {'from': accounts[1]})
+    assert tx.return_value == 0
+
+
+def test_free_from_up_to_allowance(lgt, accounts):
+    owner, spender = accounts[:2]
+    lgt.approve(spender, 11, {'from': owner})
+    tx = lgt.freeFromUpTo(50, owner, {'from': spender})
+    assert tx.return_value == 11
+    assert lgt.balanceOf(owner) == 19
+    assert lgt.allowance(owner, spender) == 0
+
+
+def test_free_from_up_to_balance(lgt, accounts):
+    owner, spender = accounts[:2]
+    lgt.approve(spender, 100, {'from': owner})
+    tx = lgt.freeFromUpTo(50, owner, {'from': spender})
+    assert tx.return_value == 30
+    assert lgt.balanceOf(owner) == 0
+    assert lgt.allowance(owner, spender) == 70
+
+
+def test_free_from_up_to_no_allowance(lgt, accounts):
+    owner, spender = accounts[:2]
+    total_supply = lgt.totalSupply()
+    tx = lgt.freeFromUpTo(10, owner, {'from': spender})
+    assert tx.return_value == 0
+    assert lgt.balanceOf(owner) == 30
+    # nothing freed, nothing written
+    assert "Approval" not in tx.events
+    assert lgt.totalSupply() == total_supply
+
+
+def test_free_up_to_refund_capped(lgt, accounts):
+    useful = lgt.getMaxUsefulFreeAmount(50000)
+    assert 0 < useful < 30
+    tx = lgt.freeUpToRefund(30, 50000, {'from': accounts[0]})
+    assert tx.return_value == useful
+    assert lgt.balanceOf(accounts[0]) == 30 - useful
+
+
+def test_free_from_up_to_refund_capped(lgt, accounts):
+    owner, spender = accounts[:2]
+    lgt.approve(spender, 5, {'from': owner})
+    tx = lgt.freeFromUpToRefund(30, owner, 1000000, {'from': spender})
+    assert tx.return_value == 5
+    assert lgt.allowance(owner, spender) == 0
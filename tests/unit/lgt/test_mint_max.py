@@ -0,0 +1,95 @@
+import brownie
+import pytest
+from brownie import *
+
+from scripts.pricing import PoolReserves
+
+DEADLINE = 99999999999
+GAS_RESERVE = 60000
+CREATE_GAS_BOUND = 40000
+
+
+@pytest.fixture(scope="module")
+def liquid_lgt(lgt, accounts):
+    lgt.addLiquidity(1, 20, DEADLINE, {'from': accounts[0], 'value': "0.019 ether"})
+    lgt.mintToLiquidity(200, 1, DEADLINE, accounts[0], {'from': accounts[0], 'value': "1 ether"})
+    yield lgt
+
+
+@pytest.mark.parametrize("gas_limit", [500000, 1500000, 4000000])
+def test_mint_max_to_sell_fills_gas(liquid_lgt, accounts, gas_limit):
+    reserves = PoolReserves.from_contract(liquid_lgt)
+    total_supply = liquid_lgt.totalSupply()
+    initial_balance = accounts[1].balance()
+    tx = liquid_lgt.mintMaxToSell(GAS_RESERVE, 1, DEADLINE, {'from': accounts[1], 'gas_limit': gas_limit})
+    amount, eth_bought = tx.return_value
+    assert amount > 0
+    assert liquid_lgt.totalSupply() == total_supply + amount
+    assert eth_bought == reserves.token_to_eth_input(amount)
+    assert accounts[1].balance() == initial_balance + eth_bought
+    # another token would not have fit above the reserve
+    assert tx.gas_used > gas_limit - GAS_RESERVE - CREATE_GAS_BOUND
+
+
+def test_mint_max_to_sell_more_gas_more_tokens(liquid_lgt, accounts):
+    small = liquid_lgt.mintMaxToSell(GAS_RESERVE, 1, DEADLINE, {'from': accounts[1], 'gas_limit': 1000000})
+    chain.undo()
+    large = liquid_lgt.mintMaxToSell(GAS_RESERVE, 1, DEADLINE, {'from': accounts[1], 'gas_limit': 3000000})
+    assert large.return_value[0] > small.return_value[0]
+
+
+def test_mint_max_to_sell_to(liquid_lgt, accounts):
+    initial_balance = accounts[2].balance()
+    tx = liquid_lgt.mintMaxToSellTo(GAS_RESERVE, 1, DEADLINE, accounts[2], {'from': accounts[1], 'gas_limit': 1000000})
+    assert accounts[2].balance() == initial_balance + tx.return_value[1]
+
+
+def test_mint_max_to_sell_reverts(liquid_lgt, accounts):
+    with brownie.reverts("dev: deadline passed"):
+        liquid_lgt.mintMaxToSell(GAS_RESERVE, 1, 1, {'from': accounts[1], 'gas_limit': 1000000})
+    with brownie.reverts("dev: tokens not worth enough"):
+        liquid_lgt.mintMaxToSell(GAS_RESERVE, "1 ether", DEADLINE, {'from': accounts[1], 'gas_limit': 1000000})
+    with brownie.reverts("dev: not enough gas to mint"):
+        liquid_lgt.mintMaxToSell(990000, 1, DEADLINE, {'from': accounts[1], 'gas_limit': 1000000})
+
+
+def test_mint_max_to_liquidity_fills_gas(liquid_lgt, accounts):
+    pool_supply = liquid_lgt.poolTotalSupply()
+    initial_balance = accounts[1].balance()
+    tx = liquid_lgt.mintMaxToLiquidity(
+        GAS_RESERVE, 1, DEADLINE, accounts[1], {'from': accounts[1], 'value': "1 ether", 'gas_limit': 2000000}
+    )
+    token_amount, eth_amount, liquidity = tx.return_value
+    assert token_amount > 0
+    assert liquid_lgt.poolBalanceOf(accounts[1]) == liquidity
+    assert liquid_lgt.poolTotalSupply() == pool_supply + liquidity
+    assert accounts[1].balance() == initial_balance - eth_amount
+    assert tx.gas_used > 2000000 - GAS_RESERVE - CREATE_GAS_BOUND
+
+
+def test_mint_max_to_liquidity_matches_mint_to_liquidity(liquid_lgt, accounts):
+    """ With enough gas, the ether limits the tokens exactly like `mintToLiquidity`. """
+    expected = liquid_lgt.mintToLiquidity(
+        1000, 1, DEADLINE, accounts[1], {'from': accounts[1], 'value': "0.01 ether"}
+    ).return_value
+    chain.undo()
+    tx = liquid_lgt.mintMaxToLiquidity(
+        GAS_RESERVE, 1, DEADLINE, accounts[1], {'from': accounts[1], 'value': "0.01 ether", 'gas_limit': 6000000}
+    )
+    assert tx.return_value == expected
+
+
+def test_mint_max_to_liquidity_reverts(liquid_lgt, accounts):
+    with brownie.reverts("dev: deadline passed"):
+        liquid_lgt.mintMaxToLiquidity(GAS_RESERVE, 1, 1, accounts[1], {'from': accounts[1], 'value': "1 ether"})
+    with brownie.reverts("dev: must provide ether to add liquidity"):
+        liquid_lgt.mintMaxToLiquidity(GAS_RESERVE, 1, DEADLINE, accounts[1], {'from': accounts[1]})
+    with brownie.reverts("dev: not enough liquidity can be created"):
+        liquid_lgt.mintMaxToLiquidity(
+            GAS_RESERVE, "1 ether", DEADLINE, accounts[1],
+            {'from': accounts[1], 'value': "1 ether", 'gas_limit': 1000000}
+        )
+    with brownie.reverts("dev: not enough gas to mint"):
+        liquid_lgt.mintMaxToLiquidity(
+            990000, 1, DEADLINE, accounts[1], {'from': accounts[1], 'value': "1 ether", 'gas_limit': 1000000}
+        )
@@ -0,0 +1,26 @@
+from brownie import *
+
+from scripts.state_reader import COUNTERS_SLOT, decode_counters
+
+DEADLINE = 99999999999
+
+
+def read_counters(lgt):
+    return decode_counters(int.from_bytes(web3.eth.get_storage_at(lgt.address, COUNTERS_SLOT), "big"))
+
+
+def test_counters_share_one_slot(lgt, accounts):
+    lgt.addLiquidity(1, 20, DEADLINE, {'from': accounts[0], 'value': "0.019 ether"})
+    owned, burned, minted, pool_supply = read_counters(lgt)
+    assert owned == lgt.ownedSupply() == 10
+    assert minted - burned == lgt.totalSupply() == 31
+    assert pool_supply == lgt.poolTotalSupply() == Wei("0.02 ether")
+
+
+def test_mint_and_free_keep_other_counters(lgt, accounts):
+    lgt.addLiquidity(1, 20, DEADLINE, {'from': accounts[0], 'value': "0.019 ether"})
+    lgt.mint(7, {'from': accounts[1]})
+    lgt.free(3, {'from': accounts[1]})
+    lgt.buyAndFree(2, DEADLINE, accounts[2], {'from': accounts[2], 'value': "0.01 ether"})
+    assert read_counters(lgt) == (14, 5, 38, Wei("0.02 ether"))
+    assert lgt.poolTokenReserves() == 19
@@ -0,0 +1,67 @@
+from brownie import *
+
+from scripts.tx_batch import TxBatch
+
+DEADLINE = 99999999999
+
+
+def test_same_sender_keeps_order(lgt, accounts):
+    batch = TxBatch()
+    batch.add(lgt.mint, 20, {'from': accounts[1]})
+    batch.add(lgt.addLiquidity, 1, 20, DEADLINE, {'from': accounts[1], 'value': "0.019 ether"})
+    batch.add(lgt.mint, 5, {'from': accounts[2]})
+    batch.transfer(accounts[3], accounts[4], "1 ether")
+    receipts = batch.send()
+    assert len(receipts) == 4 and len(batch) == 0
+    assert [r.status for r in receipts] == [1, 1, 1, 1]
+    assert lgt.balanceOf(accounts[1]) == 0
+    assert lgt.poolBalanceOf(accounts[1]) == Wei("0.019 ether")
+    assert lgt.balanceOf(accounts[2]) == 5
+    assert accounts[4].balance() == "101 ether"
+
+
+def test_nonces_continue_after_send(lgt, accounts):
+    nonce = accounts[1].nonce
+    batch = TxBatch()
+    for _ in range(3):
+        batch.add(lgt.mint, 1, {'from': accounts[1]})
+    batch.send()
+    assert accounts[1].nonce == nonce + 3
+    lgt.mint(1, {'from': accounts[1]})
+    batch.add(lgt.mint, 1, {'from': accounts[1]})
+    batch.send()
+    assert lgt.balanceOf(accounts[1]) == 5
+
+
+def test_deploy_returns_contract(accounts, LgtHelper):
+    batch = TxBatch()
+    batch.deploy(LgtHelper, {'from': accounts[0]})
+    batch.deploy(LgtHelper, {'from': accounts[1]})
+    first, second = batch.send()
+    assert first.address != second.address
+    assert web3.eth.get_code(first.address) == web3.eth.get_code(second.address)
+
+
+def test_gas_is_estimated(lgt, accounts):
+    block_gas_limit = web3.eth.get_block("latest").gasLimit
+    batch = TxBatch()
+    batch.add(lgt.mint, 5, {'from': accounts[1]})
+    batch.add(lgt.transfer, accounts[2], 5, {'from': accounts[1]})
+    receipts = batch.send()
+    for receipt in receipts:
+        gas = web3.eth.get_transaction(receipt.transactionHash).gas
+        assert receipt.gasUsed <= gas < block_gas_limit
+
+
+def test_gas_limit_overrides_estimate(lgt, accounts):
+    batch = TxBatch(gas_limit=500000)
+    batch.add(lgt.mint, 5, {'from': accounts[1]})
+    receipt, = batch.send()
+    assert web3.eth.get_transaction(receipt.transactionHash).gas == 500000
+
+
+def test_brownie_gas_limit_key(lgt, accounts):
+    batch = TxBatch()
+    batch.add(lgt.mint, 5, {'from': accounts[1], 'gas_limit': 400000})
+    receipt, = batch.send()
+    assert web3.eth.get_transaction(receipt.transactionHash).gas == 400000
@@ -0,0 +1,118 @@
+import pytest
+from brownie import *
+
+from scripts.indexer import PoolIndexer, PrunedStateError
+
+DEADLINE = 99999999999
+
+
+@pytest.fixture(scope="module")
+def liquid_lgt(lgt, accounts):
+    lgt.addLiquidity(1, 20, DEADLINE, {'from': accounts[0], 'value': "0.019 ether"})
+    yield lgt
+
+
+@pytest.fixture
+def indexer(liquid_lgt, tmp_path):
+    yield PoolIndexer(liquid_lgt, tmp_path.joinpath("indexer.db"))
+
+
+def assert_indexed(indexer, lgt, accounts):
+    for account in accounts:
+        assert indexer.balance_of(account) == lgt.balanceOf(account)
+        assert indexer.pool_balance_of(account) == lgt.poolBalanceOf(account)
+    state = indexer.pool_state()
+    assert state["token_reserve"] == lgt.poolTokenReserves()
+    assert state["eth_reserve"] == lgt.balance()
+    assert state["pool_total_supply"] == lgt.poolTotalSupply()
+
+
+def test_liquidity_events(indexer, liquid_lgt, accounts):
+    liquid_lgt.mint(20, {'from': accounts[1]})
+    liquid_lgt.addLiquidity(1, 20, DEADLINE, {'from': accounts[1], 'value': "0.01 ether"})
+    liquid_lgt.mintToLiquidity(5, 1, DEADLINE, accounts[2], {'from': accounts[2], 'value': "0.1 ether"})
+    liquid_lgt.removeLiquidity("0.005 ether", 1, 1, DEADLINE, {'from': accounts[0]})
+    assert indexer.sync() == web3.eth.block_number
+    assert_indexed(indexer, liquid_lgt, accounts[:3])
+    assert set(indexer.providers()) == {accounts[0], accounts[1], accounts[2]}
+
+
+def test_transfers(indexer, liquid_lgt, accounts):
+    liquid_lgt.transfer(accounts[3], 4, {'from': accounts[0]})
+    liquid_lgt.poolTransfer(accounts[4], "0.001 ether", {'from': accounts[0]})
+    indexer.sync()
+    assert_indexed(indexer, liquid_lgt, accounts[:5])
+    assert indexer.balance_of(accounts[3]) == 4
+    assert indexer.pool_balance_of(accounts[4]) == "0.001 ether"
+
+
+def test_resume(indexer, liquid_lgt, accounts, tmp_path):
+    liquid_lgt.transfer(accounts[3], 4, {'from': accounts[0]})
+    cursor = indexer.sync()
+    liquid_lgt.transfer(accounts[3], 2, {'from': accounts[0]})
+    resumed = PoolIndexer(liquid_lgt, tmp_path.joinpath("indexer.db"))
+    assert resumed.cursor == cursor
+    assert resumed.sync() == cursor + 1
+    assert resumed.balance_of(accounts[3]) == 6
+
+
+def test_reorg(indexer, liquid_lgt, accounts):
+    liquid_lgt.transfer(accounts[3], 4, {'from': accounts[0]})
+    indexer.sync()
+    assert indexer.balance_of(accounts[3]) == 4
+    chain.undo()
+    # a different block at the same height
+    liquid_lgt.transfer(accounts[4], 3, {'from': accounts[0]})
+    indexer.sync()
+    assert indexer.balance_of(accounts[3]) == 0
+    assert_indexed(indexer, liquid_lgt, accounts[:5])
+
+
+def test_watch(indexer, liquid_lgt, accounts):
+    indexer.watch(accounts[5])
+    liquid_lgt.mint(7, {'from': accounts[5]})
+    indexer.sync()
+    assert indexer.balance_of(accounts[5]) == 7
+
+
+def test_transfers_without_reads(indexer, liquid_lgt, accounts):
+    liquid_lgt.mint(5, {'from': accounts[1]})
+    liquid_lgt.transfer(accounts[2], 2, {'from': accounts[1]})
+    indexer.sync()
+
+    class CountingLGT:
+        reads = 0
+
+        def __getattr__(self, name):
+            return getattr(liquid_lgt, name)
+
+        def balanceOf(self, *args, **kwargs):
+            CountingLGT.reads += 1
+            return liquid_lgt.balanceOf(*args, **kwargs)
+
+    liquid_lgt.transfer(accounts[2], 3, {'from': accounts[1]})
+    liquid_lgt.poolTransfer(accounts[4], 1, {'from': accounts[0]})
+    indexer.lgt = CountingLGT()
+    indexer.sync()
+    assert CountingLGT.reads == 0
+    assert_indexed(indexer, liquid_lgt, accounts[:5])
+
+
+def test_pruned_state(indexer, liquid_lgt, accounts):
+    def pruned(*args, **kwargs):
+        raise ValueError({'code': -32000, 'message': "missing trie node 3b6a0f (path )"})
+
+    liquid_lgt.mint(5, {'from': accounts[1]})
+    liquid_lgt.transfer(accounts[6], 5, {'from': accounts[1]})
+    indexer.lgt = type("PrunedLGT", (), {"address": liquid_lgt.address, "balanceOf": staticmethod(pruned)})()
+    with pytest.raises(PrunedStateError):
+        indexer.sync()
+
+
+def test_pruned_state_on_startup(liquid_lgt, tmp_path, monkeypatch):
+    def pruned(*args, **kwargs):
+        raise ValueError({'code': -32000, 'message': "missing trie node 3b6a0f (path )"})
+
+    monkeypatch.setattr(web3.eth, "get_balance", pruned)
+    with pytest.raises(PrunedStateError):
+        PoolIndexer(liquid_lgt, tmp_path.joinpath("indexer.db"))
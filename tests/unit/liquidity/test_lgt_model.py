@@ -0,0 +1,134 @@
+import brownie
+import pytest
+from brownie import *
+from brownie.test import given
+from hypothesis import HealthCheck, given as given_offline, settings, strategies as st
+
+from scripts.lgt_model import LGTModel, ModelRevert
+from scripts.state_reader import read_state
+
+DEADLINE = 99999999999
+DEPLOYER = "0x8EE26bA26c87Beb287eB71245ADEf44ede1bF190"
+MODEL_ACCOUNTS = ["0x" + f"{i + 1:02x}" * 20 for i in range(4)]
+
+# argument kinds, accounts are drawn as indices and resolved when the operation runs
+ARGUMENTS = {
+    "tokens": st.integers(min_value=0, max_value=40),
+    "eth": st.integers(min_value=0, max_value=int(Wei("0.05 ether"))),
+    "min": st.integers(min_value=0, max_value=2),
+    "deadline": st.sampled_from([DEADLINE] * 9 + [1]),
+    "account": st.integers(min_value=0, max_value=3),
+}
+
+# name: (payable, argument kinds)
+OPERATIONS = {
+    "mint": (False, ("tokens",)),
+    "mintFor": (False, ("tokens", "account")),
+    "free": (False, ("tokens",)),
+    "freeUpTo": (False, ("tokens",)),
+    "transfer": (False, ("account", "tokens")),
+    "poolTransfer": (False, ("account", "eth")),
+    "ethToTokenSwapInput": (True, ("min", "deadline")),
+    "ethToTokenSwapOutput": (True, ("tokens", "deadline")),
+    "tokenToEthSwapInput": (False, ("tokens", "min", "deadline")),
+    "tokenToEthSwapOutput": (False, ("eth", "tokens", "deadline")),
+    "addLiquidity": (True, ("min", "tokens", "deadline")),
+    "removeLiquidity": (False, ("eth", "min", "min", "deadline")),
+    "removeLiquidityAndFree": (False, ("eth", "min", "min", "deadline")),
+    "mintToLiquidity": (True, ("tokens", "min", "deadline", "account")),
+    "mintToSell": (False, ("tokens", "min", "deadline")),
+    "buyAndFree": (True, ("tokens", "deadline", "account")),
+    "buyMaxAndFree": (True, ("deadline",)),
+}
+
+
+@st.composite
+def st_operation(draw):
+    name = draw(st.sampled_from(sorted(OPERATIONS)))
+    payable, kinds = OPERATIONS[name]
+    args = tuple((kind, draw(ARGUMENTS[kind])) for kind in kinds)
+    value = draw(ARGUMENTS["eth"]) if payable else 0
+    return name, args, draw(ARGUMENTS["account"]), value
+
+
+def resolve(operation, addresses):
+    """ The arguments and the transaction dict of `operation` for `addresses`. """
+    name, args, sender, value = operation
+    args = [addresses[arg] if kind == "account" else arg for kind, arg in args]
+    return name, args, {'from': addresses[sender], 'value': value}
+
+
+def base_model():
+    """ The model of the `liquid_lgt` fixture below, without a chain. """
+    model = LGTModel(
+        31, 0, 30, Wei("0.001 ether"), Wei("0.001 ether"),
+        balances={MODEL_ACCOUNTS[0]: 30},
+        pool_balances={DEPLOYER: Wei("0.001 ether")},
+    )
+    model.addLiquidity(1, 20, DEADLINE, {'from': MODEL_ACCOUNTS[0], 'value': "0.019 ether"})
+    for account in MODEL_ACCOUNTS:
+        model.mint(40, {'from': account})
+        model.addLiquidity(1, 20, DEADLINE, {'from': account, 'value': "0.01 ether"})
+    return model
+
+
+@pytest.fixture(scope="module")
+def liquid_lgt(lgt, accounts):
+    lgt.addLiquidity(1, 20, DEADLINE, {'from': accounts[0], 'value': "0.019 ether"})
+    for account in accounts[:4]:
+        lgt.mint(40, {'from': account})
+        lgt.addLiquidity(1, 20, DEADLINE, {'from': account, 'value': "0.01 ether"})
+    yield lgt
+
+
+@given_offline(operations=st.lists(st_operation(), min_size=1, max_size=20))
+@settings(max_examples=20000, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+def test_model_invariants(operations):
+    """ Runs against the model only, so it can afford many more examples than the chain. """
+    model = base_model()
+    total_eth = model.eth_reserve + sum(model.ether.values())
+    for operation in operations:
+        name, args, tx = resolve(operation, MODEL_ACCOUNTS)
+        try:
+            getattr(model, name)(*args, tx)
+        except ModelRevert:
+            pass
+        assert sum(model.balances.values()) == model.owned_supply
+        assert sum(model.pool_balances.values()) == model.pool_total_supply
+        assert model.eth_reserve + sum(model.ether.values()) == total_eth
+        assert model.token_reserve() >= 1
+        assert model.eth_reserve > 0
+
+
+def test_model_matches_fixture(liquid_lgt, accounts):
+    model = base_model()
+    snapshot = read_state(liquid_lgt, accounts[:4], accounts[:4])
+    expected = model.snapshot(MODEL_ACCOUNTS, MODEL_ACCOUNTS)
+    assert expected[1:6] == snapshot[1:6]
+    assert list(expected.balances.values()) == list(snapshot.balances.values())
+    assert list(expected.pool_balances.values()) == list(snapshot.pool_balances.values())
+
+
+@given(operations=st.lists(st_operation(), min_size=1, max_size=8))
+@settings(max_examples=30)
+def test_replay_on_chain(liquid_lgt, accounts, operations):
+    """ Replays a sample of operation sequences, the chain and the model must agree on every step. """
+    model = LGTModel.from_contract(liquid_lgt, accounts[:4], accounts[:4])
+    model.timestamp = chain.time()
+    initial_balances = [a.balance() for a in accounts[:4]]
+    for operation in operations:
+        name, args, tx = resolve(operation, accounts)
+        try:
+            expected = getattr(model, name)(*args, tx)
+        except ModelRevert:
+            with brownie.reverts():
+                getattr(liquid_lgt, name)(*args, tx)
+            continue
+        result = getattr(liquid_lgt, name)(*args, tx).return_value
+        assert (tuple(result) if isinstance(expected, tuple) else result) == expected
+
+    assert model.snapshot(accounts[:4], accounts[:4], web3.eth.block_number) == read_state(
+        liquid_lgt, accounts[:4], accounts[:4]
+    )
+    for account, initial in zip(accounts[:4], initial_balances):
+        assert account.balance() - initial == model.ether[account.address]
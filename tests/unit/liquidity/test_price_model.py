@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+import brownie
+import pytest
+from brownie import *
+from brownie.test import given
+from hypothesis import settings, strategies as st
+
+from scripts.pricing import (
+    PoolReserves, PriceModelError, get_input_price_array, get_price_table, max_quote_table_size
+)
+
+DEADLINE = 99999999999
+TOKEN_RESERVE = 80
+ETHER_RESERVE = Wei("0.079 ether")
+
+st_eth_amounts = st.lists(
+    st.integers(min_value=0, max_value=int(Wei("100 ether"))), min_size=1, max_size=10
+)
+st_token_amounts = st.lists(
+    st.integers(min_value=0, max_value=TOKEN_RESERVE - 1), min_size=1, max_size=10
+)
+
+
+@pytest.fixture(scope="module")
+def liquid_lgt(lgt, accounts):
+    lgt.mint(60, {'from': accounts[0]})
+    lgt.addLiquidity(
+        ETHER_RESERVE - "0.001 ether",
+        TOKEN_RESERVE - 1,
+        DEADLINE,
+        {'from': accounts[0], 'value': ETHER_RESERVE - "0.001 ether"}
+    )
+    yield lgt
+
+
+@pytest.fixture(scope="module")
+def reserves(liquid_lgt):
+    yield PoolReserves.from_contract(liquid_lgt)
+
+
+def test_snapshot(liquid_lgt, reserves):
+    assert reserves.token_reserve == TOKEN_RESERVE == liquid_lgt.poolTokenReserves()
+    assert reserves.eth_reserve == ETHER_RESERVE == liquid_lgt.balance()
+
+
+@given(eth_amounts=st_eth_amounts, token_amounts=st_token_amounts)
+@settings(max_examples=20)
+def test_matches_contract(liquid_lgt, reserves, eth_amounts, token_amounts):
+    assert reserves.eth_to_token_input(eth_amounts) == [
+        liquid_lgt.getEthToTokenInputPrice(i) for i in eth_amounts
+    ]
+    assert reserves.eth_to_token_output(token_amounts) == [
+        liquid_lgt.getEthToTokenOutputPrice(i) for i in token_amounts
+    ]
+    assert reserves.token_to_eth_input(token_amounts) == [
+        liquid_lgt.getTokenToEthInputPrice(i) for i in token_amounts
+    ]
+    eth_amounts = [i for i in eth_amounts if i < ETHER_RESERVE]
+    assert reserves.token_to_eth_output(eth_amounts) == [
+        liquid_lgt.getTokenToEthOutputPrice(i) for i in eth_amounts
+    ]
+
+
+@given(eth_amounts=st_eth_amounts, token_amounts=st_token_amounts)
+@settings(max_examples=10)
+def test_numpy_matches_contract(liquid_lgt, reserves, eth_amounts, token_amounts):
+    np = pytest.importorskip("numpy")
+    eth_array = np.array(eth_amounts, dtype=object)
+    token_array = np.array(token_amounts, dtype=object)
+    assert list(reserves.eth_to_token_input(eth_array)) == [
+        liquid_lgt.getEthToTokenInputPrice(i) for i in eth_amounts
+    ]
+    assert list(reserves.eth_to_token_output(token_array)) == [
+        liquid_lgt.getEthToTokenOutputPrice(i) for i in token_amounts
+    ]
+    assert list(reserves.token_to_eth_input(token_array)) == [
+        liquid_lgt.getTokenToEthInputPrice(i) for i in token_amounts
+    ]
+
+
+def test_scalar_matches_contract(liquid_lgt, reserves):
+    assert reserves.eth_to_token_output(4) == liquid_lgt.getEthToTokenOutputPrice(4)
+    assert reserves.token_to_eth_input(4) == liquid_lgt.getTokenToEthInputPrice(4)
+
+
+def test_output_exceeds_reserve_raises(reserves):
+    with pytest.raises(PriceModelError):
+        reserves.eth_to_token_output(TOKEN_RESERVE)
+    with pytest.raises(PriceModelError):
+        reserves.eth_to_token_output([1, TOKEN_RESERVE + 1])
+
+
+def test_empty_reserves_raise():
+    np = pytest.importorskip("numpy")
+    with pytest.raises(PriceModelError):
+        PoolReserves(0, 0).eth_to_token_input(0)
+    with pytest.raises(PriceModelError):
+        get_input_price_array(np.array([0, 1]), 0, 0)
+
+
+@given(eth_amounts=st_eth_amounts, token_amounts=st_token_amounts)
+@settings(max_examples=10)
+def test_price_table_matches_model(liquid_lgt, reserves, eth_amounts, token_amounts):
+    eth_amounts = [i for i in eth_amounts if i < ETHER_RESERVE]
+    table = liquid_lgt.getPriceTable(eth_amounts, token_amounts)
+    assert list(table[0]) == reserves.eth_to_token_input(eth_amounts)
+    assert list(table[1]) == reserves.token_to_eth_output(eth_amounts)
+    assert list(table[2]) == reserves.eth_to_token_output(token_amounts)
+    assert list(table[3]) == reserves.token_to_eth_input(token_amounts)
+
+
+def test_price_table_chunks(liquid_lgt, reserves):
+    eth_amounts = list(range(0, ETHER_RESERVE, ETHER_RESERVE // 150))
+    token_amounts = list(range(TOKEN_RESERVE))
+    gas_cap = 300000
+    assert max_quote_table_size(gas_cap) < len(eth_amounts) + len(token_amounts)
+    table = get_price_table(liquid_lgt, eth_amounts, token_amounts, gas_cap=gas_cap)
+    assert table.eth_to_token_input == reserves.eth_to_token_input(eth_amounts)
+    assert table.token_to_eth_output == reserves.token_to_eth_output(eth_amounts)
+    assert table.eth_to_token_output == reserves.eth_to_token_output(token_amounts)
+    assert table.token_to_eth_input == reserves.token_to_eth_input(token_amounts)
+
+
+def test_price_table_reverts_like_single_quotes(liquid_lgt):
+    with brownie.reverts():
+        liquid_lgt.getPriceTable([], [TOKEN_RESERVE])
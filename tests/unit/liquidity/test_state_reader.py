@@ -0,0 +1,85 @@
+import pytest
+from brownie import *
+
+from scripts.pricing import PoolReserves
+from scripts.state_reader import (
+    BALANCES_SLOT, PACKED_LAYOUT, UNPACKED_LAYOUT, detect_layout, mapping_slot, read_state
+)
+
+DEADLINE = 99999999999
+
+
+@pytest.fixture(scope="module")
+def liquid_lgt(lgt, accounts):
+    lgt.addLiquidity(1, 20, DEADLINE, {'from': accounts[0], 'value': "0.019 ether"})
+    lgt.mintToLiquidity(10, 1, DEADLINE, accounts[1], {'from': accounts[1], 'value': "0.1 ether"})
+    lgt.mint(5, {'from': accounts[2]})
+    lgt.free(2, {'from': accounts[2]})
+    yield lgt
+
+
+def test_matches_views(liquid_lgt, accounts):
+    snapshot = read_state(liquid_lgt, accounts[:4], accounts[:4])
+    assert snapshot.block == web3.eth.block_number
+    assert snapshot.owned_supply == liquid_lgt.ownedSupply()
+    assert snapshot.total_supply == liquid_lgt.totalSupply()
+    assert snapshot.token_reserve == liquid_lgt.poolTokenReserves()
+    assert snapshot.pool_total_supply == liquid_lgt.poolTotalSupply()
+    assert snapshot.eth_reserve == liquid_lgt.balance()
+    for account in accounts[:4]:
+        assert snapshot.balances[account] == liquid_lgt.balanceOf(account)
+        assert snapshot.pool_balances[account] == liquid_lgt.poolBalanceOf(account)
+    assert snapshot.reserves == PoolReserves.from_contract(liquid_lgt)
+
+
+def test_pinned_block(liquid_lgt, accounts):
+    block = web3.eth.block_number
+    expected = read_state(liquid_lgt, [accounts[0]], [accounts[0]])
+    liquid_lgt.removeLiquidity("0.005 ether", 1, 1, DEADLINE, {'from': accounts[0]})
+    assert read_state(liquid_lgt, [accounts[0]], [accounts[0]], block_identifier=block) == expected
+    assert read_state(liquid_lgt, [accounts[0]], [accounts[0]]) != expected
+
+
+def test_unknown_accounts_are_zero(liquid_lgt, accounts):
+    snapshot = read_state(liquid_lgt, [accounts[8]], [accounts[8]])
+    assert snapshot.balances[accounts[8]] == 0
+    assert snapshot.pool_balances[accounts[8]] == 0
+
+
+def test_detects_packed_layout(liquid_lgt):
+    assert detect_layout(liquid_lgt, web3.eth.block_number, web3) == PACKED_LAYOUT
+
+
+class StorageProvider:
+    """ Answers balance and storage requests from a dict, like a node would for the deployed LGT. """
+    def __init__(self, storage, balance):
+        self.storage = storage
+        self.balance = balance
+
+    def make_request(self, method, params):
+        if method == "eth_getBalance":
+            return {"result": hex(self.balance)}
+        return {"result": hex(self.storage.get(int(params[1], 16), 0))}
+
+
+def test_unpacked_layout(accounts):
+    owner = accounts[0].address
+    storage = {
+        2: 700,
+        3: 1000,
+        4: 2000,
+        5: 10 ** 18,
+        mapping_slot(owner, BALANCES_SLOT): 300,
+        mapping_slot(owner, UNPACKED_LAYOUT.pool_balances_slot): 10 ** 17,
+    }
+    fake_web3 = type("Web3", (), {"provider": StorageProvider(storage, 2 * 10 ** 18)})()
+    assert detect_layout(accounts[0], 1, fake_web3) == UNPACKED_LAYOUT
+
+    snapshot = read_state(accounts[0], [owner], [owner], block_identifier=1, web3=fake_web3)
+    assert snapshot.owned_supply == 700
+    assert snapshot.total_supply == 1000
+    assert snapshot.token_reserve == 300
+    assert snapshot.pool_total_supply == 10 ** 18
+    assert snapshot.eth_reserve == 2 * 10 ** 18
+    assert snapshot.balances[owner] == 300
+    assert snapshot.pool_balances[owner] == 10 ** 17
@@ -0,0 +1,202 @@
+import brownie
+import pytest
+from brownie import *
+from brownie.test import strategy
+
+from scripts.lgt_model import LGTModel, ModelRevert
+from scripts.state_reader import read_state
+
+DEADLINE = 99999999999
+DEPLOYER = "0x8EE26bA26c87Beb287eB71245ADEf44ede1bF190"
+
+
+@pytest.fixture(scope="module")
+def liquid_lgt(lgt, accounts):
+    lgt.addLiquidity(1, 20, DEADLINE, {'from': accounts[0], 'value': "0.019 ether"})
+    for account in accounts[:4]:
+        lgt.mint(40, {'from': account})
+        lgt.addLiquidity(1, 20, DEADLINE, {'from': account, 'value': "0.01 ether"})
+    yield lgt
+
+
+class StateMachine:
+    """
+    Interleaves the entry points of LiquidGasToken and LiquidERC20 across four accounts.
+    Every call is executed on the model first, the chain must revert or return the same.
+    """
+
+    st_account = strategy("address", length=4)
+    st_tokens = strategy("uint256", max_value=40)
+    st_eth = strategy("uint256", max_value=int(Wei("0.05 ether")))
+    st_min = strategy("uint256", max_value=2)
+
+    def __init__(cls, lgt, accounts):
+        cls.lgt = lgt
+        cls.accounts = accounts[:4]
+
+    def setup(self):
+        self.pool_accounts = self.accounts + [DEPLOYER]
+        self.model = LGTModel.from_contract(self.lgt, self.accounts, self.pool_accounts)
+        self.model.timestamp = chain.time()
+        self.initial_ether = {a.address: a.balance() for a in self.accounts}
+        self.total_ether = sum(self.initial_ether.values()) + self.lgt.balance()
+        self.snapshot = None
+        self.lp_value = self._lp_value(self._read())
+
+    def _execute(self, name, *args):
+        self.snapshot = None
+        try:
+            expected = getattr(self.model, name)(*args)
+        except ModelRevert:
+            with brownie.reverts():
+                getattr(self.lgt, name)(*args)
+            return
+        result = getattr(self.lgt, name)(*args).return_value
+        assert (tuple(result) if isinstance(expected, tuple) else result) == expected
+
+    def _read(self):
+        # all invariants of a step share one batched read of the storage
+        if self.snapshot is None:
+            self.snapshot = read_state(self.lgt, self.accounts, self.pool_accounts)
+        return self.snapshot
+
+    @staticmethod
+    def _lp_value(snapshot):
+        """ The squared value of one liquidity share, as a fraction. """
+        return snapshot.eth_reserve * snapshot.token_reserve, snapshot.pool_total_supply ** 2
+
+    # ***** Rules
+
+    def rule_mint(self, amount="st_tokens", account="st_account"):
+        self._execute("mint", amount, {'from': account})
+
+    def rule_mint_for(self, amount="st_tokens", recipient="st_account", account="st_account"):
+        self._execute("mintFor", amount, recipient, {'from': account})
+
+    def rule_mint_to_sell(self, amount="st_tokens", min_eth="st_min", account="st_account"):
+        self._execute("mintToSell", amount, min_eth, DEADLINE, {'from': account})
+
+    def rule_mint_to_sell_to(self, amount="st_tokens", recipient="st_account", account="st_account"):
+        self._execute("mintToSellTo", amount, 1, DEADLINE, recipient, {'from': account})
+
+    def rule_mint_to_liquidity(
+            self, max_tokens="st_tokens", value="st_eth", recipient="st_account", account="st_account"
+    ):
+        self._execute("mintToLiquidity", max_tokens, 1, DEADLINE, recipient, {'from': account, 'value': value})
+
+    def rule_free(self, amount="st_tokens", account="st_account"):
+        self._execute("free", amount, {'from': account})
+
+    def rule_free_from(self, amount="st_tokens", owner="st_account", account="st_account"):
+        self._execute("freeFrom", amount, owner, {'from': account})
+
+    def rule_free_up_to(self, amount="st_tokens", account="st_account"):
+        self._execute("freeUpTo", amount, {'from': account})
+
+    def rule_free_from_up_to(self, amount="st_tokens", owner="st_account", account="st_account"):
+        self._execute("freeFromUpTo", amount, owner, {'from': account})
+
+    def rule_buy_and_free(self, amount="st_tokens", value="st_eth", refund_to="st_account", account="st_account"):
+        self._execute("buyAndFree", amount, DEADLINE, refund_to, {'from': account, 'value': value})
+
+    def rule_buy_max_and_free(self, value="st_eth", account="st_account"):
+        self._execute("buyMaxAndFree", DEADLINE, {'from': account, 'value': value})
+
+    def rule_transfer(self, amount="st_tokens", recipient="st_account", account="st_account"):
+        self._execute("transfer", recipient, amount, {'from': account})
+
+    def rule_sell_by_transfer(self, amount="st_tokens", account="st_account"):
+        self._execute("transfer", self.lgt, amount, {'from': account})
+
+    def rule_approve(self, amount="st_tokens", spender="st_account", account="st_account"):
+        self._execute("approve", spender, amount, {'from': account})
+
+    def rule_transfer_from(self, amount="st_tokens", owner="st_account", recipient="st_account", account="st_account"):
+        self._execute("transferFrom", owner, recipient, amount, {'from': account})
+
+    def rule_buy_by_transfer(self, value="st_eth", account="st_account"):
+        # the receive function buys tokens with a minimum of one token
+        self.snapshot = None
+        try:
+            self.model.ethToTokenSwapInput(1, self.model.timestamp, {'from': account, 'value': value})
+        except ModelRevert:
+            with brownie.reverts():
+                account.transfer(self.lgt, value)
+            return
+        account.transfer(self.lgt, value)
+
+    def rule_eth_to_token_input(self, min_tokens="st_min", value="st_eth", account="st_account"):
+        self._execute("ethToTokenSwapInput", min_tokens, DEADLINE, {'from': account, 'value': value})
+
+    def rule_eth_to_token_transfer_input(self, value="st_eth", recipient="st_account", account="st_account"):
+        self._execute("ethToTokenTransferInput", 1, DEADLINE, recipient, {'from': account, 'value': value})
+
+    def rule_eth_to_token_output(self, tokens="st_tokens", value="st_eth", account="st_account"):
+        self._execute("ethToTokenSwapOutput", tokens, DEADLINE, {'from': account, 'value': value})
+
+    def rule_eth_to_token_transfer_output(
+            self, tokens="st_tokens", value="st_eth", recipient="st_account", account="st_account"
+    ):
+        self._execute("ethToTokenTransferOutput", tokens, DEADLINE, recipient, {'from': account, 'value': value})
+
+    def rule_token_to_eth_input(self, tokens="st_tokens", min_eth="st_min", account="st_account"):
+        self._execute("tokenToEthSwapInput", tokens, min_eth, DEADLINE, {'from': account})
+
+    def rule_token_to_eth_transfer_input(self, tokens="st_tokens", recipient="st_account", account="st_account"):
+        self._execute("tokenToEthTransferInput", tokens, 1, DEADLINE, recipient, {'from': account})
+
+    def rule_token_to_eth_output(self, eth="st_eth", max_tokens="st_tokens", account="st_account"):
+        self._execute("tokenToEthSwapOutput", eth, max_tokens, DEADLINE, {'from': account})
+
+    def rule_token_to_eth_transfer_output(
+            self, eth="st_eth", max_tokens="st_tokens", recipient="st_account", account="st_account"
+    ):
+        self._execute("tokenToEthTransferOutput", eth, max_tokens, DEADLINE, recipient, {'from': account})
+
+    def rule_add_liquidity(self, max_tokens="st_tokens", value="st_eth", account="st_account"):
+        self._execute("addLiquidity", 1, max_tokens, DEADLINE, {'from': account, 'value': value})
+
+    def rule_remove_liquidity(self, amount="st_eth", account="st_account"):
+        self._execute("removeLiquidity", amount, 1, 1, DEADLINE, {'from': account})
+
+    def rule_remove_liquidity_and_free(self, amount="st_eth", account="st_account"):
+        self._execute("removeLiquidityAndFree", amount, 1, 1, DEADLINE, {'from': account})
+
+    def rule_pool_transfer(self, amount="st_eth", recipient="st_account", account="st_account"):
+        self._execute("poolTransfer", recipient, amount, {'from': account})
+
+    # ***** Invariants
+
+    def invariant_total_supply(self):
+        state = self._read()
+        assert self.lgt.totalSupply() == state.total_minted - state.total_burned
+        assert self.lgt.ownedSupply() == state.owned_supply
+
+    def invariant_reserves(self):
+        state = self._read()
+        assert self.lgt.poolTokenReserves() == state.token_reserve >= 1
+        # only the four accounts ever hold tokens, the deployer holds the initial liquidity
+        assert sum(state.balances.values()) == state.owned_supply
+        assert sum(state.pool_balances.values()) == state.pool_total_supply
+
+    def invariant_lp_value(self):
+        """ Fees and rounding only ever increase the value of a liquidity share. """
+        value, shares = self._lp_value(self._read())
+        previous_value, previous_shares = self.lp_value
+        assert value * previous_shares >= previous_value * shares
+        self.lp_value = value, shares
+
+    def invariant_ether(self):
+        state = self._read()
+        assert state.eth_reserve + sum(a.balance() for a in self.accounts) == self.total_ether
+
+    def invariant_model(self):
+        assert self.model.snapshot(self.accounts, self.pool_accounts, self._read().block) == self._read()
+        for account in self.accounts:
+            assert account.balance() - self.initial_ether[account.address] == self.model.ether[account.address]
+
+
+def test_stateful_pool(liquid_lgt, accounts, state_machine):
+    state_machine(
+        StateMachine, liquid_lgt, accounts, settings={"max_examples": 50, "stateful_step_count": 50}
+    )
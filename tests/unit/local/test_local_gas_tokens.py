@@ -0,0 +1,79 @@
+import pytest
+import rlp
+from brownie import *
+from eth_utils import keccak, to_checksum_address
+
+from scripts.local_gts import deploy_local_gas_tokens
+
+DEADLINE = 999999999999
+
+
+@pytest.fixture(scope="module")
+def local_tokens(accounts):
+    # at the deployed addresses, this works on every development chain
+    yield deploy_local_gas_tokens(at_main_net=False)
+
+
+def create_address(sender, nonce):
+    """ Address of the contract created by `sender` at `nonce`. """
+    return to_checksum_address(keccak(rlp.encode([bytes.fromhex(sender[2:]), nonce]))[12:])
+
+
+def has_code(address):
+    return len(web3.eth.get_code(address)) > 0
+
+
+def test_gst2_mint_and_free(local_tokens, accounts):
+    gst = local_tokens[0]
+    gst.mint(3, {'from': accounts[0]})
+    assert gst.balanceOf(accounts[0]) == 3
+    # contracts start with nonce 1
+    children = [create_address(gst.address, nonce) for nonce in range(1, 4)]
+    assert all(has_code(child) for child in children)
+
+    assert gst.free.call(4, {'from': accounts[0]}) is False
+    gst.free(2, {'from': accounts[0]})
+    assert gst.balanceOf(accounts[0]) == 1
+    assert [has_code(child) for child in children] == [False, False, True]
+
+
+def test_chi_mint_and_free(local_tokens, accounts):
+    chi = local_tokens[1]
+    chi.mint(3, {'from': accounts[0]})
+    assert chi.balanceOf(accounts[0]) == 3
+    children = [chi.computeAddress2(salt) for salt in range(3)]
+    assert all(has_code(child) for child in children)
+
+    chi.free(2, {'from': accounts[0]})
+    assert chi.balanceOf(accounts[0]) == 1
+    assert [has_code(child) for child in children] == [False, False, True]
+
+
+def test_free_from_up_to(local_tokens, accounts):
+    for token in local_tokens[:2]:
+        token.mint(5, {'from': accounts[0]})
+        token.approve(accounts[1], 2, {'from': accounts[0]})
+        assert token.freeFromUpTo.call(accounts[0], 4, {'from': accounts[1]}) == 2
+        token.freeFromUpTo(accounts[0], 4, {'from': accounts[1]})
+        assert token.balanceOf(accounts[0]) == 3
+        assert token.allowance(accounts[0], accounts[1]) == 0
+
+
+def test_uniswap_exchange_trades(local_tokens, accounts):
+    chi, exchange = local_tokens[1], local_tokens[3]
+    chi.mint(20, {'from': accounts[0]})
+    chi.approve(exchange, 2 ** 256 - 1, {'from': accounts[0]})
+    exchange.addLiquidity(1, 10, DEADLINE, {'from': accounts[0], 'value': "0.01 ether"})
+    assert exchange.balance() == Wei("0.01 ether")
+    assert chi.balanceOf(exchange) == 10
+
+    expected = exchange.getEthToTokenInputPrice("0.002 ether")
+    exchange.ethToTokenSwapInput(1, DEADLINE, {'from': accounts[1], 'value': "0.002 ether"})
+    assert chi.balanceOf(accounts[1]) == expected > 0
+
+    eth_expected = exchange.getTokenToEthInputPrice(expected)
+    initial_balance = accounts[1].balance()
+    chi.approve(exchange, expected, {'from': accounts[1]})
+    exchange.tokenToEthSwapInput(expected, 1, DEADLINE, {'from': accounts[1]})
+    assert accounts[1].balance() == initial_balance + eth_expected
+    assert chi.balanceOf(accounts[1]) == 0